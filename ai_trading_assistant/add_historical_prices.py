@@ -4,7 +4,8 @@ Generates 60 days of realistic price data for technical indicator calculations.
 """
 
 from models import db
-import random
+import numpy as np
+import pandas as pd
 from datetime import datetime, timedelta
 
 print("=" * 70)
@@ -20,64 +21,56 @@ print("✅ Old data cleared")
 print("\n[2] Generating 60 records of price data...")
 
 base_price = 45000.00
-current_price = base_price
+num_records = 60
 start_date = datetime.now() - timedelta(days=3)
 
-prices = []
-
-for i in range(60):
-    timestamp = start_date + timedelta(hours=i)
-    
-    # Random price movement
-    change_pct = random.uniform(-0.02, 0.02)  # -2% to +2%
-    open_price = current_price
-    close_price = current_price * (1 + change_pct)
-    
-    high_price = max(open_price, close_price) * (1 + random.uniform(0, 0.01))
-    low_price = min(open_price, close_price) * (1 - random.uniform(0, 0.01))
-    
-    volume = random.uniform(1000, 2000)
-    
-    prices.append({
-        'symbol': 'BTCUSDT',
-        'timestamp': timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-        'open_price': round(open_price, 2),
-        'high_price': round(high_price, 2),
-        'low_price': round(low_price, 2),
-        'close_price': round(close_price, 2),
-        'volume': round(volume, 2)
-    })
-    
-    current_price = close_price
+# All candles are generated at once with NumPy (no per-row Python loop)
+rng = np.random.default_rng()
+
+# Random price movement: -2% to +2% per candle, each close building on
+# the previous one (cumulative product)
+change_pct = rng.uniform(-0.02, 0.02, num_records)
+close_prices = base_price * np.cumprod(1 + change_pct)
+open_prices = np.concatenate(([base_price], close_prices[:-1]))
+
+high_prices = np.maximum(open_prices, close_prices) * (1 + rng.uniform(0, 0.01, num_records))
+low_prices = np.minimum(open_prices, close_prices) * (1 - rng.uniform(0, 0.01, num_records))
+
+volumes = rng.uniform(1000, 2000, num_records)
+
+timestamps = pd.date_range(start_date, periods=num_records, freq='h').strftime('%Y-%m-%d %H:%M:%S')
+
+# One parameter tuple per candle (same column order as the query)
+rows = list(zip(
+    ['BTCUSDT'] * num_records,
+    timestamps,
+    np.round(open_prices, 2).tolist(),
+    np.round(high_prices, 2).tolist(),
+    np.round(low_prices, 2).tolist(),
+    np.round(close_prices, 2).tolist(),
+    np.round(volumes, 2).tolist()
+))
 
 # Insert into database
-print(f"[3] Inserting {len(prices)} records into database...")
+print(f"[3] Inserting {len(rows)} records into database...")
 
 query = """
     INSERT INTO price_history (symbol, timestamp, open_price, high_price, low_price, close_price, volume)
-    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
 """
 
-for price in prices:
-    db.execute_query(query, (
-        price['symbol'],
-        price['timestamp'],
-        price['open_price'],
-        price['high_price'],
-        price['low_price'],
-        price['close_price'],
-        price['volume']
-    ))
+# All rows in one transaction (one prepared statement, one commit)
+db.execute_many(query, rows)
 
-print(f"✅ Inserted {len(prices)} price records")
+print(f"✅ Inserted {len(rows)} price records")
 
 # Verify
 print("\n[4] Verifying data...")
-verify = db.fetch_one("SELECT COUNT(*) as count FROM price_history WHERE symbol = %s", ('BTCUSDT',))
+verify = db.fetch_one("SELECT COUNT(*) as count FROM price_history WHERE symbol = ?", ('BTCUSDT',))
 count = verify['count'] if verify else 0
 
 print(f"✅ Total BTCUSDT records: {count}")
-print(f"   Price range: ${prices[0]['close_price']:.2f} to ${prices[-1]['close_price']:.2f}")
+print(f"   Price range: ${close_prices[0]:.2f} to ${close_prices[-1]:.2f}")
 
 print("\n" + "=" * 70)
 print("✅ HISTORICAL PRICE DATA ADDED!")
@@ -22,6 +22,7 @@ Last Updated: 2025-11-13
 
 from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
 from functools import wraps
+from models import db
 from models import user_model
 from models import trading_model
 from models import exchange_account_model
@@ -44,6 +45,16 @@ app = Flask(__name__)
 # Set a secret key for session management (change this in production!)
 app.config['SECRET_KEY'] = config.SECRET_KEY
 
+# Price sync and order logs also go to files in logs/
+price_sync_service.configure_logging()
+order_execution_service.configure_logging()
+
+
+@app.teardown_appcontext
+def close_db_connections(exception=None):
+    """Close the database connections this request's thread opened (see models/db.py)."""
+    db.close_thread_connections()
+
 
 # ============================================
 # LOGIN REQUIRED DECORATOR
@@ -2772,15 +2783,18 @@ def api_portfolio_suggestions():
         print(f"FETCHING REAL-TIME PRICES FOR PORTFOLIO ANALYSIS")
         print(f"{'='*70}")
         
+        # Get real-time prices from exchange via CCXT
+        # (one request for all assets instead of one per asset)
+        symbols = [f'{asset}USDT' for asset in balances.keys() if asset != 'USDT']
+        symbol_prices = realtime_price_service.get_current_prices(symbols)
+        
         for asset in balances.keys():
             if asset == 'USDT':
                 # USDT price is always 1.0
                 prices[asset] = 1.0
                 continue
             
-            # Get real-time price from exchange via CCXT
-            symbol = f'{asset}USDT'
-            price = realtime_price_service.get_current_price(symbol)
+            price = symbol_prices.get(f'{asset}USDT')
             
             if price and price > 0:
                 prices[asset] = price
@@ -4,6 +4,8 @@ Contains all configuration settings for the application,
 including database connection parameters.
 """
 
+import os
+
 # ============================================
 # DATABASE CONFIGURATION
 # ============================================
@@ -61,6 +63,46 @@ LIVE_TRADING_ENABLED = False
 # Require confirmation for live trades (additional safety)
 REQUIRE_TRADE_CONFIRMATION = True
 
+# Maximum number of orders sent to an exchange at the same time
+# (e.g. when a grid bot fills several levels in one run).
+# Keeps bursts within the exchange's API rate limits.
+MAX_CONCURRENT_ORDERS = 5
+
+# Maximum orders per batch request on exchanges with a batch-order
+# endpoint (Binance allows 5 per batch, OKX 20, Bybit 10)
+MAX_BATCH_ORDERS = 5
+
+# Order requests per second allowed per exchange API key, shared by all
+# bots using the same key (stays under each venue's published limits)
+ORDER_RATE_LIMITS = {
+    'binance': 10,
+    'bybit': 10,
+    'okx': 30,
+    'mexc': 5,
+    'bingx': 5,
+}
+DEFAULT_ORDER_RATE_LIMIT = 5
+
+# Folder for the application's log files (next to this file, not the
+# current working directory)
+LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
+
+# Two-level trade logging: append trade logs to a daily file in logs/
+# first (fast sequential writes), and copy them into the
+# exchange_trade_logs table in the background every few seconds
+TWO_LEVEL_LOGGING = False
+
+# Send LIVE grid orders over the exchange's WebSocket trading API
+# (ccxt.pro create_order_ws) where supported - lower latency than REST.
+# Exchanges without WebSocket order support fall back to REST.
+USE_WS_TRADING = False
+
+# SIMULATION mode: price orders from the in-memory latest-price cache
+# (refreshed from the database when older than SIMULATION_PRICE_MAX_AGE
+# seconds) instead of querying price_history for every simulated order
+SIMULATION_USE_CACHE = True
+SIMULATION_PRICE_MAX_AGE = 5
+
 
 # ============================================
 # MARKET DATA API CONFIGURATION (TASK 36)
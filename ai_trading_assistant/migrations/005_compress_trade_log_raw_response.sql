@@ -0,0 +1,23 @@
+-- ============================================
+-- MIGRATION 005: Store trade log raw_response compressed
+-- ============================================
+-- 
+-- raw_response in exchange_trade_logs now holds a compressed copy of the
+-- exchange response instead of JSON text. The first byte of the value
+-- is a format tag:
+-- - 'Z' = zstandard-compressed JSON
+-- - 'C' = zlib-compressed JSON (when zstandard is not installed)
+-- - 'J' = plain JSON bytes
+--
+-- Rows written before this migration keep their JSON text and are still
+-- read correctly (see unpack_raw_response() in models/exchange_account_model.py).
+--
+-- SQLite note:
+-- SQLite stores BLOB values as-is even in a TEXT column, so existing
+-- SQLite databases work without running this migration.
+--
+-- Date: 2025-11-20
+-- Author: AI Trading Assistant Team
+-- ============================================
+
+ALTER TABLE exchange_trade_logs MODIFY COLUMN raw_response BLOB;
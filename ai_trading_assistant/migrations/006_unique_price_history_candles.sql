@@ -0,0 +1,41 @@
+-- ============================================
+-- MIGRATION 006: One price_history row per symbol and timestamp
+-- ============================================
+-- 
+-- The index idx_ph_sym_ts on price_history(symbol, timestamp) is UNIQUE,
+-- so syncs can skip candles the database already has (INSERT OR IGNORE).
+-- Databases that stored the same candle twice before that cannot get the
+-- index: the app then keeps the old non-unique index and prints a warning
+-- pointing here (see ensure_indexes() in models/db.py).
+--
+-- This migration keeps the FIRST copy (lowest id) of each candle, deletes
+-- the other copies and creates the unique index.
+--
+-- Run it yourself, after a backup:
+--     cp ai_trading.db ai_trading.db.bak
+--     sqlite3 ai_trading.db < migrations/006_unique_price_history_candles.sql
+--
+-- SQLite syntax (MySQL does not allow selecting from the table a DELETE
+-- changes in a subquery).
+--
+-- Date: 2025-11-24
+-- Author: AI Trading Assistant Team
+-- ============================================
+
+BEGIN;
+
+-- 1. Show the rows that will be removed
+SELECT id, symbol, timestamp, open_price, high_price, low_price, close_price, volume
+FROM price_history
+WHERE id NOT IN (SELECT MIN(id) FROM price_history GROUP BY symbol, timestamp)
+ORDER BY symbol, timestamp, id;
+
+-- 2. Remove them
+DELETE FROM price_history
+WHERE id NOT IN (SELECT MIN(id) FROM price_history GROUP BY symbol, timestamp);
+
+-- 3. Now the unique index can be created (it replaces the old one)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ph_sym_ts ON price_history(symbol, timestamp DESC);
+DROP INDEX IF EXISTS idx_price_history_symbol_ts;
+
+COMMIT;
@@ -14,7 +14,10 @@ from .db import (
     get_connection,
     execute_query,
     fetch_all,
+    fetch_columns,
     fetch_one,
+    close_thread_connections,
+    run_and_close_connections,
     test_connection
 )
 
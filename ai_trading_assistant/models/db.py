@@ -8,12 +8,103 @@ For MySQL, use the original MySQL implementation.
 
 import sqlite3
 import os
+import threading
+from contextlib import contextmanager
 
 
 # Using SQLite for easy setup (no MySQL required)
 USE_SQLITE = True
 
 
+# ============================================
+# INDEXES
+# ============================================
+# "Latest N rows of a symbol" queries (predictions, latest price, charts)
+# and "latest N trades of a user" (trade history) need these. Without them SQLite reads the whole table and sorts it;
+# with them it walks the index backwards and stops after N rows.
+# Created with IF NOT EXISTS, so older databases get them too.
+
+INDEXES = (
+    # UNIQUE also makes the database skip candles it already has
+    # (INSERT OR IGNORE), so syncs don't need to check for duplicates
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_ph_sym_ts ON price_history(symbol, timestamp DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_predictions_symbol_ts ON predictions(symbol, timestamp DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_trades_user_ts ON trades(user_id, created_at DESC)",
+)
+
+# Older indexes covered by the ones above (same columns) - dropped so
+# every insert doesn't have to update two copies
+OBSOLETE_INDEXES = ("idx_price_history_symbol_ts",)
+
+_indexes_ensured = False
+
+
+# ============================================
+# CONNECTION SETTINGS
+# ============================================
+# Applied to every connection when it is opened.
+# - WAL: readers (indicators, UI) don't wait for writers (price syncs)
+# - synchronous=NORMAL: no fsync on every commit, only at checkpoints.
+#   A crash can lose the last few commits (e.g. recently synced candles),
+#   which is fine here - they are simply re-fetched on the next sync.
+# - 64 MB page cache + 256 MB memory map keep hot index pages in memory
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+def apply_pragmas(connection):
+    """
+    Apply the PRAGMAS settings to a connection.
+    
+    Args:
+        connection: Open database connection
+    """
+    try:
+        for statement in PRAGMAS:
+            connection.execute(statement)
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not set connection pragmas: {e}")
+
+
+def ensure_indexes(connection):
+    """
+    Create the indexes in INDEXES (once per process).
+    
+    Args:
+        connection: Open database connection
+    """
+    global _indexes_ensured
+    _indexes_ensured = True
+    
+    all_created = True
+    for statement in INDEXES:
+        try:
+            connection.execute(statement)
+        except sqlite3.IntegrityError:
+            # Duplicate candles stored before the UNIQUE index existed.
+            # Never delete data here - the old index stays in use until
+            # the migration has removed the duplicates.
+            print("⚠️ price_history has duplicate candles, so the unique index was not created. "
+                  "Run migrations/006_unique_price_history_candles.sql to remove them.")
+            all_created = False
+        except sqlite3.Error as e:
+            # e.g. table doesn't exist yet (before setup_sqlite.py ran)
+            print(f"⚠️ Could not create index: {e}")
+            all_created = False
+    
+    if all_created:
+        for name in OBSOLETE_INDEXES:
+            connection.execute(f"DROP INDEX IF EXISTS {name}")
+    
+    connection.commit()
+
+
 def get_connection():
     """
     Create and return a connection to the database.
@@ -31,6 +122,12 @@ def get_connection():
         db_path = 'ai_trading.db'
         connection = sqlite3.connect(db_path)
         connection.row_factory = sqlite3.Row  # Return rows as dictionaries
+        apply_pragmas(connection)
+        
+        # First connection of this process: make sure the indexes exist
+        if not _indexes_ensured:
+            ensure_indexes(connection)
+        
         return connection
             
     except Exception as e:
@@ -93,6 +190,103 @@ def execute_query(query, params=None):
             connection.close()
 
 
+@contextmanager
+def transaction():
+    """
+    Run several statements in ONE explicit transaction.
+    
+    Commits when the block finishes, rolls back if it raises (the error
+    is re-raised). One commit for many rows is much cheaper than one
+    commit per row.
+    
+    Yields:
+        cursor: Cursor to execute statements with
+    
+    Example:
+        with transaction() as cursor:
+            cursor.execute("UPDATE users SET balance = balance - 100 WHERE id = ?", (1,))
+            cursor.execute("UPDATE users SET balance = balance + 100 WHERE id = ?", (2,))
+    """
+    connection = get_connection()
+    if connection is None:
+        raise sqlite3.OperationalError("Database connection failed")
+    
+    cursor = connection.cursor()
+    try:
+        cursor.execute("BEGIN")
+        yield cursor
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def execute_many(query, params_list):
+    """
+    Execute the same INSERT/UPDATE for many rows in ONE transaction.
+    
+    Much faster than calling execute_query() in a loop: the query is
+    prepared once and there is only one commit for all rows.
+    
+    Args:
+        query (str): SQL query with ? placeholders
+        params_list (list): One parameter tuple per row
+    
+    Returns:
+        int: Number of affected rows
+        None: If the query fails (no rows are written)
+    
+    Example:
+        query = "INSERT INTO predictions (symbol, prediction_class, confidence) VALUES (?, ?, ?)"
+        execute_many(query, [("BTCUSDT", 1, 0.7), ("ETHUSDT", 0, 0.6)])
+    """
+    try:
+        with transaction() as cursor:
+            cursor.executemany(query, params_list)
+            return cursor.rowcount
+        
+    except Exception as e:
+        print(f"❌ Query execution error: {e}")
+        return None
+
+
+# ============================================
+# LONG-LIVED READ CONNECTION
+# ============================================
+# fetch_all(), fetch_one() and fetch_columns() run on every page load and
+# API call. Opening a connection (and applying PRAGMAS) for each of them
+# costs more than most of the queries, so reads reuse one connection per
+# thread, like get_logging_conn() does for writes. SELECTs don't open a
+# transaction, so every query still sees the latest committed data.
+
+_read_local = threading.local()
+
+
+def _get_read_conn():
+    """
+    Return this thread's long-lived connection for SELECT queries.
+    
+    Do NOT close it - it is reused by later calls on the same thread
+    (close_thread_connections() closes it when the thread is done).
+    
+    Returns:
+        connection object if successful, None if connection fails
+    """
+    connection = getattr(_read_local, 'connection', None)
+    if connection is not None:
+        return connection
+    
+    connection = get_connection()
+    if connection is None:
+        return None
+    
+    _read_local.connection = connection
+    return connection
+
+
 def fetch_all(query, params=None):
     """
     Execute a SELECT query and return all matching rows.
@@ -112,7 +306,7 @@ def fetch_all(query, params=None):
         
         # Result: [{'id': 1, 'username': 'john', ...}, {'id': 2, ...}]
     """
-    connection = get_connection()
+    connection = _get_read_conn()
     
     # Return None if connection failed
     if connection is None:
@@ -141,10 +335,117 @@ def fetch_all(query, params=None):
         return None
         
     finally:
+        # Only the cursor - the connection is reused (see _get_read_conn())
         if 'cursor' in locals() and cursor:
             cursor.close()
-        if connection:
-            connection.close()
+
+
+def fetch_columns(query, params=None):
+    """
+    Execute a SELECT query and return the result column by column.
+    
+    Faster than fetch_all() when the rows go straight into NumPy/pandas:
+    no dictionary is built per row, and each column can be converted
+    with a single np.asarray() call.
+    
+    Args:
+        query (str): SELECT query
+        params (tuple): Parameters for the query (optional)
+    
+    Returns:
+        dict: {column name: tuple of values} (empty tuples if no rows)
+        None: If query fails
+    
+    Example:
+        columns = fetch_columns("SELECT timestamp, close_price FROM price_history WHERE symbol = ?", ("BTCUSDT",))
+        closes = np.asarray(columns['close_price'], dtype=np.float64)
+    """
+    connection = _get_read_conn()
+    
+    # Return None if connection failed
+    if connection is None:
+        return None
+    
+    try:
+        cursor = connection.cursor()
+        
+        if params:
+            cursor.execute(query, params)
+        else:
+            cursor.execute(query)
+        
+        names = [description[0] for description in cursor.description]
+        rows = cursor.fetchall()
+        
+        # zip(*rows) turns the list of rows into one tuple per column
+        columns = list(zip(*rows)) if rows else [()] * len(names)
+        
+        return dict(zip(names, columns))
+        
+    except Exception as e:
+        print(f"❌ Query error: {e}")
+        return None
+        
+    finally:
+        # Only the cursor - the connection is reused (see _get_read_conn())
+        if 'cursor' in locals() and cursor:
+            cursor.close()
+
+
+def iter_rows(query, params=None, batch_size=1000):
+    """
+    Execute a SELECT query and return an iterator over its rows.
+    
+    Unlike fetch_all(), the rows are read from the database batch_size at
+    a time while you loop over them, so only one batch is in memory -
+    use it for queries that can return a lot of rows.
+    
+    Args:
+        query (str): SELECT query
+        params (tuple): Parameters for the query (optional)
+        batch_size (int): How many rows to read from the database at once
+    
+    Returns:
+        iterator: Yields one dictionary per row
+        None: If query fails
+    
+    Example:
+        rows = iter_rows("SELECT * FROM price_history WHERE symbol = ?", ("BTCUSDT",))
+        for row in rows:
+            print(row['close_price'])
+    """
+    connection = _get_read_conn()
+    
+    # Return None if connection failed
+    if connection is None:
+        return None
+    
+    # Run the query now, so errors are reported here (as None) and not
+    # halfway through the caller's loop
+    cursor = connection.cursor()
+    try:
+        if params:
+            cursor.execute(query, params)
+        else:
+            cursor.execute(query)
+    except Exception as e:
+        print(f"❌ Query error: {e}")
+        cursor.close()
+        return None
+    
+    def rows():
+        try:
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    break
+                for row in batch:
+                    yield dict(row)
+        finally:
+            # Only the cursor - the connection is reused (see _get_read_conn())
+            cursor.close()
+    
+    return rows()
 
 
 def fetch_one(query, params=None):
@@ -166,7 +467,7 @@ def fetch_one(query, params=None):
         
         # Result: {'id': 1, 'username': 'john', 'email': 'john@example.com', ...}
     """
-    connection = get_connection()
+    connection = _get_read_conn()
     
     # Return None if connection failed
     if connection is None:
@@ -194,10 +495,96 @@ def fetch_one(query, params=None):
         return None
         
     finally:
+        # Only the cursor - the connection is reused (see _get_read_conn())
         if 'cursor' in locals() and cursor:
             cursor.close()
-        if connection:
+
+
+# ============================================
+# LONG-LIVED CONNECTION (for frequent writes)
+# ============================================
+# get_connection() opens a new connection for every query. That's fine
+# for normal requests, but trade logging and grid fills write very often,
+# so they reuse one connection per thread instead.
+
+_logging_local = threading.local()
+
+
+def get_logging_conn():
+    """
+    Return this thread's long-lived connection for frequent writes.
+    
+    The connection is opened once per thread (with the same WAL settings
+    as every connection, see PRAGMAS). Do NOT close it - it is reused by later calls on the same thread
+    (close_thread_connections() closes it when the thread is done).
+    
+    Returns:
+        connection object if successful, None if connection fails
+    
+    Example:
+        conn = get_logging_conn()
+        conn.execute("UPDATE grid_levels SET is_filled = 1 WHERE id = ?", (3,))
+        conn.commit()
+    """
+    connection = getattr(_logging_local, 'connection', None)
+    if connection is not None:
+        return connection
+    
+    connection = get_connection()
+    if connection is None:
+        return None
+    
+    _logging_local.connection = connection
+    return connection
+
+
+# ============================================
+# CLOSING THE PER-THREAD CONNECTIONS
+# ============================================
+# The connections above stay open as long as their thread needs them.
+# Web requests and thread pool workers are short-lived, so they close
+# theirs when they finish (see app.teardown_appcontext in app.py and
+# run_and_close_connections() for pool workers).
+
+def close_thread_connections():
+    """
+    Close this thread's read and write connections (if it opened any).
+    
+    The next query on the same thread simply opens a new connection.
+    """
+    for local in (_read_local, _logging_local):
+        connection = getattr(local, 'connection', None)
+        if connection is None:
+            continue
+        
+        local.connection = None
+        try:
             connection.close()
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not close database connection: {e}")
+
+
+def run_and_close_connections(func, *args, **kwargs):
+    """
+    Call func(*args, **kwargs), then close the worker thread's connections.
+    
+    Use it for tasks submitted to a ThreadPoolExecutor, so the pool's
+    threads don't keep database connections open after the work is done.
+    
+    Args:
+        func: Function to run
+        *args, **kwargs: Passed to func
+    
+    Returns:
+        Whatever func returns (exceptions are re-raised)
+    
+    Example:
+        pool.submit(db.run_and_close_connections, get_price_history_df, "BTCUSDT", "1h", 250)
+    """
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_thread_connections()
 
 
 # ============================================
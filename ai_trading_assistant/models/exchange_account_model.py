@@ -22,6 +22,19 @@ but we clearly mark it as insecure for educational purposes only.
 from models import db
 from datetime import datetime
 import base64
+import json
+import zlib
+
+# Optional: faster JSON encoding and better compression for raw_response
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 
 # ============================================
@@ -281,6 +294,7 @@ def deactivate_exchange_account(account_id, user_id):
     """
     
     result = db.execute_query(query, (account_id, user_id))
+    _invalidate_cached_account(user_id, account_id)
     return result is not None
 
 
@@ -318,6 +332,7 @@ def delete_exchange_account(account_id, user_id):
     """
     
     result = db.execute_query(query, (account_id, user_id))
+    _invalidate_cached_account(user_id, account_id)
     
     if result:
         print(f"✅ Exchange account {account_id} deactivated (soft delete)")
@@ -326,6 +341,85 @@ def delete_exchange_account(account_id, user_id):
         return {'success': False, 'error': 'Account not found or access denied'}
 
 
+def _invalidate_cached_account(user_id, account_id):
+    """Tell the order execution service to forget its cached account/client."""
+    # Imported here to avoid a circular import (the service imports this model)
+    from services import order_execution_service
+    order_execution_service.invalidate_cached_account(user_id, account_id)
+
+
+# ============================================
+# RAW RESPONSE STORAGE
+# ============================================
+# Exchange responses are 1-3 KB of JSON each, so they are stored
+# compressed. The first byte tells how the rest was stored:
+#   b'Z' = zstandard-compressed JSON
+#   b'C' = zlib-compressed JSON (used when zstandard isn't installed)
+#   b'J' = plain JSON bytes
+# Old rows hold plain JSON text (str) and are still readable.
+
+RAW_RESPONSE_COMPRESSION_LEVEL = 3
+
+_zstd_compressor = zstandard.ZstdCompressor(level=RAW_RESPONSE_COMPRESSION_LEVEL) if zstandard else None
+_zstd_decompressor = zstandard.ZstdDecompressor() if zstandard else None
+
+
+def pack_raw_response(response):
+    """
+    Encode an exchange response for the raw_response column.
+    
+    Args:
+        response (dict or str): Response dict, or JSON text
+    
+    Returns:
+        bytes: Tagged (and compressed) JSON, or None if response is None
+    """
+    if response is None:
+        return None
+    
+    if isinstance(response, str):
+        data = response.encode('utf-8')
+    elif orjson is not None:
+        data = orjson.dumps(response, default=str)
+    else:
+        data = json.dumps(response, default=str).encode('utf-8')
+    
+    if _zstd_compressor is not None:
+        return b'Z' + _zstd_compressor.compress(data)
+    return b'C' + zlib.compress(data, RAW_RESPONSE_COMPRESSION_LEVEL)
+
+
+def unpack_raw_response(value):
+    """
+    Decode a raw_response column value back into a dict.
+    
+    Args:
+        value (bytes or str): Value stored by pack_raw_response(), or
+                              legacy JSON text
+    
+    Returns:
+        dict: Decoded response (None if value is empty)
+    """
+    if not value:
+        return None
+    
+    # Legacy rows: plain JSON text
+    if isinstance(value, str):
+        return json.loads(value)
+    
+    tag, data = value[:1], value[1:]
+    if tag == b'Z':
+        if _zstd_decompressor is None:
+            raise ValueError("raw_response is zstd-compressed but zstandard is not installed")
+        data = _zstd_decompressor.decompress(data)
+    elif tag == b'C':
+        data = zlib.decompress(data)
+    elif tag != b'J':
+        raise ValueError(f"Unknown raw_response format: {tag!r}")
+    
+    return json.loads(data)
+
+
 # ============================================
 # TRADE LOGGING FUNCTIONS
 # ============================================
@@ -345,7 +439,8 @@ def log_exchange_trade(user_id, exchange_account_id, symbol, side, amount, price
         price (float): Execution price
         status (str): Order status ("NEW", "FILLED", "REJECTED", etc.)
         exchange_order_id (str, optional): Order ID from exchange
-        raw_response (str, optional): Full JSON response from exchange
+        raw_response (dict or str, optional): Full response from exchange
+                                             (stored compressed)
         trade_source (str): What triggered this trade
         fee (float): Trading fee amount
         fee_currency (str): Fee currency
@@ -367,7 +462,8 @@ def log_exchange_trade(user_id, exchange_account_id, symbol, side, amount, price
     
     log_id = db.execute_query(query, (
         user_id, exchange_account_id, symbol, side, amount, price, total_value,
-        status, exchange_order_id, raw_response, trade_source, fee, fee_currency, error_message
+        status, exchange_order_id, pack_raw_response(raw_response), trade_source, fee,
+        fee_currency, error_message
     ))
     
     return log_id
@@ -414,7 +510,7 @@ def get_user_trade_logs(user_id, limit=50):
         limit (int): Maximum number of records to return
     
     Returns:
-        list: List of trade log records
+        list: List of trade log records (raw_response decoded to a dict)
     """
     
     query = """
@@ -427,7 +523,15 @@ def get_user_trade_logs(user_id, limit=50):
     """
     
     logs = db.fetch_all(query, (user_id, limit))
-    return logs if logs else []
+    
+    if not logs:
+        return []
+    
+    # raw_response is stored compressed - return it as a dict
+    for log in logs:
+        log['raw_response'] = unpack_raw_response(log['raw_response'])
+    
+    return logs
 
 
 def get_trade_statistics(user_id, symbol=None):
@@ -148,6 +148,7 @@ CREATE TABLE exchange_trade_logs (
     --   "REJECTED" = exchange rejected the order
     --   "EXPIRED" = order expired
     --   "ERROR" = API error occurred
+    --   "UNKNOWN" = network error mid-request, check the exchange
     status TEXT DEFAULT 'NEW',
     
     -- Order ID from the exchange
@@ -161,15 +162,17 @@ CREATE TABLE exchange_trade_logs (
     -- Fee currency (e.g., "BNB", "USDT")
     fee_currency TEXT,
     
-    -- Raw JSON response from exchange API
+    -- Raw JSON response from exchange API (compressed)
     -- Stores complete response for debugging and auditing
-    -- Example: {"orderId": "123", "status": "FILLED", ...}
+    -- First byte is a format tag: 'Z' = zstd, 'C' = zlib, 'J' = plain JSON
+    -- (see pack_raw_response() in models/exchange_account_model.py)
+    -- Example (decoded): {"orderId": "123", "status": "FILLED", ...}
     -- Useful for:
     --   - Debugging failed trades
     --   - Audit trail
     --   - Regulatory compliance
     --   - Dispute resolution
-    raw_response TEXT,
+    raw_response BLOB,
     
     -- Error message if trade failed
     -- Example: "Insufficient balance", "Invalid symbol", etc.
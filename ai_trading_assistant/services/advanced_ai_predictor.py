@@ -14,12 +14,15 @@ Author: AI Trading Assistant Team
 Created: 2025-11-13
 """
 
-import pandas as pd
 import numpy as np
 import joblib
 import os
 from datetime import timedelta
 
+# Feature engineering must match training exactly - so use the training
+# script's own (single-pass) feature code instead of a copy
+from services.train_advanced_ai_model import build_features
+
 
 # ============================================
 # MODEL LOADING
@@ -43,6 +46,7 @@ def load_models():
         - Direction Model: Predicts UP (1) or DOWN (0)
         - Return Model: Predicts magnitude of price change (%)
         - Scaler: Normalizes features to match training scale
+                  (only models trained with one - older Random Forest models)
         - Feature Info: Column names and order
     """
     global DIRECTION_MODEL, RETURN_MODEL, SCALER, FEATURE_INFO
@@ -65,9 +69,14 @@ def load_models():
     try:
         DIRECTION_MODEL = joblib.load(direction_path)
         RETURN_MODEL = joblib.load(return_path)
-        SCALER = joblib.load(scaler_path)
         FEATURE_INFO = joblib.load(feature_info_path)
         
+        # Gradient boosting models are trained on raw features (no scaler)
+        if FEATURE_INFO.get('scaling', 'standard') != 'none':
+            SCALER = joblib.load(scaler_path)
+        else:
+            SCALER = None
+        
         print(f"✅ AI models loaded successfully")
         print(f"   Direction accuracy: {FEATURE_INFO['direction_accuracy']*100:.1f}%")
         print(f"   Return MAE: {FEATURE_INFO['return_mae']*100:.2f}%")
@@ -83,68 +92,6 @@ def load_models():
 load_models()
 
 
-# ============================================
-# FEATURE ENGINEERING (Match Training)
-# ============================================
-
-def compute_simple_indicators(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Compute technical indicators (same as training)
-    
-    IMPORTANT: Must match exactly what was used in training!
-    """
-    prices = df['close']
-    
-    # RSI (14-period)
-    delta = prices.diff()
-    gain = delta.where(delta > 0, 0).rolling(window=14).mean()
-    loss = -delta.where(delta < 0, 0).rolling(window=14).mean()
-    rs = gain / loss
-    df['rsi'] = 100 - (100 / (1 + rs))
-    
-    # MACD (12,26)
-    ema12 = prices.ewm(span=12, adjust=False).mean()
-    ema26 = prices.ewm(span=26, adjust=False).mean()
-    df['macd'] = ema12 - ema26
-    
-    # Moving Average Ratio (20 / 50)
-    ma20 = prices.rolling(window=20).mean()
-    ma50 = prices.rolling(window=50).mean()
-    df['ma_ratio'] = ma20 / ma50
-    
-    return df
-
-
-def build_features(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Engineer features (same as training)
-    
-    IMPORTANT: Must match exactly what was used in training!
-    """
-    # Price Returns
-    df['return_1h'] = df['close'].pct_change(1)
-    df['return_3h'] = df['close'].pct_change(3)
-    df['return_6h'] = df['close'].pct_change(6)
-    df['return_12h'] = df['close'].pct_change(12)
-    df['return_24h'] = df['close'].pct_change(24)
-    
-    # Volatility
-    df['volatility_24h'] = df['return_1h'].rolling(window=24).std()
-    
-    # Technical Indicators
-    df = compute_simple_indicators(df)
-    
-    # Volume Features
-    df['volume_change'] = df['volume'].pct_change(1)
-    
-    # Price Position
-    df['high_24h'] = df['high'].rolling(window=24).max()
-    df['low_24h'] = df['low'].rolling(window=24).min()
-    df['price_position'] = (df['close'] - df['low_24h']) / (df['high_24h'] - df['low_24h'])
-    
-    return df
-
-
 # ============================================
 # PREDICTION FUNCTION
 # ============================================
@@ -250,9 +197,12 @@ def advanced_ai_predict(symbol: str, timeframe: str = "1h") -> dict:
     # Extract latest row features
     latest_features = df[feature_columns].iloc[-1].values.reshape(1, -1)
     
-    # Normalize using saved scaler
+    # Normalize using saved scaler (if the models were trained with one)
     # IMPORTANT: Must use same scaler as training!
-    latest_features_scaled = SCALER.transform(latest_features)
+    if SCALER is not None:
+        latest_features_scaled = SCALER.transform(latest_features)
+    else:
+        latest_features_scaled = latest_features
     
     # Get current price
     current_price = float(df['close'].iloc[-1])
@@ -25,9 +25,15 @@ For this university project, we're demonstrating the concept.
 """
 
 import ccxt
+import ccxt.async_support as ccxt_async
+import ccxt.pro as ccxt_pro
 from typing import Dict, List, Optional
 
 
+# Exchanges supported by this module (ccxt class names)
+SUPPORTED_EXCHANGES = ('binance', 'bybit', 'okx', 'mexc', 'bingx')
+
+
 # ============================================
 # EXCHANGE CLIENT CREATION
 # ============================================
@@ -69,16 +75,54 @@ def create_exchange_client(exchange_name, api_key=None, api_secret=None, is_test
         Use environment variables or secure storage.
     """
     
+    return _build_exchange_client(ccxt, exchange_name, api_key, api_secret, is_testnet)
+
+
+def create_async_exchange_client(exchange_name, api_key=None, api_secret=None, is_testnet=False):
+    """
+    Create an asyncio exchange client (ccxt.async_support).
+    
+    Same arguments and behaviour as create_exchange_client(), but the
+    client's methods are coroutines, so several orders can be in flight
+    at once. Close it with `await client.close()` when done.
+    
+    Returns:
+        ccxt.async_support.Exchange: Initialized async exchange client
+        None: If exchange not supported or error occurred
+    """
+    
+    return _build_exchange_client(ccxt_async, exchange_name, api_key, api_secret, is_testnet)
+
+
+def create_ws_exchange_client(exchange_name, api_key=None, api_secret=None, is_testnet=False):
+    """
+    Create an asyncio exchange client with WebSocket support (ccxt.pro).
+    
+    Works like create_async_exchange_client(), but on exchanges where
+    client.has['createOrderWs'] is True, place_market_order_async() sends
+    orders over one authenticated WebSocket connection instead of a REST
+    request per order. Close it with `await client.close()` when done.
+    
+    Returns:
+        ccxt.pro.Exchange: Initialized WebSocket-capable client
+        None: If exchange not supported or error occurred
+    """
+    
+    return _build_exchange_client(ccxt_pro, exchange_name, api_key, api_secret, is_testnet)
+
+
+def _build_exchange_client(ccxt_module, exchange_name, api_key, api_secret, is_testnet):
+    """Create a client from `ccxt_module` (ccxt, ccxt.async_support or ccxt.pro)."""
+    
     # Normalize exchange name to lowercase
     exchange_name = exchange_name.lower().strip()
     
     # Map of supported exchanges to their ccxt classes
+    # (ccxt.pro doesn't have every exchange)
     exchange_classes = {
-        'binance': ccxt.binance,
-        'bybit': ccxt.bybit,
-        'okx': ccxt.okx,
-        'mexc': ccxt.mexc,
-        'bingx': ccxt.bingx
+        name: getattr(ccxt_module, name)
+        for name in SUPPORTED_EXCHANGES
+        if hasattr(ccxt_module, name)
     }
     
     # Check if exchange is supported
@@ -320,22 +364,8 @@ def place_market_order(exchange, symbol, side, amount):
         - Understand you can lose money in real trading
     """
     
-    if not exchange:
-        print("❌ Error: Exchange client is None")
-        return None
-    
-    # Validate inputs
-    if not symbol or not side or not amount:
-        print("❌ Error: Missing required parameters (symbol, side, amount)")
-        return None
-    
-    side = side.lower()
-    if side not in ['buy', 'sell']:
-        print(f"❌ Error: Invalid side '{side}'. Must be 'buy' or 'sell'")
-        return None
-    
-    if amount <= 0:
-        print(f"❌ Error: Amount must be positive (got {amount})")
+    side = _check_order_params(exchange, symbol, side, amount)
+    if side is None:
         return None
     
     try:
@@ -389,6 +419,201 @@ def place_market_order(exchange, symbol, side, amount):
         return None
 
 
+async def place_market_order_async(exchange, symbol, side, amount):
+    """
+    Async version of place_market_order() for ccxt.async_support clients.
+    
+    Lets the caller await several orders concurrently (e.g. all eligible
+    grid levels at once) instead of waiting for each round-trip in turn.
+    
+    With a ccxt.pro client on an exchange that supports it
+    (has['createOrderWs']), the order goes over the WebSocket trading API;
+    otherwise it is sent through REST.
+    
+    Args:
+        exchange: ccxt.async_support or ccxt.pro exchange client instance
+        symbol (str): Trading pair (e.g., "BTC/USDT")
+        side (str): "buy" or "sell"
+        amount (float): Amount to trade (in base currency)
+    
+    Returns:
+        dict: Order result, or None if error occurs
+    """
+    
+    side = _check_order_params(exchange, symbol, side, amount)
+    if side is None:
+        return None
+    
+    try:
+        if exchange.has.get('createOrderWs'):
+            order = await exchange.create_order_ws(symbol, 'market', side, amount)
+        else:
+            order = await exchange.create_market_order(
+                symbol=symbol,
+                side=side,
+                amount=amount
+            )
+        
+        print(f"✅ Order placed: {side.upper()} {amount} {symbol} on {exchange.id} "
+              f"(ID: {order.get('id', 'N/A')}, status: {order.get('status', 'N/A')})")
+        
+        return order
+        
+    except ccxt.InsufficientFunds as e:
+        print(f"❌ Insufficient Funds: Not enough balance to execute order")
+        print(f"   {e}")
+        return None
+        
+    except ccxt.InvalidOrder as e:
+        print(f"❌ Invalid Order: Order parameters are incorrect")
+        print(f"   {e}")
+        return None
+        
+    except ccxt.AuthenticationError as e:
+        print(f"❌ Authentication Error: Invalid API credentials")
+        print(f"   {e}")
+        return None
+        
+    except ccxt.NetworkError as e:
+        print(f"❌ Network Error: Cannot connect to exchange")
+        print(f"   {e}")
+        return None
+        
+    except Exception as e:
+        print(f"❌ Error placing order: {e}")
+        return None
+
+
+# Exchanges whose batch-order endpoint also takes spot orders. The others
+# (e.g. Binance: "createOrders() does not support spot orders") only batch
+# contract (linear/inverse) orders.
+SPOT_BATCH_EXCHANGES = ('okx', 'bybit')
+
+
+async def supports_batch_orders(exchange, symbol):
+    """
+    Check whether orders for `symbol` can go through
+    place_market_orders_batch_async().
+    
+    Args:
+        exchange: ccxt.async_support exchange client instance
+        symbol (str): Trading pair (e.g., "BTC/USDT")
+    
+    Returns:
+        bool: True if the exchange has a batch endpoint for this market
+    """
+    
+    if not exchange or not exchange.has.get('createOrders'):
+        return False
+    
+    if exchange.id in SPOT_BATCH_EXCHANGES:
+        return True
+    
+    try:
+        # Cached by ccxt after the first call (create_orders loads them anyway)
+        await exchange.load_markets()
+        market = exchange.market(symbol)
+    except Exception as e:
+        print(f"⚠️ Could not check batch support for {symbol} on {exchange.id}: {e}")
+        return False
+    
+    # Contract markets are linear or inverse; spot markets are neither
+    return bool(market.get('linear') or market.get('inverse'))
+
+
+async def place_market_orders_batch_async(exchange, symbol, orders):
+    """
+    Place several market orders for one symbol in a single batch request.
+    
+    Uses the exchange's batch-order endpoint through ccxt's create_orders()
+    (e.g. Binance batchOrders, OKX trade/batch-orders, Bybit
+    order/create-batch): one round-trip and one rate-limit hit for the
+    whole batch. Only call this when supports_batch_orders() is True.
+    
+    Args:
+        exchange: ccxt.async_support exchange client instance
+        symbol (str): Trading pair (e.g., "BTC/USDT")
+        orders (list): (side, amount) tuples
+    
+    Returns:
+        list: One order dict per input order (same order), or None if
+              the batch was invalid or the exchange rejected it (nothing
+              was executed - the orders can be retried one by one)
+    
+    Raises:
+        ccxt.NotSupported: The exchange can't batch these orders (nothing
+            was sent - place them one by one instead)
+        ccxt.NetworkError: The request failed in transit. The batch may
+            or may not have been executed - do NOT simply resend it
+    """
+    
+    batch = []
+    for side, amount in orders:
+        side = _check_order_params(exchange, symbol, side, amount)
+        if side is None:
+            return None
+        batch.append({'symbol': symbol, 'type': 'market', 'side': side, 'amount': amount})
+    
+    try:
+        placed = await exchange.create_orders(batch)
+        
+        print(f"✅ Batch of {len(batch)} order(s) placed for {symbol} on {exchange.id}")
+        
+        return placed
+        
+    except ccxt.InsufficientFunds as e:
+        print(f"❌ Insufficient Funds: Not enough balance to execute batch")
+        print(f"   {e}")
+        return None
+        
+    except ccxt.InvalidOrder as e:
+        print(f"❌ Invalid Order: Batch parameters are incorrect")
+        print(f"   {e}")
+        return None
+        
+    except ccxt.AuthenticationError as e:
+        print(f"❌ Authentication Error: Invalid API credentials")
+        print(f"   {e}")
+        return None
+        
+    except (ccxt.NotSupported, ccxt.NetworkError):
+        # The caller has to tell these apart from a rejected batch (see Raises)
+        raise
+        
+    except Exception as e:
+        print(f"❌ Error placing batch orders: {e}")
+        return None
+
+
+def _check_order_params(exchange, symbol, side, amount):
+    """
+    Validate market order inputs.
+    
+    Returns:
+        str: Normalized side ("buy"/"sell"), or None if invalid
+    """
+    
+    if not exchange:
+        print("❌ Error: Exchange client is None")
+        return None
+    
+    # Validate inputs
+    if not symbol or not side or not amount:
+        print("❌ Error: Missing required parameters (symbol, side, amount)")
+        return None
+    
+    side = side.lower()
+    if side not in ['buy', 'sell']:
+        print(f"❌ Error: Invalid side '{side}'. Must be 'buy' or 'sell'")
+        return None
+    
+    if amount <= 0:
+        print(f"❌ Error: Amount must be positive (got {amount})")
+        return None
+    
+    return side
+
+
 # ============================================
 # MARKET DATA
 # ============================================
@@ -22,6 +22,11 @@ Example:
 """
 
 from models import db
+from datetime import datetime
+
+
+# Max level IDs per UPDATE ... WHERE id IN (...) statement
+MARK_FILLED_CHUNK_SIZE = 500
 
 
 def create_grid_bot(user_id, symbol, lower_price, upper_price, grid_count, investment_amount,
@@ -270,8 +275,12 @@ def create_grid_bot(user_id, symbol, lower_price, upper_price, grid_count, inves
         VALUES (?, ?, ?, 0)
     """
     
-    for level in grid_levels:
-        db.execute_query(query, (bot_id, level['level_price'], level['order_type']))
+    # All levels in one transaction (one commit instead of one per level;
+    # a grid can have up to 100 levels)
+    db.execute_many(query, [
+        (bot_id, level['level_price'], level['order_type'])
+        for level in grid_levels
+    ])
     
     print(f"✅ Grid levels saved to database")
     
@@ -408,6 +417,108 @@ def get_bot_details(bot_id, user_id=None):
     }
 
 
+def get_bot_execution_snapshot(bot_id, user_id):
+    """
+    Get everything needed to run a bot's levels in ONE query:
+    the bot row, its grid levels and the latest stored price.
+    
+    get_bot_details() + price_service.get_latest_price() need three
+    separate queries (three connections); the execution path runs
+    often, so here we LEFT JOIN the levels and pick the latest price
+    with a subquery instead.
+    
+    Args:
+        bot_id (int): Bot's ID
+        user_id (int): User's ID (for verification)
+    
+    Returns:
+        dict: {'bot': ..., 'levels': [...], 'latest_price': float or None},
+              or None if the bot is not found
+    """
+    query = """
+        SELECT b.*,
+               l.id AS gl_id,
+               l.level_price AS gl_level_price,
+               l.order_type AS gl_order_type,
+               l.is_filled AS gl_is_filled,
+               l.filled_at AS gl_filled_at,
+               (SELECT close_price FROM price_history
+                WHERE symbol = b.symbol
+                ORDER BY timestamp DESC
+                LIMIT 1) AS gl_latest_price
+        FROM grid_bots b
+        LEFT JOIN grid_levels l ON l.bot_id = b.id
+        WHERE b.id = ? AND b.user_id = ?
+        ORDER BY l.level_price ASC
+    """
+    rows = db.fetch_all(query, (bot_id, user_id))
+    
+    if not rows:
+        return None
+    
+    # Bot columns are the same on every row - take them from the first one
+    bot = {key: value for key, value in rows[0].items() if not key.startswith('gl_')}
+    
+    # One row per level (a bot without levels gives a single row of NULLs)
+    levels = [
+        {
+            'id': row['gl_id'],
+            'bot_id': bot_id,
+            'level_price': row['gl_level_price'],
+            'order_type': row['gl_order_type'],
+            'is_filled': row['gl_is_filled'],
+            'filled_at': row['gl_filled_at']
+        }
+        for row in rows
+        if row['gl_id'] is not None
+    ]
+    
+    return {
+        'bot': bot,
+        'levels': levels,
+        'latest_price': rows[0]['gl_latest_price']
+    }
+
+
+def mark_levels_filled(level_ids):
+    """
+    Mark several grid levels as filled in one transaction (one commit).
+    
+    All levels get the same filled_at time. Very long ID lists are split
+    into chunks of MARK_FILLED_CHUNK_SIZE (SQLite limits the number of
+    ? parameters per statement), but still committed together.
+    
+    Args:
+        level_ids (list): IDs of the grid levels that were executed
+    
+    Returns:
+        int: Number of rows updated (or None if the query failed)
+    """
+    if not level_ids:
+        return 0
+    
+    # Fills happen on every grid run - reuse the long-lived connection
+    connection = db.get_logging_conn()
+    if connection is None:
+        return None
+    
+    filled_at = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+    updated = 0
+    
+    try:
+        # "with connection" commits once at the end (or rolls back on error)
+        with connection:
+            for start in range(0, len(level_ids), MARK_FILLED_CHUNK_SIZE):
+                chunk = level_ids[start:start + MARK_FILLED_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                query = f"UPDATE grid_levels SET is_filled = 1, filled_at = ? WHERE id IN ({placeholders})"
+                updated += connection.execute(query, (filled_at, *chunk)).rowcount
+        return updated
+    except Exception as e:
+        print(f"❌ Query error: {e}")
+        return None
+
+
 def stop_grid_bot(bot_id, user_id):
     """
     Stop a grid bot (set is_active to 0).
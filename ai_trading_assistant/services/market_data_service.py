@@ -19,7 +19,26 @@ Educational Purpose:
 
 import requests
 import os
+import time
+import logging
+import operator
+import threading
+import warnings
+import numpy as np
+from collections import OrderedDict
 from datetime import datetime
+from types import MappingProxyType
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# ijson is optional - when installed, large listings are stream-parsed
+# coin by coin instead of loading the whole JSON document into memory
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 
 # ============================================
@@ -40,9 +59,59 @@ except ImportError:
     CMC_BASE_URL = "https://pro-api.coinmarketcap.com/v1"
     CMC_API_KEY = os.environ.get('CMC_API_KEY', 'YOUR_API_KEY_HERE')
 
+# Demo mode: no real API key configured, so the CoinMarketCap functions
+# return static demo data. Decided once here instead of on every call.
+_DEMO_MODE = (not CMC_API_KEY) or CMC_API_KEY == 'YOUR_API_KEY_HERE'
+
+if _DEMO_MODE:
+    warnings.warn(
+        "CoinMarketCap API key not configured - market data service returns demo data. "
+        "Get a free key at https://coinmarketcap.com/api/ and set CMC_API_KEY "
+        "(environment variable or config.py)."
+    )
+
 # Timeout for API requests (seconds)
 REQUEST_TIMEOUT = 10
 
+# Shared CoinMarketCap session
+# Reusing one session keeps the TCP/TLS connection to pro-api.coinmarketcap.com
+# alive between calls instead of doing a fresh handshake every request.
+# The auth headers are set once here, so the functions below don't rebuild them.
+_session = requests.Session()
+_session.headers.update({
+    'X-CMC_PRO_API_KEY': CMC_API_KEY,
+    'Accept': 'application/json'
+})
+_session.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        raise_on_status=False  # Let the status checks below handle final failures
+    )
+))
+
+
+# Conditional-GET cache for the listings endpoint
+# Maps (url, params) -> (etag, last_modified, parsed result).
+# If CoinMarketCap answers 304 Not Modified we reuse the parsed result
+# and skip both the body download and the JSON parsing.
+# limit/convert come from the request, so only the CONDITIONAL_CACHE_SIZE
+# most recently used entries are kept (least recently used dropped first).
+CONDITIONAL_CACHE_SIZE = 32
+_conditional_cache = OrderedDict()
+_conditional_cache_lock = threading.Lock()
+
+
+def _copy_top_coins_result(result):
+    """
+    Copy a cached get_top_coins() result (the outer dict and every coin dict),
+    so callers that change it don't change the cache.
+    """
+    return {**result, 'data': [dict(coin) for coin in result['data']]}
+
 
 # ============================================
 # FEAR & GREED INDEX
@@ -262,22 +331,13 @@ def get_top_coins(limit=100, convert='USD'):
         >>>         print(f"{coin['rank']}. {coin['name']} (${coin['price']:.2f})")
     """
     
-    print(f"\n{'='*70}")
-    print(f"FETCHING TOP {limit} CRYPTOCURRENCIES")
-    print(f"{'='*70}")
+    start_time = time.perf_counter()
     
     # ========================================
     # STEP 1: Check API Key
     # ========================================
     
-    if not CMC_API_KEY or CMC_API_KEY == 'YOUR_API_KEY_HERE':
-        print(f"⚠️ CoinMarketCap API key not configured!")
-        print(f"   To use this feature:")
-        print(f"   1. Get free API key at https://coinmarketcap.com/api/")
-        print(f"   2. Set environment variable: export CMC_API_KEY='your-key-here'")
-        print(f"   3. Or update config.py with your key")
-        print(f"\n   Returning demo data for now...")
-        
+    if _DEMO_MODE:
         # Return demo/placeholder data for development
         return {
             'success': False,
@@ -290,18 +350,14 @@ def get_top_coins(limit=100, convert='USD'):
     # STEP 2: Prepare API Request
     # ========================================
     
+    response = None
+    
     try:
         # CoinMarketCap API endpoint for latest listings
         url = f"{CMC_BASE_URL}/cryptocurrency/listings/latest"
         
-        # Request headers
-        # X-CMC_PRO_API_KEY is required for authentication
-        headers = {
-            'X-CMC_PRO_API_KEY': CMC_API_KEY,
-            'Accept': 'application/json'
-        }
-        
         # Request parameters
+        # (X-CMC_PRO_API_KEY auth header is already set on _session)
         params = {
             'limit': limit,          # How many coins to return
             'convert': convert,      # Target currency (USD, BTC, ETH)
@@ -309,28 +365,43 @@ def get_top_coins(limit=100, convert='USD'):
             'sort_dir': 'desc'       # Descending order (biggest to smallest)
         }
         
-        print(f"API: {url}")
-        print(f"Limit: {limit} coins")
-        print(f"Convert: {convert}")
-        print(f"Sending request...")
-        
         # ========================================
         # STEP 3: Send Request
         # ========================================
         
-        response = requests.get(
+        # Ask the API to skip the body if nothing changed since last time
+        cache_key = (url, tuple(sorted(params.items())))
+        with _conditional_cache_lock:
+            cached = _conditional_cache.get(cache_key)
+            if cached is not None:
+                _conditional_cache.move_to_end(cache_key)
+        
+        headers = {}
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        
+        # stream=True lets ijson read the body incrementally (see STEP 4)
+        response = _session.get(
             url, 
-            headers=headers, 
             params=params, 
-            timeout=REQUEST_TIMEOUT
+            headers=headers,
+            timeout=REQUEST_TIMEOUT,
+            stream=ijson is not None
         )
         
-        print(f"Response Status: {response.status_code}")
+        # 304 Not Modified - reuse the result we parsed last time
+        if response.status_code == 304 and cached:
+            logger.info("top_coins not modified limit=%d convert=%s", limit, convert)
+            return _copy_top_coins_result(cached[2])
         
         # Check for errors
         if response.status_code == 401:
             # Unauthorized - API key invalid
-            print(f"❌ Invalid API key")
+            logger.warning("top_coins failed: invalid CoinMarketCap API key")
             return {
                 'success': False,
                 'error': 'Invalid CoinMarketCap API key'
@@ -338,7 +409,7 @@ def get_top_coins(limit=100, convert='USD'):
         
         elif response.status_code == 429:
             # Too many requests - rate limit exceeded
-            print(f"❌ Rate limit exceeded")
+            logger.warning("top_coins failed: rate limit exceeded")
             return {
                 'success': False,
                 'error': 'API rate limit exceeded. Try again later.'
@@ -346,7 +417,7 @@ def get_top_coins(limit=100, convert='USD'):
         
         elif response.status_code != 200:
             # Other error
-            print(f"❌ API error: {response.status_code}")
+            logger.warning("top_coins failed: status=%d", response.status_code)
             return {
                 'success': False,
                 'error': f'API returned status {response.status_code}'
@@ -356,8 +427,6 @@ def get_top_coins(limit=100, convert='USD'):
         # STEP 4: Parse Response
         # ========================================
         
-        data = response.json()
-        
         # CoinMarketCap response structure:
         # {
         #   "status": {...},
@@ -383,89 +452,333 @@ def get_top_coins(limit=100, convert='USD'):
         #   ]
         # }
         
-        if 'data' not in data:
-            print(f"❌ Invalid API response format")
-            return {
-                'success': False,
-                'error': 'Invalid API response format'
-            }
+        # Set by the ijson path when the response has a "data" list
+        data_seen = []
+        
+        if ijson is not None:
+            # Stream-parse: yield one coin object at a time from "data",
+            # so the full response is never held in memory at once
+            response.raw.decode_content = True  # Handle gzip transfer encoding
+            events = ijson.parse(response.raw, use_float=True)
+            raw_coins = ijson.items(_watch_for_data(events, data_seen), 'data.item')
+        else:
+            data = response.json()
+            
+            if 'data' not in data:
+                logger.warning("top_coins failed: invalid response format")
+                return {
+                    'success': False,
+                    'error': 'Invalid API response format'
+                }
+            
+            raw_coins = data['data']
         
         # ========================================
         # STEP 5: Extract and Format Coin Data
         # ========================================
         
-        coins = []
+        # Collect one plain tuple per coin (column order = _COIN_DTYPE),
+        # then build a single column-oriented NumPy array from all rows
+        rows = []
+        
+        add_row = rows.append
         
-        for coin in data['data']:
+        for coin in raw_coins:
             # Extract quote data for target currency (usually USD)
-            if convert not in coin.get('quote', {}):
+            quote = coin.get('quote', {}).get(convert)
+            if quote is None:
                 continue
             
-            quote = coin['quote'][convert]
+            # One C-level fetch of all quote numbers; CoinMarketCap always
+            # sends these keys, the .get() fallback covers odd responses
+            try:
+                quote_values = _get_quote_values(quote)
+            except KeyError:
+                quote_values = tuple(quote.get(field, 0) for field in _QUOTE_FIELDS)
             
-            # Build simplified coin object
-            coin_data = {
-                'rank': coin.get('cmc_rank', 0),
-                'name': coin.get('name', 'Unknown'),
-                'symbol': coin.get('symbol', 'N/A'),
-                'price': round(quote.get('price', 0), 2),
-                'market_cap': round(quote.get('market_cap', 0), 2),
-                'volume_24h': round(quote.get('volume_24h', 0), 2),
-                'percent_change_1h': round(quote.get('percent_change_1h', 0), 2),
-                'percent_change_24h': round(quote.get('percent_change_24h', 0), 2),
-                'percent_change_7d': round(quote.get('percent_change_7d', 0), 2),
-                'circulating_supply': round(coin.get('circulating_supply', 0), 2),
-                'max_supply': round(coin.get('max_supply', 0), 2) if coin.get('max_supply') else None,
-                'last_updated': coin.get('last_updated', '')
+            add_row((
+                coin.get('cmc_rank') or 0,
+                coin.get('name', 'Unknown'),
+                coin.get('symbol', 'N/A'),
+                *quote_values,
+                coin.get('circulating_supply', 0),
+                coin.get('max_supply') or np.nan,  # NaN = no max supply
+                coin.get('last_updated', '')
+            ))
+        
+        # Same check as the json path above - the stream is only read
+        # while looping, so it can only be done now
+        if ijson is not None and not data_seen:
+            logger.warning("top_coins failed: invalid response format")
+            return {
+                'success': False,
+                'error': 'Invalid API response format'
             }
-            
-            coins.append(coin_data)
         
-        print(f"✅ Fetched {len(coins)} coins successfully")
-        print(f"   Top 3:")
-        for i, coin in enumerate(coins[:3]):
-            print(f"   {i+1}. {coin['name']} (${coin['price']:,.2f})")
-        print(f"{'='*70}\n")
+        coins = _build_coin_records(rows)
+        
+        logger.info(
+            "top_coins fetched count=%d limit=%d convert=%s elapsed=%.1fms",
+            len(coins), limit, convert, (time.perf_counter() - start_time) * 1000
+        )
+        
+        # Top 3 summary is only built when debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, coin in enumerate(coins[:3]):
+                logger.debug("top_coins #%d %s ($%s)", i + 1, coin['name'], f"{coin['price']:,.2f}")
         
         # ========================================
         # STEP 6: Return Formatted Data
         # ========================================
         
-        return {
+        result = {
             'success': True,
             'data': coins,
             'count': len(coins),
             'convert': convert
         }
         
+        # Remember validators so the next call can be a conditional GET
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            with _conditional_cache_lock:
+                _conditional_cache[cache_key] = (etag, last_modified, _copy_top_coins_result(result))
+                _conditional_cache.move_to_end(cache_key)
+                while len(_conditional_cache) > CONDITIONAL_CACHE_SIZE:
+                    _conditional_cache.popitem(last=False)
+        
+        return result
+        
     except requests.exceptions.Timeout:
-        print(f"❌ Request timeout")
+        logger.warning("top_coins failed: request timeout")
         return {
             'success': False,
             'error': 'Request timeout - API is slow or unavailable'
         }
         
     except requests.exceptions.ConnectionError:
-        print(f"❌ Connection error")
+        logger.warning("top_coins failed: connection error")
         return {
             'success': False,
             'error': 'Network error - Check internet connection'
         }
         
     except Exception as e:
-        print(f"❌ Unexpected error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("CMC top_coins call failed")
         return {
             'success': False,
             'error': str(e)
         }
+    
+    finally:
+        # Release the pooled connection (needed when the body was streamed)
+        if response is not None:
+            response.close()
+
+
+# ============================================
+# COIN TABLE HELPERS
+# ============================================
+
+# Column layout of the top-coins table.
+# Numbers live in float64 columns so they can be rounded in one vectorized
+# call instead of one round() per field per coin.
+_COIN_DTYPE = np.dtype([
+    ('rank', 'i4'),
+    ('name', 'O'),
+    ('symbol', 'O'),
+    ('price', 'f8'),
+    ('market_cap', 'f8'),
+    ('volume_24h', 'f8'),
+    ('percent_change_1h', 'f8'),
+    ('percent_change_24h', 'f8'),
+    ('percent_change_7d', 'f8'),
+    ('circulating_supply', 'f8'),
+    ('max_supply', 'f8'),
+    ('last_updated', 'O'),
+])
+
+_COIN_FLOAT_FIELDS = tuple(
+    name for name in _COIN_DTYPE.names if _COIN_DTYPE[name] == np.float64
+)
+
+# Quote fields read for each coin, in _COIN_DTYPE column order
+_QUOTE_FIELDS = (
+    'price',
+    'market_cap',
+    'volume_24h',
+    'percent_change_1h',
+    'percent_change_24h',
+    'percent_change_7d',
+)
+_get_quote_values = operator.itemgetter(*_QUOTE_FIELDS)
+
+
+# Numeric fields returned by get_live_prices (price first)
+_LIVE_PRICE_FIELDS = (
+    'price',
+    'percent_change_1h',
+    'percent_change_24h',
+    'percent_change_7d',
+    'volume_24h',
+    'market_cap',
+)
+
+# Numeric fields returned by get_token_details
+# (the first 11 come from the quote, the last 3 from the coin itself)
+_DETAIL_FLOAT_FIELDS = (
+    'price',
+    'market_cap',
+    'volume_24h',
+    'volume_change_24h',
+    'percent_change_1h',
+    'percent_change_24h',
+    'percent_change_7d',
+    'percent_change_30d',
+    'percent_change_60d',
+    'percent_change_90d',
+    'market_cap_dominance',
+    'circulating_supply',
+    'total_supply',
+    'max_supply',
+)
+
+
+def _watch_for_data(events, data_seen):
+    """
+    Pass ijson parse events through, noting whether a "data" list appears.
+    
+    Args:
+        events: Iterator of (prefix, event, value) from ijson.parse()
+        data_seen (list): Gets True appended when the "data" list starts
+    
+    Yields:
+        The same (prefix, event, value) tuples
+    """
+    for prefix, event, value in events:
+        if prefix == 'data' and event == 'start_array':
+            data_seen.append(True)
+        yield prefix, event, value
+
+
+def _round_2dp(values):
+    """
+    Round a list (or list of rows) of numbers to 2 decimals in one call.
+    
+    Replaces one Python round() per field with a single np.round.
+    NaN values (e.g. null fields from the API) are returned as None in
+    both shapes - a bare NaN would make the JSON response invalid.
+    """
+    
+    rounded = np.round(np.array(values, dtype=np.float64), 2).tolist()
+    
+    if rounded and isinstance(rounded[0], list):
+        return [[None if value != value else value for value in row] for row in rounded]
+    return [None if value != value else value for value in rounded]
+
+
+def _build_coin_records(rows):
+    """
+    Convert extracted coin tuples into JSON-ready coin dicts.
+    
+    Args:
+        rows (list): Tuples in _COIN_DTYPE column order
+    
+    Returns:
+        list: One dict per coin, numbers rounded to 2 decimals
+    """
+    
+    table = np.array(rows, dtype=_COIN_DTYPE)
+    
+    # Round every numeric column at once (2 decimal places)
+    for field in _COIN_FLOAT_FIELDS:
+        table[field] = np.round(table[field], 2)
+    
+    names = _COIN_DTYPE.names
+    coins = [dict(zip(names, row)) for row in table.tolist()]
+    
+    # Coins without a max supply go back to None for the JSON response
+    for i in np.flatnonzero(np.isnan(table['max_supply'])):
+        coins[i]['max_supply'] = None
+    
+    return coins
 
 
 # ============================================
 # DEMO DATA (for when API key not configured)
 # ============================================
 
+# Demo tables are built once at import and shared by every demo-mode call.
+# The inner dicts are ordinary dicts, so callers only ever get copies of
+# them - a caller changing its result must not change the demo data.
+_DEMO_COINS = (
+    {'rank': 1, 'name': 'Bitcoin', 'symbol': 'BTC', 'price': 98500.00, 'market_cap': 1950000000000, 'volume_24h': 45000000000, 'percent_change_1h': 0.5, 'percent_change_24h': 2.3, 'percent_change_7d': -1.2},
+    {'rank': 2, 'name': 'Ethereum', 'symbol': 'ETH', 'price': 3800.00, 'market_cap': 450000000000, 'volume_24h': 20000000000, 'percent_change_1h': 0.3, 'percent_change_24h': 1.8, 'percent_change_7d': 3.5},
+    {'rank': 3, 'name': 'Binance Coin', 'symbol': 'BNB', 'price': 650.00, 'market_cap': 95000000000, 'volume_24h': 2000000000, 'percent_change_1h': -0.2, 'percent_change_24h': 0.9, 'percent_change_7d': 5.2},
+    {'rank': 4, 'name': 'Solana', 'symbol': 'SOL', 'price': 230.00, 'market_cap': 75000000000, 'volume_24h': 3500000000, 'percent_change_1h': 1.2, 'percent_change_24h': 5.6, 'percent_change_7d': 12.3},
+    {'rank': 5, 'name': 'XRP', 'symbol': 'XRP', 'price': 0.62, 'market_cap': 35000000000, 'volume_24h': 1500000000, 'percent_change_1h': 0.1, 'percent_change_24h': -0.5, 'percent_change_7d': 2.1},
+)
+
+_DEMO_PRICES = MappingProxyType({
+    'BTC': {'price': 98500.00, 'percent_change_24h': 2.3, 'percent_change_1h': 0.5},
+    'ETH': {'price': 3800.00, 'percent_change_24h': 1.8, 'percent_change_1h': 0.3},
+    'BNB': {'price': 650.00, 'percent_change_24h': 0.9, 'percent_change_1h': -0.2},
+    'SOL': {'price': 230.00, 'percent_change_24h': 5.6, 'percent_change_1h': 1.2},
+    'XRP': {'price': 0.62, 'percent_change_24h': -0.5, 'percent_change_1h': 0.1},
+})
+
+# Demo price returned for symbols not in _DEMO_PRICES
+_DEMO_PRICE_UNKNOWN = {'price': 0, 'percent_change_24h': 0, 'percent_change_1h': 0}
+
+_DEMO_DETAILS = MappingProxyType({
+    'BTC': {
+        'name': 'Bitcoin',
+        'symbol': 'BTC',
+        'price': 98500.00,
+        'market_cap': 1950000000000,
+        'market_cap_rank': 1,
+        'volume_24h': 45000000000,
+        'percent_change_1h': 0.5,
+        'percent_change_24h': 2.3,
+        'percent_change_7d': -1.2,
+        'percent_change_30d': 8.5,
+        'circulating_supply': 19000000,
+        'total_supply': 19000000,
+        'max_supply': 21000000,
+        'ath': 102000.00,
+        'ath_date': '2024-12-15',
+        'atl': 65.00,
+        'atl_date': '2013-07-05',
+        'description': 'Bitcoin is a decentralized digital currency without a central bank or administrator. It can be sent from user to user on the peer-to-peer bitcoin network.',
+        'category': 'currency',
+        'tags': ('mineable', 'pow', 'sha-256')
+    },
+    'ETH': {
+        'name': 'Ethereum',
+        'symbol': 'ETH',
+        'price': 3800.00,
+        'market_cap': 450000000000,
+        'market_cap_rank': 2,
+        'volume_24h': 20000000000,
+        'percent_change_1h': 0.3,
+        'percent_change_24h': 1.8,
+        'percent_change_7d': 3.5,
+        'percent_change_30d': 12.3,
+        'circulating_supply': 120000000,
+        'total_supply': 120000000,
+        'max_supply': None,
+        'ath': 4800.00,
+        'ath_date': '2021-11-10',
+        'atl': 0.43,
+        'atl_date': '2015-10-20',
+        'description': 'Ethereum is a decentralized platform for applications that run exactly as programmed without any possibility of fraud or third party interference.',
+        'category': 'smart-contract-platform',
+        'tags': ('smart-contracts', 'ethereum-ecosystem', 'pos')
+    }
+})
+
+
 def _get_demo_coins_data(limit=100):
     """
     Returns demo/placeholder data when API key is not configured.
@@ -476,16 +789,8 @@ def _get_demo_coins_data(limit=100):
     Note: This is static demo data, not real market data!
     """
     
-    demo_coins = [
-        {'rank': 1, 'name': 'Bitcoin', 'symbol': 'BTC', 'price': 98500.00, 'market_cap': 1950000000000, 'volume_24h': 45000000000, 'percent_change_1h': 0.5, 'percent_change_24h': 2.3, 'percent_change_7d': -1.2},
-        {'rank': 2, 'name': 'Ethereum', 'symbol': 'ETH', 'price': 3800.00, 'market_cap': 450000000000, 'volume_24h': 20000000000, 'percent_change_1h': 0.3, 'percent_change_24h': 1.8, 'percent_change_7d': 3.5},
-        {'rank': 3, 'name': 'Binance Coin', 'symbol': 'BNB', 'price': 650.00, 'market_cap': 95000000000, 'volume_24h': 2000000000, 'percent_change_1h': -0.2, 'percent_change_24h': 0.9, 'percent_change_7d': 5.2},
-        {'rank': 4, 'name': 'Solana', 'symbol': 'SOL', 'price': 230.00, 'market_cap': 75000000000, 'volume_24h': 3500000000, 'percent_change_1h': 1.2, 'percent_change_24h': 5.6, 'percent_change_7d': 12.3},
-        {'rank': 5, 'name': 'XRP', 'symbol': 'XRP', 'price': 0.62, 'market_cap': 35000000000, 'volume_24h': 1500000000, 'percent_change_1h': 0.1, 'percent_change_24h': -0.5, 'percent_change_7d': 2.1},
-    ]
-    
-    # Return only up to 'limit' coins
-    return demo_coins[:min(limit, len(demo_coins))]
+    # Return only up to 'limit' coins (copies - see DEMO DATA above)
+    return [dict(coin) for coin in _DEMO_COINS[:limit]]
 
 
 # ============================================
@@ -518,19 +823,13 @@ def get_live_prices(symbols, convert='USD'):
     if isinstance(symbols, str):
         symbols = [symbols]
     
+    # Drop duplicate symbols once up front (keeps the caller's order)
+    wanted = dict.fromkeys(symbols)
+    
     # Check API key
-    if not CMC_API_KEY or CMC_API_KEY == 'YOUR_API_KEY_HERE':
+    if _DEMO_MODE:
         # Return demo data
-        demo_prices = {
-            'BTC': {'price': 98500.00, 'percent_change_24h': 2.3, 'percent_change_1h': 0.5},
-            'ETH': {'price': 3800.00, 'percent_change_24h': 1.8, 'percent_change_1h': 0.3},
-            'BNB': {'price': 650.00, 'percent_change_24h': 0.9, 'percent_change_1h': -0.2},
-            'SOL': {'price': 230.00, 'percent_change_24h': 5.6, 'percent_change_1h': 1.2},
-            'XRP': {'price': 0.62, 'percent_change_24h': -0.5, 'percent_change_1h': 0.1},
-        }
-        
-        result_prices = {sym: demo_prices.get(sym, {'price': 0, 'percent_change_24h': 0, 'percent_change_1h': 0}) 
-                        for sym in symbols}
+        result_prices = {sym: dict(_DEMO_PRICES.get(sym, _DEMO_PRICE_UNKNOWN)) for sym in wanted}
         
         return {
             'success': True,
@@ -542,17 +841,12 @@ def get_live_prices(symbols, convert='USD'):
     try:
         url = f"{CMC_BASE_URL}/cryptocurrency/quotes/latest"
         
-        headers = {
-            'X-CMC_PRO_API_KEY': CMC_API_KEY,
-            'Accept': 'application/json'
-        }
-        
         params = {
-            'symbol': ','.join(symbols),  # Comma-separated symbols
+            'symbol': ','.join(wanted),  # Comma-separated symbols
             'convert': convert
         }
         
-        response = requests.get(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
+        response = _session.get(url, params=params, timeout=REQUEST_TIMEOUT)
         
         if response.status_code != 200:
             return {'success': False, 'error': f'API returned status {response.status_code}'}
@@ -563,19 +857,21 @@ def get_live_prices(symbols, convert='USD'):
             return {'success': False, 'error': 'Invalid API response'}
         
         # Extract prices
+        # Only the symbols the API actually returned, in the caller's order
+        coins_by_symbol = data['data']
+        found = [symbol for symbol in wanted if symbol in coins_by_symbol]
+        quotes = [coins_by_symbol[symbol]['quote'][convert] for symbol in found]
+        
+        # Round all numbers for all symbols in one vectorized call
+        numbers = _round_2dp([
+            [quote['price']] + [quote.get(field, 0) for field in _LIVE_PRICE_FIELDS[1:]]
+            for quote in quotes
+        ])
+        
         prices = {}
-        for symbol in symbols:
-            if symbol in data['data']:
-                quote = data['data'][symbol]['quote'][convert]
-                prices[symbol] = {
-                    'price': round(quote['price'], 2),
-                    'percent_change_1h': round(quote.get('percent_change_1h', 0), 2),
-                    'percent_change_24h': round(quote.get('percent_change_24h', 0), 2),
-                    'percent_change_7d': round(quote.get('percent_change_7d', 0), 2),
-                    'volume_24h': round(quote.get('volume_24h', 0), 2),
-                    'market_cap': round(quote.get('market_cap', 0), 2),
-                    'last_updated': quote.get('last_updated', '')
-                }
+        for symbol, quote, values in zip(found, quotes, numbers):
+            prices[symbol] = dict(zip(_LIVE_PRICE_FIELDS, values))
+            prices[symbol]['last_updated'] = quote.get('last_updated', '')
         
         return {
             'success': True,
@@ -615,61 +911,14 @@ def get_token_details(symbol, convert='USD'):
     """
     
     # Check API key
-    if not CMC_API_KEY or CMC_API_KEY == 'YOUR_API_KEY_HERE':
+    if _DEMO_MODE:
         # Return demo data
-        demo_details = {
-            'BTC': {
-                'name': 'Bitcoin',
-                'symbol': 'BTC',
-                'price': 98500.00,
-                'market_cap': 1950000000000,
-                'market_cap_rank': 1,
-                'volume_24h': 45000000000,
-                'percent_change_1h': 0.5,
-                'percent_change_24h': 2.3,
-                'percent_change_7d': -1.2,
-                'percent_change_30d': 8.5,
-                'circulating_supply': 19000000,
-                'total_supply': 19000000,
-                'max_supply': 21000000,
-                'ath': 102000.00,
-                'ath_date': '2024-12-15',
-                'atl': 65.00,
-                'atl_date': '2013-07-05',
-                'description': 'Bitcoin is a decentralized digital currency without a central bank or administrator. It can be sent from user to user on the peer-to-peer bitcoin network.',
-                'category': 'currency',
-                'tags': ['mineable', 'pow', 'sha-256']
-            },
-            'ETH': {
-                'name': 'Ethereum',
-                'symbol': 'ETH',
-                'price': 3800.00,
-                'market_cap': 450000000000,
-                'market_cap_rank': 2,
-                'volume_24h': 20000000000,
-                'percent_change_1h': 0.3,
-                'percent_change_24h': 1.8,
-                'percent_change_7d': 3.5,
-                'percent_change_30d': 12.3,
-                'circulating_supply': 120000000,
-                'total_supply': 120000000,
-                'max_supply': None,
-                'ath': 4800.00,
-                'ath_date': '2021-11-10',
-                'atl': 0.43,
-                'atl_date': '2015-10-20',
-                'description': 'Ethereum is a decentralized platform for applications that run exactly as programmed without any possibility of fraud or third party interference.',
-                'category': 'smart-contract-platform',
-                'tags': ['smart-contracts', 'ethereum-ecosystem', 'pos']
-            }
-        }
-        
-        details = demo_details.get(symbol, {
+        details = dict(_DEMO_DETAILS.get(symbol, {
             'name': symbol,
             'symbol': symbol,
             'price': 0,
             'description': 'Demo mode - API key not configured'
-        })
+        }))
         
         return {
             'success': True,
@@ -681,18 +930,13 @@ def get_token_details(symbol, convert='USD'):
         # First, get quote data
         url = f"{CMC_BASE_URL}/cryptocurrency/quotes/latest"
         
-        headers = {
-            'X-CMC_PRO_API_KEY': CMC_API_KEY,
-            'Accept': 'application/json'
-        }
-        
         params = {
             'symbol': symbol,
             'convert': convert,
             'aux': 'urls,logo,description,tags,platform,date_added,notice'
         }
         
-        response = requests.get(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
+        response = _session.get(url, params=params, timeout=REQUEST_TIMEOUT)
         
         if response.status_code != 200:
             return {'success': False, 'error': f'API returned status {response.status_code}'}
@@ -705,6 +949,16 @@ def get_token_details(symbol, convert='USD'):
         coin = data['data'][symbol]
         quote = coin['quote'][convert]
         
+        # Round all numeric fields in one vectorized call
+        # (NaN marks a missing total/max supply and comes back as None)
+        numbers = dict(zip(_DETAIL_FLOAT_FIELDS, _round_2dp(
+            [quote.get(field, 0) for field in _DETAIL_FLOAT_FIELDS[:11]] + [
+                coin.get('circulating_supply', 0),
+                coin.get('total_supply') or np.nan,
+                coin.get('max_supply') or np.nan
+            ]
+        )))
+        
         # Build detailed response
         details = {
             'name': coin.get('name', symbol),
@@ -716,27 +970,27 @@ def get_token_details(symbol, convert='USD'):
             'tags': coin.get('tags', []),
             
             # Price data
-            'price': round(quote.get('price', 0), 2),
-            'market_cap': round(quote.get('market_cap', 0), 2),
+            'price': numbers['price'],
+            'market_cap': numbers['market_cap'],
             'market_cap_rank': coin.get('cmc_rank', 0),
-            'volume_24h': round(quote.get('volume_24h', 0), 2),
-            'volume_change_24h': round(quote.get('volume_change_24h', 0), 2),
+            'volume_24h': numbers['volume_24h'],
+            'volume_change_24h': numbers['volume_change_24h'],
             
             # Price changes
-            'percent_change_1h': round(quote.get('percent_change_1h', 0), 2),
-            'percent_change_24h': round(quote.get('percent_change_24h', 0), 2),
-            'percent_change_7d': round(quote.get('percent_change_7d', 0), 2),
-            'percent_change_30d': round(quote.get('percent_change_30d', 0), 2),
-            'percent_change_60d': round(quote.get('percent_change_60d', 0), 2),
-            'percent_change_90d': round(quote.get('percent_change_90d', 0), 2),
+            'percent_change_1h': numbers['percent_change_1h'],
+            'percent_change_24h': numbers['percent_change_24h'],
+            'percent_change_7d': numbers['percent_change_7d'],
+            'percent_change_30d': numbers['percent_change_30d'],
+            'percent_change_60d': numbers['percent_change_60d'],
+            'percent_change_90d': numbers['percent_change_90d'],
             
             # Supply data
-            'circulating_supply': round(coin.get('circulating_supply', 0), 2),
-            'total_supply': round(coin.get('total_supply', 0), 2) if coin.get('total_supply') else None,
-            'max_supply': round(coin.get('max_supply', 0), 2) if coin.get('max_supply') else None,
+            'circulating_supply': numbers['circulating_supply'],
+            'total_supply': numbers['total_supply'],
+            'max_supply': numbers['max_supply'],
             
             # Market dominance
-            'market_cap_dominance': round(quote.get('market_cap_dominance', 0), 2),
+            'market_cap_dominance': numbers['market_cap_dominance'],
             
             # URLs
             'website': coin.get('urls', {}).get('website', []),
@@ -756,9 +1010,7 @@ def get_token_details(symbol, convert='USD'):
         }
         
     except Exception as e:
-        print(f"Error fetching token details for {symbol}: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("CMC token_details call failed for %s", symbol)
         return {'success': False, 'error': str(e)}
 
 
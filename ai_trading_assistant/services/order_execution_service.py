@@ -35,8 +35,732 @@ import config
 from models import db
 from models import exchange_account_model
 from services import exchange_client
+from services import grid_bot_service
+from services import prediction_service
+from services import price_service
+from services import symbols
+from utils import log_setup
+import os
 import json
-from datetime import datetime
+import time
+import base64
+import struct
+import asyncio
+import hashlib
+import logging
+import queue
+import atexit
+import sqlite3
+import itertools
+import threading
+import ccxt
+import numpy as np
+from collections import OrderedDict, deque
+
+
+# Trading mode is read from config once at import; callers can still
+# override it per order with is_live_mode=True/False
+_IS_LIVE_MODE = config.LIVE_TRADING_ENABLED
+_MODE = "LIVE" if _IS_LIVE_MODE else "SIMULATED"
+
+# Simulated order IDs: SIM_<process start time>_<counter>
+# (unique even when many orders are simulated in the same second)
+_SIM_EPOCH = int(time.time())
+_sim_counter = itertools.count()
+
+# Errors an order can fail with: exchange/network errors from CCXT
+# (ccxt.BaseError covers NetworkError and ExchangeError) and database
+# errors while reading the account. Anything else is a bug and is raised -
+# except after the exchange accepted the order: then the order is logged
+# as UNKNOWN instead (see _record_live_order()), so it isn't resent.
+_ORDER_ERRORS = (ccxt.BaseError, sqlite3.Error)
+
+
+# ============================================
+# LOGGING
+# ============================================
+# Order logs propagate to the app's logging like every other module.
+# configure_logging() (called by app.py at startup) also writes them to
+# logs/order_execution.log through a queue (see utils/log_setup.py), so
+# logging doesn't slow down order execution.
+
+logger = logging.getLogger(__name__)
+
+
+def configure_logging(log_dir=None):
+    """
+    Also write this module's log messages to order_execution.log.
+    
+    Safe to call more than once.
+    
+    Args:
+        log_dir (str): Directory for the log file (default: config.LOG_DIR)
+    """
+    log_setup.add_log_file(logger, 'order_execution.log', log_dir)
+
+
+# ============================================
+# TRADE LOG WRITER (background batching)
+# ============================================
+# Inserting one log row per order means one commit (fsync) per order,
+# which dominates grid-bot loops. Instead, log_trade_execution() puts the
+# row on a queue and a background thread writes queued rows in batches.
+
+TRADE_LOG_INSERT_SQL = """
+    INSERT INTO exchange_trade_logs 
+    (id, user_id, exchange_account_id, symbol, side, amount, price, total_value,
+     status, exchange_order_id, raw_response, trade_source, fee, fee_currency, error_message)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Flush when this many rows are queued, or after this many seconds
+TRADE_LOG_BATCH_SIZE = 100
+TRADE_LOG_FLUSH_INTERVAL = 0.05
+
+# Log IDs are handed out before the row is written, from blocks of this
+# many IDs reserved in the database (see _reserve_log_ids())
+TRADE_LOG_ID_BLOCK = 100
+
+_log_queue = queue.Queue()
+_log_writer_lock = threading.Lock()
+_log_writer_thread = None
+_log_ids = iter(())
+
+
+def _reserve_log_ids(count):
+    """
+    Reserve `count` trade log IDs in the database, atomically.
+    
+    exchange_trade_logs is an AUTOINCREMENT table: SQLite never hands out
+    an ID at or below its sqlite_sequence entry. Moving that entry up by
+    `count` (in one IMMEDIATE transaction) reserves the IDs in between
+    for this process only - other processes reserve the next block, and
+    plain INSERTs get IDs above it.
+    
+    Returns:
+        range: The reserved IDs, or None if they couldn't be reserved
+    """
+    connection = db.get_connection()
+    if connection is None:
+        return None
+    
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+        
+        table = connection.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'exchange_trade_logs'"
+        ).fetchone()
+        if table is None or 'AUTOINCREMENT' not in table['sql'].upper():
+            # Without AUTOINCREMENT, SQLite could give a reserved ID to
+            # another writer - let SQLite assign every ID instead
+            connection.rollback()
+            return None
+        
+        last_id = connection.execute("""
+            SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'exchange_trade_logs'), 0),
+                       COALESCE((SELECT MAX(id) FROM exchange_trade_logs), 0)) AS last_id
+        """).fetchone()['last_id']
+        
+        updated = connection.execute(
+            "UPDATE sqlite_sequence SET seq = ? WHERE name = 'exchange_trade_logs'",
+            (last_id + count,)
+        ).rowcount
+        if not updated:
+            # No row yet (nothing inserted into the table so far)
+            connection.execute(
+                "INSERT INTO sqlite_sequence (name, seq) VALUES ('exchange_trade_logs', ?)",
+                (last_id + count,)
+            )
+        
+        connection.commit()
+        return range(last_id + 1, last_id + count + 1)
+        
+    except sqlite3.Error as e:
+        logger.error("could not reserve trade log IDs: %s", e)
+        connection.rollback()
+        return None
+        
+    finally:
+        connection.close()
+
+
+def _next_log_id():
+    """
+    Allocate the ID for a new trade log row without waiting for the insert.
+    
+    IDs come from blocks reserved in the database, so they never collide
+    with rows written by other processes. Returns None if no block could
+    be reserved (the row then gets an ID from SQLite when it is written).
+    """
+    global _log_ids
+    
+    with _log_writer_lock:
+        log_id = next(_log_ids, None)
+        if log_id is None:
+            reserved = _reserve_log_ids(TRADE_LOG_ID_BLOCK)
+            if reserved is None:
+                return None
+            _log_ids = iter(reserved)
+            log_id = next(_log_ids)
+        
+        return log_id
+
+
+def _start_log_writer():
+    """Start the background writer thread on first use."""
+    global _log_writer_thread
+    
+    with _log_writer_lock:
+        if _log_writer_thread is None:
+            _log_writer_thread = threading.Thread(
+                target=_trade_log_writer,
+                name='trade-log-writer',
+                daemon=True
+            )
+            _log_writer_thread.start()
+
+
+def _trade_log_writer():
+    """Writer thread: collect queued rows and insert them in batches."""
+    while True:
+        batch = [_log_queue.get()]
+        deadline = time.monotonic() + TRADE_LOG_FLUSH_INTERVAL
+        
+        # Keep collecting until the batch is full or the interval is over
+        while len(batch) < TRADE_LOG_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_log_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
+        try:
+            _write_trade_log_batch(batch)
+        finally:
+            for _ in batch:
+                _log_queue.task_done()
+
+
+def _insert_trade_log_rows(connection, rows):
+    """
+    Insert trade log rows with one executemany, inside the caller's
+    transaction (the caller has run BEGIN and commits).
+    
+    If one row fails (e.g. a CHECK constraint), the others are still
+    written one by one and the failing row is logged. A row is never
+    given a different ID than the one already returned to the caller.
+    """
+    connection.execute("SAVEPOINT trade_log_rows")
+    try:
+        connection.executemany(TRADE_LOG_INSERT_SQL, rows)
+    except sqlite3.IntegrityError:
+        # One bad row fails the whole executemany - redo row by row
+        connection.execute("ROLLBACK TO trade_log_rows")
+        for row in rows:
+            try:
+                connection.execute(TRADE_LOG_INSERT_SQL, row)
+            except sqlite3.IntegrityError as e:
+                logger.error("trade log row id=%s not written: %s", row[0], e)
+    connection.execute("RELEASE trade_log_rows")
+
+
+def _write_trade_log_batch(batch):
+    """Insert a batch of trade log rows with one executemany and one commit."""
+    # The writer thread keeps one connection open (WAL mode) for all batches
+    connection = db.get_logging_conn()
+    
+    if connection is None:
+        logger.error("trade log writer: %d log rows dropped (no database connection)", len(batch))
+        return
+    
+    try:
+        if not connection.in_transaction:
+            connection.execute("BEGIN")
+        _insert_trade_log_rows(connection, batch)
+        connection.commit()
+    except sqlite3.Error as e:
+        logger.error("trade log write error: %s", e)
+        connection.rollback()
+
+
+# ============================================
+# TWO-LEVEL TRADE LOGGING (config.TWO_LEVEL_LOGGING)
+# ============================================
+# Level 1: every trade log row is appended to logs/trades-YYYY-MM-DD.binlog
+#          (sequential file write - no database work at all).
+# Level 2: a background thread copies new records from the file into
+#          exchange_trade_logs every few seconds with one executemany.
+#
+# Record format: 4-byte little-endian length + JSON array of the row.
+# The ingested position of each file is saved in the trade_binlog_offsets
+# table, in the same transaction as the rows it covers - so after a crash
+# rows are neither lost nor inserted twice.
+
+TRADE_BINLOG_DIR = 'logs'
+TRADE_BINLOG_INGEST_INTERVAL = 2.0   # seconds
+TRADE_BINLOG_BUFFER_SIZE = 1 << 20   # 1 MB write buffer
+
+_RECORD_HEADER = struct.Struct('<I')
+_RAW_RESPONSE_INDEX = 10  # position of raw_response in a log row
+
+_binlog_lock = threading.Lock()     # guards the open file
+_ingest_lock = threading.Lock()     # one ingest at a time
+_binlog_file = None
+_binlog_path = None
+_binlog_ingest_thread = None
+_binlog_offsets_table_ready = False
+
+TRADE_BINLOG_OFFSETS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS trade_binlog_offsets (
+        file TEXT PRIMARY KEY,
+        ingested_bytes INTEGER NOT NULL
+    )
+"""
+
+
+def _append_to_binlog(row):
+    """Append one trade log row to today's binlog file."""
+    global _binlog_file, _binlog_path
+    
+    row = list(row)
+    # raw_response is compressed bytes - store it as base64 text in JSON
+    if row[_RAW_RESPONSE_INDEX] is not None:
+        row[_RAW_RESPONSE_INDEX] = base64.b64encode(row[_RAW_RESPONSE_INDEX]).decode('ascii')
+    payload = json.dumps(row).encode('utf-8')
+    
+    path = os.path.join(TRADE_BINLOG_DIR, f"trades-{time.strftime('%Y-%m-%d')}.binlog")
+    
+    with _binlog_lock:
+        if path != _binlog_path:
+            if _binlog_file is not None:
+                _binlog_file.close()
+            os.makedirs(TRADE_BINLOG_DIR, exist_ok=True)
+            _binlog_file = open(path, 'ab', buffering=TRADE_BINLOG_BUFFER_SIZE)
+            _binlog_path = path
+        
+        _binlog_file.write(_RECORD_HEADER.pack(len(payload)) + payload)
+
+
+def _start_binlog_ingester():
+    """Start the background ingest thread on first use."""
+    global _binlog_ingest_thread
+    
+    with _log_writer_lock:
+        if _binlog_ingest_thread is None:
+            _binlog_ingest_thread = threading.Thread(
+                target=_binlog_ingester,
+                name='trade-binlog-ingester',
+                daemon=True
+            )
+            _binlog_ingest_thread.start()
+
+
+def _binlog_ingester():
+    """Ingest thread: copy new binlog records into the database periodically."""
+    while True:
+        time.sleep(TRADE_BINLOG_INGEST_INTERVAL)
+        try:
+            _ingest_binlogs()
+        except Exception as e:
+            logger.error("trade binlog ingest error: %s", e)
+
+
+def _ingest_binlogs():
+    """Insert every not-yet-ingested binlog record into exchange_trade_logs."""
+    with _ingest_lock:
+        # Make buffered records visible in the file
+        with _binlog_lock:
+            if _binlog_file is not None:
+                _binlog_file.flush()
+        
+        if not os.path.isdir(TRADE_BINLOG_DIR):
+            return
+        
+        for name in sorted(os.listdir(TRADE_BINLOG_DIR)):
+            if name.startswith('trades-') and name.endswith('.binlog'):
+                _ingest_binlog_file(os.path.join(TRADE_BINLOG_DIR, name))
+
+
+def _get_binlog_offset(connection, path):
+    """Return how many bytes of a binlog file are already in the database."""
+    global _binlog_offsets_table_ready
+    
+    if not _binlog_offsets_table_ready:
+        connection.execute(TRADE_BINLOG_OFFSETS_TABLE_SQL)
+        connection.commit()
+        _binlog_offsets_table_ready = True
+    
+    row = connection.execute(
+        "SELECT ingested_bytes FROM trade_binlog_offsets WHERE file = ?",
+        (os.path.basename(path),)
+    ).fetchone()
+    if row is not None:
+        return row['ingested_bytes']
+    
+    # Older versions kept the position in "<file>.offset"
+    offset_path = path + '.offset'
+    if os.path.exists(offset_path):
+        with open(offset_path) as f:
+            return int(f.read().strip() or 0)
+    
+    return 0
+
+
+def _ingest_binlog_file(path):
+    """Insert the records of one binlog file added since the last ingest."""
+    # The ingest thread keeps one connection open, like the log writer
+    connection = db.get_logging_conn()
+    
+    if connection is None:
+        logger.error("trade binlog ingest: no database connection, %s skipped for now", path)
+        return
+    
+    offset = _get_binlog_offset(connection, path)
+    
+    if os.path.getsize(path) <= offset:
+        return
+    
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+    
+    rows = []
+    position = 0
+    
+    # Stop at an incomplete record - it is picked up on the next run
+    while position + _RECORD_HEADER.size <= len(data):
+        (length,) = _RECORD_HEADER.unpack_from(data, position)
+        end = position + _RECORD_HEADER.size + length
+        if end > len(data):
+            break
+        
+        row = json.loads(data[position + _RECORD_HEADER.size:end])
+        if row[_RAW_RESPONSE_INDEX] is not None:
+            row[_RAW_RESPONSE_INDEX] = base64.b64decode(row[_RAW_RESPONSE_INDEX])
+        rows.append(tuple(row))
+        position = end
+    
+    if not rows:
+        return
+    
+    # Rows and the new position in ONE transaction: either both are
+    # saved or neither is (and the records are ingested again next time)
+    try:
+        if not connection.in_transaction:
+            connection.execute("BEGIN")
+        _insert_trade_log_rows(connection, rows)
+        connection.execute(
+            "INSERT OR REPLACE INTO trade_binlog_offsets (file, ingested_bytes) VALUES (?, ?)",
+            (os.path.basename(path), offset + position)
+        )
+        connection.commit()
+    except sqlite3.Error as e:
+        logger.error("trade binlog ingest error (%s): %s", path, e)
+        connection.rollback()
+        return
+    
+    # The table has the position now - the old-style file is not needed
+    if os.path.exists(path + '.offset'):
+        os.remove(path + '.offset')
+
+
+def flush_trade_logs():
+    """
+    Block until every queued trade log row has been written.
+    
+    Call this before reading exchange_trade_logs if the rows logged just
+    now must be visible. Also runs automatically at interpreter exit.
+    """
+    if _log_writer_thread is not None:
+        _log_queue.join()
+    
+    if _binlog_ingest_thread is not None:
+        _ingest_binlogs()
+
+
+atexit.register(flush_trade_logs)
+
+
+# ============================================
+# EXCHANGE ACCOUNT / CLIENT CACHE
+# ============================================
+# Loading the account row and building a CCXT client (plus load_markets)
+# on every order costs a DB query and hundreds of ms of network time.
+# Both are cached per (user_id, exchange_account_id) for a few minutes.
+# ccxt sync clients aren't thread-safe, so each thread gets its own client
+# for an account (e.g. the parallel rebalancing trades); they share the
+# market list, which is only loaded once.
+
+CLIENT_CACHE_TTL = 300        # seconds
+CLIENT_CACHE_MAX_SIZE = 128   # least recently used entries are evicted first
+CLIENTS_PER_ACCOUNT_MAX = 16  # per-thread clients kept per account (oldest dropped)
+
+# (user_id, account_id) -> [account, {thread id: client}, loaded_at,
+#                          source client of the markets, per-account lock]
+_client_cache = OrderedDict()
+_client_cache_lock = threading.RLock()
+
+
+def _create_account_client(account, markets_client):
+    """
+    Create a sync CCXT client for an exchange account, with markets loaded.
+    
+    Args:
+        account (dict): Exchange account row (with API credentials)
+        markets_client: Client of the same account whose markets are
+                        already loaded (None: load them from the exchange)
+    
+    Returns:
+        ccxt client, or None if it couldn't be created
+    """
+    client = exchange_client.create_exchange_client(
+        exchange_name=account['exchange_name'],
+        api_key=account['api_key'],
+        api_secret=account['api_secret'],
+        is_testnet=bool(account['is_testnet'])
+    )
+    
+    if not client:
+        return None
+    
+    try:
+        if markets_client is not None and markets_client.markets:
+            # Same account, same markets: no second download
+            client.set_markets(markets_client.markets, markets_client.currencies)
+        else:
+            # Load markets once now so later orders don't have to
+            client.load_markets()
+            symbols.register_markets(account['exchange_name'], client.markets)
+    except Exception as e:
+        logger.warning("could not preload %s markets: %s", account['exchange_name'], e)
+    
+    return client
+
+
+def _get_cached_entry(key):
+    """Return the (not expired) cache entry for key, or None. Caller holds _client_cache_lock."""
+    entry = _client_cache.get(key)
+    
+    if entry is not None and time.monotonic() - entry[2] > CLIENT_CACHE_TTL:
+        del _client_cache[key]
+        entry = None
+    
+    if entry is not None:
+        _client_cache.move_to_end(key)
+    
+    return entry
+
+
+def _get_cached_account(user_id, exchange_account_id, with_client=False):
+    """
+    Get the exchange account (and optionally its CCXT client) from the cache.
+    
+    The global cache lock is only held for dictionary lookups: the
+    database query, client creation and load_markets() run outside it, so
+    a slow exchange doesn't hold up orders on other accounts. Clients of
+    one account are created one at a time (per-account lock), so its
+    markets are still downloaded only once.
+    
+    Args:
+        user_id (int): User's ID
+        exchange_account_id (int): Exchange account ID
+        with_client (bool): Also return a ready (markets loaded) sync client
+                            for the calling thread - never shared with
+                            other threads
+    
+    Returns:
+        tuple: (account, client) - account is None if not found,
+               client is None unless with_client=True and creation worked
+    """
+    key = (user_id, exchange_account_id)
+    
+    with _client_cache_lock:
+        entry = _get_cached_entry(key)
+    
+    if entry is None:
+        account = exchange_account_model.get_exchange_account_by_id(exchange_account_id, user_id)
+        if not account:
+            return None, None
+        
+        with _client_cache_lock:
+            # Another thread may have loaded it meanwhile - keep theirs
+            entry = _get_cached_entry(key)
+            if entry is None:
+                # [account, {thread id: client}, loaded_at, markets source client, per-account lock]
+                entry = [account, {}, time.monotonic(), None, threading.Lock()]
+                _client_cache[key] = entry
+                
+                while len(_client_cache) > CLIENT_CACHE_MAX_SIZE:
+                    _client_cache.popitem(last=False)
+    
+    account = entry[0]
+    
+    if not with_client:
+        return account, None
+    
+    thread_id = threading.get_ident()
+    client = entry[1].get(thread_id)
+    if client is not None:
+        return account, client
+    
+    # Only this account waits here (e.g. for its first load_markets)
+    with entry[4]:
+        client = _create_account_client(account, entry[3])
+    
+    if client is not None:
+        with _client_cache_lock:
+            entry[1][thread_id] = client
+            # Threads come and go (one per request / pool worker):
+            # forget the clients of the oldest ones
+            while len(entry[1]) > CLIENTS_PER_ACCOUNT_MAX:
+                del entry[1][next(iter(entry[1]))]
+            if entry[3] is None and client.markets:
+                entry[3] = client
+    
+    return account, client
+
+
+def invalidate_cached_account(user_id, exchange_account_id):
+    """
+    Drop a cached account/client so the next order reloads it.
+    
+    Called by exchange_account_model when an account is changed or removed.
+    """
+    with _client_cache_lock:
+        _client_cache.pop((user_id, exchange_account_id), None)
+
+
+# ============================================
+# RATE LIMITING (per exchange API key)
+# ============================================
+# Several grid bots can place orders on the same exchange account at
+# the same time (each run has its own event loop/thread). The limiter
+# is shared by all of them, so together they stay within the exchange's
+# per-key request budget instead of getting 429 errors or a ban.
+
+class KeyedLimiter:
+    """
+    Allow at most `limit` calls per `period` seconds for each key.
+    
+    Thread-safe, and waits with asyncio.sleep() so other orders in the
+    same event loop keep running while one waits for its turn.
+    
+    Example:
+        limiter = KeyedLimiter(period=1.0)
+        await limiter.acquire(('binance', key_hash), limit=10)
+        order = await client.create_market_order(...)
+    """
+    
+    def __init__(self, period=1.0):
+        self.period = period
+        self._calls = {}  # key -> deque of call times (time.monotonic())
+        self._lock = threading.Lock()
+    
+    async def acquire(self, key, limit):
+        """Wait until another call for `key` is allowed, then record it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                calls = self._calls.setdefault(key, deque())
+                
+                # Forget calls that are out of the time window
+                while calls and now - calls[0] >= self.period:
+                    calls.popleft()
+                
+                if len(calls) < limit:
+                    calls.append(now)
+                    return
+                
+                wait = self.period - (now - calls[0])
+            
+            await asyncio.sleep(wait)
+
+
+_order_limiter = KeyedLimiter(period=1.0)
+
+
+def _rate_limit_key(account):
+    """
+    Limiter key for an account: (exchange name, hash of the API key).
+    
+    Accounts sharing an API key share the budget. The key is computed
+    once and stored on the (cached) account dict.
+    """
+    key = account.get('_rate_limit_key')
+    if key is None:
+        api_key_hash = hashlib.sha256((account['api_key'] or '').encode('utf-8')).hexdigest()[:16]
+        key = (account['exchange_name'].lower(), api_key_hash)
+        account['_rate_limit_key'] = key
+    return key
+
+
+async def _wait_for_rate_limit(account):
+    """Wait for this account's exchange/API-key request budget."""
+    key = _rate_limit_key(account)
+    limit = config.ORDER_RATE_LIMITS.get(key[0], config.DEFAULT_ORDER_RATE_LIMIT)
+    await _order_limiter.acquire(key, limit)
+
+
+# ============================================
+# LATEST PRICE CACHE
+# ============================================
+# Simulated orders (and grid bots sharing a symbol) look up the same
+# latest price many times per second. Keep it for a short moment instead
+# of querying price_history for every order. New prices are also pushed
+# in by price_service.add_price_record() via update_cached_price().
+
+PRICE_CACHE_TTL = 1.0        # seconds
+PRICE_CACHE_MAX_SIZE = 256
+
+_price_cache = OrderedDict()  # symbol -> (close_price, fetched_at)
+_price_cache_lock = threading.RLock()
+
+
+def _cached_price(symbol, max_age=PRICE_CACHE_TTL):
+    """
+    Get the latest close price for a symbol from the cache.
+    
+    Args:
+        symbol (str): Database symbol (e.g., "BTCUSDT")
+        max_age (float): Re-read from the database if the cached price
+                         is older than this many seconds
+    
+    Returns:
+        float: Latest close price, or None if there is no price data
+    """
+    with _price_cache_lock:
+        entry = _price_cache.get(symbol)
+        if entry is not None and time.monotonic() - entry[1] <= max_age:
+            return entry[0]
+    
+    # Many threads can miss at once (parallel orders) - the fast lookup
+    # lets them share one database query
+    price_data = price_service.get_latest_price_fast(symbol)
+    price = price_data['close_price'] if price_data else None
+    
+    update_cached_price(symbol, price)
+    return price
+
+
+def update_cached_price(symbol, price):
+    """
+    Put a fresh price into the cache.
+    
+    Called when a new price is stored (price_service.add_price_record)
+    or already read elsewhere (grid bot snapshot).
+    
+    Args:
+        symbol (str): Database symbol (e.g., "BTCUSDT")
+        price (float): Latest close price
+    """
+    with _price_cache_lock:
+        _price_cache[symbol] = (price, time.monotonic())
+        _price_cache.move_to_end(symbol)
+        
+        while len(_price_cache) > PRICE_CACHE_MAX_SIZE:
+            _price_cache.popitem(last=False)
 
 
 def execute_market_order_for_account(user_id, exchange_account_id, symbol, side, amount, 
@@ -105,24 +829,21 @@ def execute_market_order_for_account(user_id, exchange_account_id, symbol, side,
     
     # Determine mode: use parameter if provided, otherwise use config
     if is_live_mode is None:
-        is_live_mode = config.LIVE_TRADING_ENABLED
+        is_live_mode = _IS_LIVE_MODE
     
     mode = "LIVE" if is_live_mode else "SIMULATED"
     
-    print(f"\n{'='*70}")
-    print(f"EXECUTING ORDER ({mode} MODE)")
-    print(f"{'='*70}")
-    print(f"User ID: {user_id}")
-    print(f"Exchange Account ID: {exchange_account_id}")
-    print(f"Symbol: {symbol}")
-    print(f"Side: {side.upper()}")
-    print(f"Amount: {amount}")
-    print(f"Source: {trade_source}")
-    print(f"{'='*70}\n")
+    logger.info(
+        "order_executing mode=%s user=%s account=%s symbol=%s side=%s amount=%s source=%s",
+        mode, user_id, exchange_account_id, symbol, side, amount, trade_source
+    )
+    if mode == "LIVE" and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("LIVE MODE - real order will be sent to exchange (real or testnet money)")
     
     try:
-        # Get exchange account (with API credentials)
-        account = exchange_account_model.get_exchange_account_by_id(exchange_account_id, user_id)
+        # Get exchange account (with API credentials) - cached, and in
+        # LIVE mode also the ready-to-use exchange client
+        account, client = _get_cached_account(user_id, exchange_account_id, with_client=is_live_mode)
         
         if not account:
             return {
@@ -134,63 +855,12 @@ def execute_market_order_for_account(user_id, exchange_account_id, symbol, side,
         # SIMULATION MODE
         # ========================================
         if not is_live_mode:
-            print("📝 SIMULATION MODE - No real order will be sent")
-            
-            # Get current price from database for simulation
-            from services import price_service
-            price_data = price_service.get_latest_price(symbol.replace('/', ''))
-            simulated_price = price_data['close_price'] if price_data else 45000.00
-            
-            # Calculate simulated values
-            total_value = amount * simulated_price
-            
-            # Log simulated trade
-            log_id = log_trade_execution(
-                user_id=user_id,
-                exchange_account_id=exchange_account_id,
-                symbol=symbol,
-                side=side.upper(),
-                amount=amount,
-                price=simulated_price,
-                status='SIMULATED',
-                exchange_order_id=f'SIM_{datetime.now().strftime("%Y%m%d%H%M%S")}',
-                raw_response=json.dumps({
-                    'mode': 'simulation',
-                    'message': 'Order simulated for demonstration',
-                    'would_execute': f'{side} {amount} {symbol} @ ${simulated_price}'
-                }),
-                trade_source=trade_source
-            )
-            
-            print(f"✅ Simulated order logged (ID: {log_id})")
-            print(f"   Would {side}: {amount} {symbol}")
-            print(f"   At price: ${simulated_price:,.2f}")
-            print(f"   Total: ${total_value:,.2f}")
-            
-            return {
-                'success': True,
-                'mode': 'SIMULATED',
-                'message': f'Order simulated: {side} {amount} {symbol} @ ${simulated_price:,.2f}',
-                'log_id': log_id,
-                'price': simulated_price,
-                'total': total_value,
-                'exchange': account['exchange_name']
-            }
+            return _simulate_order(user_id, exchange_account_id, account, symbol, side, amount, trade_source)
         
         # ========================================
         # LIVE MODE (REAL TRADING!)
         # ========================================
-        print("🔴 LIVE MODE - Real order will be sent to exchange!")
-        print("⚠️ THIS INVOLVES REAL MONEY (or testnet money)")
-        
-        # Create exchange client with real API credentials
-        client = exchange_client.create_exchange_client(
-            exchange_name=account['exchange_name'],
-            api_key=account['api_key'],
-            api_secret=account['api_secret'],
-            is_testnet=bool(account['is_testnet'])
-        )
-        
+        # ⚠️ Real order - this involves real money (or testnet money)
         if not client:
             return {
                 'success': False,
@@ -205,86 +875,398 @@ def execute_market_order_for_account(user_id, exchange_account_id, symbol, side,
             amount=amount
         )
         
-        if not order:
-            # Order failed
-            log_id = log_trade_execution(
-                user_id=user_id,
-                exchange_account_id=exchange_account_id,
-                symbol=symbol,
-                side=side.upper(),
-                amount=amount,
-                price=0,
-                status='ERROR',
-                trade_source=trade_source,
-                error_message='Exchange rejected the order'
-            )
-            
-            return {
+        return _record_live_order(user_id, exchange_account_id, account, symbol, side, amount,
+                                  order, trade_source)
+        
+    except _ORDER_ERRORS as e:
+        return _record_order_error(user_id, exchange_account_id, symbol, side, amount,
+                                   mode, trade_source, e)
+
+
+async def execute_market_order_async(user_id, exchange_account_id, account, client, symbol, side,
+                                     amount, is_live_mode, trade_source='manual'):
+    """
+    Async version of execute_market_order_for_account().
+    
+    Used when several orders are sent at once (see execute_grid_bot_levels).
+    The caller loads the exchange account and creates ONE async client
+    (exchange_client.create_async_exchange_client) and passes them in, so
+    all concurrent orders share the same connection.
+    
+    Args:
+        user_id (int): User's ID
+        exchange_account_id (int): Which exchange account to use
+        account (dict): Exchange account row (with API credentials)
+        client: ccxt.async_support client (None in simulation mode)
+        symbol (str): Trading pair (e.g., "BTC/USDT")
+        side (str): "buy" or "sell"
+        amount (float): Amount to trade
+        is_live_mode (bool): True to send a real order
+        trade_source (str): What triggered this ("ai_prediction", "grid_bot", "manual")
+    
+    Returns:
+        dict: Same result format as execute_market_order_for_account()
+    """
+    
+    mode = "LIVE" if is_live_mode else "SIMULATED"
+    
+    try:
+        if not is_live_mode:
+            return _simulate_order(user_id, exchange_account_id, account, symbol, side, amount, trade_source)
+        
+        await _wait_for_rate_limit(account)
+        order = await exchange_client.place_market_order_async(
+            exchange=client,
+            symbol=symbol,
+            side=side.lower(),
+            amount=amount
+        )
+        
+        return _record_live_order(user_id, exchange_account_id, account, symbol, side, amount,
+                                  order, trade_source)
+        
+    except _ORDER_ERRORS as e:
+        return _record_order_error(user_id, exchange_account_id, symbol, side, amount,
+                                   mode, trade_source, e)
+
+
+async def _execute_orders_concurrently(user_id, exchange_account_id, symbol, orders,
+                                       is_live_mode, trade_source):
+    """
+    Execute several market orders for one account concurrently.
+    
+    At most config.MAX_CONCURRENT_ORDERS orders are in flight at once,
+    to stay within exchange rate limits.
+    
+    Args:
+        orders (list): (side, amount) tuples
+        is_live_mode (bool): True to send real orders
+    
+    Returns:
+        list: One result dict per order, in the same order
+    """
+    
+    # Async clients are tied to this event loop, so only the account is cached
+    account, _ = _get_cached_account(user_id, exchange_account_id)
+    
+    if not account:
+        return [{
+            'success': False,
+            'error': 'Exchange account not found or access denied'
+        }] * len(orders)
+    
+    # One async client shared by every order in this batch
+    # (WebSocket-capable if WebSocket trading is enabled)
+    client = None
+    if is_live_mode:
+        if config.USE_WS_TRADING:
+            create_client = exchange_client.create_ws_exchange_client
+        else:
+            create_client = exchange_client.create_async_exchange_client
+        
+        client = create_client(
+            exchange_name=account['exchange_name'],
+            api_key=account['api_key'],
+            api_secret=account['api_secret'],
+            is_testnet=bool(account['is_testnet'])
+        )
+        
+        if not client:
+            return [{
                 'success': False,
-                'mode': 'LIVE',
-                'error': 'Order execution failed',
-                'log_id': log_id
-            }
+                'error': f'Failed to create {account["exchange_name"]} client'
+            }] * len(orders)
+    
+    semaphore = asyncio.Semaphore(config.MAX_CONCURRENT_ORDERS)
+    
+    async def run_limited(side, amount):
+        async with semaphore:
+            return await execute_market_order_async(
+                user_id, exchange_account_id, account, client, symbol, side,
+                amount, is_live_mode, trade_source
+            )
+    
+    async def run_batch_limited(batch):
+        async with semaphore:
+            results = await _execute_order_batch(
+                user_id, exchange_account_id, account, client, symbol, batch, trade_source
+            )
         
-        # Order succeeded
-        # Log the real trade
+        # Batch not supported or rejected before anything was executed:
+        # send the orders one by one (after releasing the semaphore slot)
+        if results is None:
+            results = await asyncio.gather(*(run_limited(side, amount) for side, amount in batch))
+        return results
+    
+    try:
+        # Exchanges with a batch-order endpoint for this market: up to
+        # MAX_BATCH_ORDERS orders per request instead of one per order.
+        # Orders over WebSocket are already cheap, so they go one by one.
+        use_batches = (
+            client is not None
+            and not client.has.get('createOrderWs')
+            and await exchange_client.supports_batch_orders(client, symbol)
+        )
+        if use_batches:
+            batch_size = config.MAX_BATCH_ORDERS
+            batches = [orders[i:i + batch_size] for i in range(0, len(orders), batch_size)]
+            batch_results = await asyncio.gather(*(run_batch_limited(batch) for batch in batches))
+            return [result for results in batch_results for result in results]
+        
+        return await asyncio.gather(*(run_limited(side, amount) for side, amount in orders))
+    finally:
+        if client:
+            await client.close()
+
+
+async def _execute_order_batch(user_id, exchange_account_id, account, client, symbol, orders, trade_source):
+    """
+    Send (side, amount) orders as one exchange batch request and log each.
+    
+    Returns:
+        list: One result dict per order, in the same order
+        None: Nothing was executed (batch not supported for this market, or
+              rejected as a whole) - the caller sends the orders one by one
+    """
+    
+    try:
+        await _wait_for_rate_limit(account)
+        placed = await exchange_client.place_market_orders_batch_async(client, symbol, orders)
+    except ccxt.NotSupported as e:
+        logger.warning("batch_orders_not_supported symbol=%s error=%s", symbol, e)
+        return None
+    except ccxt.NetworkError as e:
+        # The request may have reached the exchange: the orders may well be
+        # executed, so they are neither resent nor logged as ERROR
+        return [
+            _record_order_unknown(user_id, exchange_account_id, symbol, side, amount,
+                                  trade_source, e)
+            for side, amount in orders
+        ]
+    except _ORDER_ERRORS as e:
+        return [
+            _record_order_error(user_id, exchange_account_id, symbol, side, amount,
+                                'LIVE', trade_source, e)
+            for side, amount in orders
+        ]
+    
+    if placed is None:
+        return None
+    
+    # Entries without an order ID were rejected by the exchange
+    results = [
+        _record_live_order(user_id, exchange_account_id, account, symbol, side, amount,
+                           order if order and order.get('id') else None, trade_source)
+        for (side, amount), order in zip(orders, placed)
+    ]
+    
+    # Fewer entries than orders sent: we can't tell what happened to the
+    # rest, so (like a network error) they are neither resent nor ERROR
+    if len(placed) != len(orders):
+        logger.error("batch_orders_incomplete symbol=%s sent=%d returned=%d",
+                     symbol, len(orders), len(placed))
+        results += [
+            _record_order_unknown(user_id, exchange_account_id, symbol, side, amount, trade_source,
+                                  f'exchange returned {len(placed)} results for {len(orders)} orders',
+                                  message='The exchange did not report this order - check the exchange, '
+                                          'it may have been executed')
+            for side, amount in orders[len(placed):]
+        ]
+    
+    return results
+
+
+def _simulate_order(user_id, exchange_account_id, account, symbol, side, amount, trade_source):
+    """Log a SIMULATED order at the latest database price (no exchange call)."""
+    
+    # Get current price for simulation - from the price cache, or
+    # straight from the database if the cache is switched off
+    symbol_db = symbols.to_db(symbol)
+    if config.SIMULATION_USE_CACHE:
+        simulated_price = _cached_price(symbol_db, max_age=config.SIMULATION_PRICE_MAX_AGE)
+    else:
+        price_data = price_service.get_latest_price(symbol_db)
+        simulated_price = price_data['close_price'] if price_data else None
+    
+    simulated_price = simulated_price or 45000.00
+    
+    # Calculate simulated values
+    total_value = amount * simulated_price
+    
+    # Log simulated trade
+    log_id = log_trade_execution(
+        user_id=user_id,
+        exchange_account_id=exchange_account_id,
+        symbol=symbol,
+        side=side.upper(),
+        amount=amount,
+        price=simulated_price,
+        status='SIMULATED',
+        exchange_order_id=f'SIM_{_SIM_EPOCH}_{next(_sim_counter)}',
+        raw_response={
+            'mode': 'simulation',
+            'message': 'Order simulated for demonstration',
+            'would_execute': f'{side} {amount} {symbol} @ ${simulated_price}'
+        },
+        trade_source=trade_source
+    )
+    
+    logger.info(
+        "order_simulated log_id=%s side=%s amount=%s symbol=%s price=%s total=%s",
+        log_id, side, amount, symbol, simulated_price, total_value
+    )
+    
+    return {
+        'success': True,
+        'mode': 'SIMULATED',
+        'message': f'Order simulated: {side} {amount} {symbol} @ ${simulated_price:,.2f}',
+        'log_id': log_id,
+        'price': simulated_price,
+        'total': total_value,
+        'exchange': account['exchange_name']
+    }
+
+
+def _record_live_order(user_id, exchange_account_id, account, symbol, side, amount, order, trade_source):
+    """Log the exchange response of a LIVE order and build the result dict."""
+    
+    if not order:
+        # Order failed
         log_id = log_trade_execution(
             user_id=user_id,
             exchange_account_id=exchange_account_id,
             symbol=symbol,
             side=side.upper(),
-            amount=order.get('filled', amount),
-            price=order.get('average', 0),
-            status=order.get('status', 'FILLED').upper(),
-            exchange_order_id=order.get('id'),
-            raw_response=json.dumps(order),
+            amount=amount,
+            price=0,
+            status='ERROR',
             trade_source=trade_source,
-            fee=order.get('fee', {}).get('cost', 0),
-            fee_currency=order.get('fee', {}).get('currency')
+            error_message='Exchange rejected the order'
         )
         
-        print(f"✅ LIVE order executed successfully!")
-        print(f"   Order ID: {order.get('id')}")
-        print(f"   Status: {order.get('status')}")
-        print(f"   Filled: {order.get('filled')}")
-        print(f"   Price: ${order.get('average')}")
-        
         return {
-            'success': True,
+            'success': False,
             'mode': 'LIVE',
-            'message': f'Order executed: {side} {amount} {symbol}',
-            'order_id': order.get('id'),
-            'log_id': log_id,
-            'price': order.get('average'),
-            'filled': order.get('filled'),
-            'status': order.get('status'),
-            'exchange': account['exchange_name']
+            'error': 'Order execution failed',
+            'log_id': log_id
         }
-        
+    
+    # Order succeeded
+    # CCXT fills unknown fields with None (e.g. fee/average of an order
+    # that isn't filled yet), so every field needs a fallback
+    filled = order.get('filled')
+    fee = order.get('fee') or {}
+    
+    try:
+        # Log the real trade
+        log_id = log_trade_execution(
+            user_id=user_id,
+            exchange_account_id=exchange_account_id,
+            symbol=symbol,
+            side=side.upper(),
+            amount=amount if filled is None else filled,
+            price=order.get('average') or 0,
+            status=(order.get('status') or 'FILLED').upper(),
+            exchange_order_id=order.get('id'),
+            raw_response=order,
+            trade_source=trade_source,
+            fee=fee.get('cost') or 0,
+            fee_currency=fee.get('currency')
+        )
     except Exception as e:
-        print(f"❌ Error executing order: {e}")
-        
-        # Log error
-        try:
-            log_trade_execution(
-                user_id=user_id,
-                exchange_account_id=exchange_account_id,
-                symbol=symbol,
-                side=side.upper(),
-                amount=amount,
-                price=0,
-                status='ERROR',
-                trade_source=trade_source,
-                error_message=str(e)
-            )
-        except:
-            pass
-        
-        return {
-            'success': False,
-            'mode': mode,
-            'error': str(e)
-        }
+        # The order is already on the exchange: never let a logging
+        # problem turn it into an error (callers would resend it)
+        logger.exception("order_log_failed order_id=%s", order.get('id'))
+        return _record_order_unknown(
+            user_id, exchange_account_id, symbol, side, amount, trade_source, e,
+            message=f'Order {order.get("id")} was sent, but logging it failed - check the exchange ({e})',
+            exchange_order_id=order.get('id')
+        )
+    
+    logger.info(
+        "order_executed mode=LIVE log_id=%s order_id=%s status=%s filled=%s price=%s",
+        log_id, order.get('id'), order.get('status'), order.get('filled'), order.get('average')
+    )
+    
+    return {
+        'success': True,
+        'mode': 'LIVE',
+        'message': f'Order executed: {side} {amount} {symbol}',
+        'order_id': order.get('id'),
+        'log_id': log_id,
+        'price': order.get('average'),
+        'filled': order.get('filled'),
+        'status': order.get('status'),
+        'exchange': account['exchange_name']
+    }
+
+
+def _record_order_error(user_id, exchange_account_id, symbol, side, amount, mode, trade_source, error):
+    """Log an order that raised an exception and build the error result."""
+    
+    logger.error("order_failed mode=%s symbol=%s side=%s amount=%s error=%s",
+                 mode, symbol, side, amount, error)
+    
+    # Log error
+    try:
+        log_trade_execution(
+            user_id=user_id,
+            exchange_account_id=exchange_account_id,
+            symbol=symbol,
+            side=side.upper(),
+            amount=amount,
+            price=0,
+            status='ERROR',
+            trade_source=trade_source,
+            error_message=str(error)
+        )
+    except (sqlite3.Error, OSError) as e:
+        logger.error("could not log failed order: %s", e)
+    
+    return {
+        'success': False,
+        'mode': mode,
+        'error': str(error)
+    }
+
+
+def _record_order_unknown(user_id, exchange_account_id, symbol, side, amount, trade_source, error,
+                          message=None, exchange_order_id=None):
+    """Log a LIVE order whose outcome is unknown (e.g. network error mid-request)."""
+    
+    logger.error("order_unknown mode=LIVE symbol=%s side=%s amount=%s error=%s",
+                 symbol, side, amount, error)
+    
+    if message is None:
+        message = f'Network error while placing the order - check the exchange, it may have been executed ({error})'
+    
+    try:
+        log_trade_execution(
+            user_id=user_id,
+            exchange_account_id=exchange_account_id,
+            symbol=symbol,
+            side=side.upper(),
+            amount=amount,
+            price=0,
+            status='UNKNOWN',
+            exchange_order_id=exchange_order_id,
+            trade_source=trade_source,
+            error_message=message
+        )
+    except Exception as e:
+        # Last resort - the error was already logged above
+        logger.error("could not log order with unknown outcome: %s", e)
+    
+    result = {
+        'success': False,
+        'mode': 'LIVE',
+        'status': 'UNKNOWN',
+        'error': message
+    }
+    if exchange_order_id is not None:
+        # The exchange accepted it - callers must not send it again
+        result['order_id'] = exchange_order_id
+    return result
 
 
 def log_trade_execution(user_id, exchange_account_id, symbol, side, amount, price,
@@ -313,29 +1295,37 @@ def log_trade_execution(user_id, exchange_account_id, symbol, side, amount, pric
         price (float): Execution price
         status (str): "SIMULATED", "FILLED", "ERROR", etc.
         exchange_order_id (str, optional): Order ID from exchange
-        raw_response (str, optional): Full JSON response
+        raw_response (dict, optional): Full exchange response (stored compressed)
         trade_source (str): What triggered this trade
         fee (float): Trading fee
         fee_currency (str): Fee currency
         error_message (str, optional): Error if failed
     
+    Note:
+        The row is queued (or appended to the binlog file when
+        config.TWO_LEVEL_LOGGING is on) and written to the database by a
+        background thread shortly after this returns (see flush_trade_logs()).
+    
     Returns:
-        int: Log ID, or None if failed
+        int: Log ID, or None if an ID could not be allocated
     """
     
     total_value = amount * price if price > 0 else 0
     
-    query = """
-        INSERT INTO exchange_trade_logs 
-        (user_id, exchange_account_id, symbol, side, amount, price, total_value,
-         status, exchange_order_id, raw_response, trade_source, fee, fee_currency, error_message)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """
+    log_id = _next_log_id()
     
-    log_id = db.execute_query(query, (
-        user_id, exchange_account_id, symbol, side, amount, price, total_value,
-        status, exchange_order_id, raw_response, trade_source, fee, fee_currency, error_message
-    ))
+    row = (
+        log_id, user_id, exchange_account_id, symbol, side, amount, price, total_value,
+        status, exchange_order_id, exchange_account_model.pack_raw_response(raw_response),
+        trade_source, fee, fee_currency, error_message
+    )
+    
+    if config.TWO_LEVEL_LOGGING:
+        _append_to_binlog(row)
+        _start_binlog_ingester()
+    else:
+        _start_log_writer()
+        _log_queue.put(row)
     
     return log_id
 
@@ -363,16 +1353,8 @@ def execute_ai_trade(user_id, exchange_account_id, symbol, amount):
         dict: Execution result with prediction details
     """
     
-    from services import prediction_service
-    
-    print(f"\n{'='*70}")
-    print(f"AI-DRIVEN TRADE EXECUTION")
-    print(f"{'='*70}")
-    
     # Step 1: Get AI prediction
-    print(f"[1] Getting AI prediction for {symbol}...")
-    
-    prediction = prediction_service.predict_price_movement(symbol.replace('/', ''))
+    prediction = prediction_service.predict_price_movement(symbols.to_db(symbol))
     
     if not prediction:
         return {
@@ -380,19 +1362,18 @@ def execute_ai_trade(user_id, exchange_account_id, symbol, amount):
             'error': 'Failed to get AI prediction'
         }
     
-    print(f"   AI Prediction: {prediction['direction']}")
-    print(f"   Confidence: {prediction['confidence_pct']}%")
-    
     # Step 2: Convert prediction to trading side
     if prediction['direction'] == 'UP':
-        side = 'buy'
-        print(f"   → Signal: BUY (AI predicts price will rise)")
+        side = 'buy'   # AI predicts price will rise
     else:
-        side = 'sell'
-        print(f"   → Signal: SELL (AI predicts price will fall)")
+        side = 'sell'  # AI predicts price will fall
+    
+    logger.info(
+        "ai_trade symbol=%s prediction=%s confidence=%s%% signal=%s",
+        symbol, prediction['direction'], prediction['confidence_pct'], side.upper()
+    )
     
     # Step 3: Execute the order
-    print(f"\n[2] Executing {side.upper()} order...")
     
     result = execute_market_order_for_account(
         user_id=user_id,
@@ -412,6 +1393,39 @@ def execute_ai_trade(user_id, exchange_account_id, symbol, amount):
     return result
 
 
+def _find_eligible_levels(levels, current_price):
+    """
+    Pick the unfilled grid levels that should execute at current_price.
+    
+    Simple execution logic for demo:
+    - BUY if current price is near or below the level (within 1%)
+    - SELL if current price is near or above the level (within 1%)
+    
+    All levels are checked at once with NumPy arrays instead of a
+    Python loop, which matters for bots with hundreds of levels.
+    
+    Returns:
+        list: (level, side) tuples in level order
+    """
+    if not levels:
+        return []
+    
+    level_prices = np.array([l['level_price'] for l in levels], dtype=np.float64)
+    order_types = np.array([l['order_type'] for l in levels])
+    filled = np.array([l['is_filled'] == 1 for l in levels], dtype=bool)
+    
+    is_buy = order_types == 'BUY'
+    is_sell = order_types == 'SELL'
+    
+    buy_mask = is_buy & (current_price <= level_prices * 1.01) & ~filled
+    sell_mask = is_sell & (current_price >= level_prices * 0.99) & ~filled
+    
+    return [
+        (levels[i], 'buy' if buy_mask[i] else 'sell')
+        for i in np.flatnonzero(buy_mask | sell_mask)
+    ]
+
+
 def execute_grid_bot_levels(user_id, bot_id, exchange_account_id, amount_per_order=None):
     """
     Execute grid bot levels that are eligible based on current price.
@@ -439,91 +1453,69 @@ def execute_grid_bot_levels(user_id, bot_id, exchange_account_id, amount_per_ord
         dict: Execution results for all levels
     """
     
-    from services import grid_bot_service
-    from services import price_service
-    
-    print(f"\n{'='*70}")
-    print(f"GRID BOT EXECUTION")
-    print(f"{'='*70}")
-    print(f"Bot ID: {bot_id}")
-    print(f"Exchange Account ID: {exchange_account_id}")
-    print(f"{'='*70}\n")
+    # Resolve the trading mode once for all levels of this run
+    is_live_mode = _IS_LIVE_MODE
     
-    # Get bot details
-    bot_details = grid_bot_service.get_bot_details(bot_id, user_id)
+    # Get bot, levels and current price in one query
+    snapshot = grid_bot_service.get_bot_execution_snapshot(bot_id, user_id)
     
-    if not bot_details:
+    if not snapshot:
         return {
             'success': False,
             'error': 'Grid bot not found or access denied'
         }
     
-    bot = bot_details['bot']
-    levels = bot_details['levels']
+    bot = snapshot['bot']
+    levels = snapshot['levels']
     
-    # Get current price
     symbol_db = bot['symbol']  # e.g., "BTCUSDT"
-    symbol_exchange = symbol_db.replace('USDT', '/USDT')  # e.g., "BTC/USDT"
+    symbol_exchange = symbols.to_exchange(symbol_db)  # e.g., "BTC/USDT"
     
-    price_data = price_service.get_latest_price(symbol_db)
-    current_price = price_data['close_price'] if price_data else 45000.00
+    # The snapshot already read the latest price - share it with the
+    # simulated orders below so they don't query it again
+    update_cached_price(symbol_db, snapshot['latest_price'])
+    current_price = snapshot['latest_price'] or 45000.00
     
-    print(f"Current price: ${current_price:,.2f}")
-    print(f"Grid range: ${bot['lower_price']:,.2f} - ${bot['upper_price']:,.2f}")
-    print(f"Levels: {len(levels)}")
+    logger.info(
+        "grid_bot_run bot=%s account=%s price=%s range=%s-%s levels=%d",
+        bot_id, exchange_account_id, current_price, bot['lower_price'], bot['upper_price'], len(levels)
+    )
     
     # Default amount per order
     if not amount_per_order:
         amount_per_order = bot['investment_amount'] / bot['grid_count']
     
-    # Execute eligible levels
+    # Find eligible levels first
+    eligible = _find_eligible_levels(levels, current_price)
+    
+    # Execute all eligible levels concurrently (one shared exchange client)
+    results = []
+    if eligible:
+        logger.info("grid_bot_run bot=%s eligible=%d", bot_id, len(eligible))
+        results = asyncio.run(_execute_orders_concurrently(
+            user_id,
+            exchange_account_id,
+            symbol_exchange,
+            [(side, amount_per_order) for _, side in eligible],
+            is_live_mode,
+            trade_source=f'grid_bot_{bot_id}'
+        ))
+    
     executed_levels = []
     
-    for level in levels:
-        # Skip if already filled
-        if level['is_filled'] == 1:
-            continue
-        
-        level_price = level['level_price']
-        order_type = level['order_type']
-        
-        # Simple execution logic for demo:
-        # BUY if current price is near or below level
-        # SELL if current price is near or above level
-        
-        should_execute = False
-        
-        if order_type == 'BUY' and current_price <= level_price * 1.01:  # Within 1%
-            should_execute = True
-            side = 'buy'
-        elif order_type == 'SELL' and current_price >= level_price * 0.99:  # Within 1%
-            should_execute = True
-            side = 'sell'
-        
-        if should_execute:
-            print(f"\n   Executing {order_type} level @ ${level_price:,.2f}...")
-            
-            # Execute order
-            result = execute_market_order_for_account(
-                user_id=user_id,
-                exchange_account_id=exchange_account_id,
-                symbol=symbol_exchange,
-                side=side,
-                amount=amount_per_order,
-                trade_source=f'grid_bot_{bot_id}'
-            )
-            
-            if result['success']:
-                # Mark level as filled
-                query = "UPDATE grid_levels SET is_filled = 1, filled_at = datetime('now') WHERE id = ?"
-                db.execute_query(query, (level['id'],))
-                
-                executed_levels.append({
-                    'level_id': level['id'],
-                    'price': level_price,
-                    'type': order_type,
-                    'result': result
-                })
+    for (level, _), result in zip(eligible, results):
+        # An order ID without success: the order is on the exchange but
+        # could not be logged - still filled, or the next run resends it
+        if result['success'] or result.get('order_id'):
+            executed_levels.append({
+                'level_id': level['id'],
+                'price': level['level_price'],
+                'type': level['order_type'],
+                'result': result
+            })
+    
+    # Mark all executed levels as filled in one UPDATE
+    grid_bot_service.mark_levels_filled([l['level_id'] for l in executed_levels])
     
     return {
         'success': True,
@@ -39,8 +39,46 @@ This Implementation:
 - Not real financial advice!
 """
 
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import MappingProxyType
+
+import numpy as np
+
 # NOTE: This service receives prices from app.py, which uses realtime_price_service
 
+logger = logging.getLogger(__name__)
+
+
+def _round_dict(keys, values, decimals):
+    """
+    Build {key: value rounded to `decimals`} from an array in one step.
+    
+    Example:
+        _round_dict(["BTC", "ETH"], np.array([0.123, 4.567]), 1) → {"BTC": 0.1, "ETH": 4.6}
+    """
+    return dict(zip(keys, np.round(values, decimals).tolist()))
+
+
+# Demo target allocation
+# This is a simplified example for educational purposes.
+# Built once at import; read-only so no caller can change it by accident
+# (use dict(get_target_allocation()) if you need a copy to modify).
+_TARGET_ALLOC = MappingProxyType({
+    "BTC": 0.50,   # 50% - Bitcoin (largest, most stable)
+    "ETH": 0.30,   # 30% - Ethereum (second largest)
+    "BNB": 0.10,   # 10% - Binance Coin
+    "SOL": 0.10    # 10% - Solana
+})
+
+# Same data as arrays for the vectorized rebalancing math
+_TARGET_ASSETS = tuple(_TARGET_ALLOC)
+_TARGET_WEIGHTS = np.array(list(_TARGET_ALLOC.values()), dtype=np.float64)
+_TARGET_WEIGHTS.flags.writeable = False
+
+# Target allocation in percent, as returned by the analysis (rounded once)
+_TARGET_ALLOC_PCT = MappingProxyType(_round_dict(_TARGET_ASSETS, _TARGET_WEIGHTS * 100, 1))
+
 
 def get_target_allocation():
     """
@@ -53,7 +91,7 @@ def get_target_allocation():
     - Could use ML to optimize
     
     Returns:
-        dict: Target allocation percentages (must sum to 1.0)
+        Mapping: Target allocation percentages (must sum to 1.0, read-only)
               {
                   "BTC": 0.50,  # 50% Bitcoin
                   "ETH": 0.30,  # 30% Ethereum
@@ -73,14 +111,7 @@ def get_target_allocation():
         - Based on: Risk tolerance, market conditions, research
     """
     
-    # Demo target allocation
-    # This is a simplified example for educational purposes
-    return {
-        "BTC": 0.50,   # 50% - Bitcoin (largest, most stable)
-        "ETH": 0.30,   # 30% - Ethereum (second largest)
-        "BNB": 0.10,   # 10% - Binance Coin
-        "SOL": 0.10    # 10% - Solana
-    }
+    return _TARGET_ALLOC
 
 
 def analyze_portfolio_and_suggest_trades(balances, prices):
@@ -149,23 +180,25 @@ def analyze_portfolio_and_suggest_trades(balances, prices):
     # Step 1: Calculate Portfolio Value
     # ========================================
     
-    total_value_usdt = 0
-    asset_values = {}
-    
-    for asset, amount in balances.items():
-        if amount <= 0:
-            continue
-        
-        if asset == 'USDT':
-            # USDT is already in USDT
-            asset_values[asset] = amount
-            total_value_usdt += amount
-        else:
-            # Convert to USDT using price
-            price = prices.get(asset, 0)
-            value = amount * price
-            asset_values[asset] = value
-            total_value_usdt += value
+    # Look up every price once (USDT is already in USDT, so its "price" is 1).
+    # Inverse prices turn "USDT value → coin amount" into a multiply;
+    # 0 marks a missing price.
+    asset_prices = {}
+    asset_inv_prices = {}
+    for asset in set(balances) | set(target_allocation):
+        price = 1.0 if asset == 'USDT' else float(prices.get(asset) or 0)
+        asset_prices[asset] = price
+        asset_inv_prices[asset] = 1.0 / price if price else 0.0
+    
+    # All held assets as parallel arrays: value = amount * price
+    held_assets = [asset for asset, amount in balances.items() if amount > 0]
+    held_amounts = np.fromiter((balances[asset] for asset in held_assets),
+                               dtype=np.float64, count=len(held_assets))
+    held_prices = np.fromiter((asset_prices[asset] for asset in held_assets),
+                              dtype=np.float64, count=len(held_assets))
+    
+    held_values = held_amounts * held_prices
+    total_value_usdt = float(held_values.sum())
     
     if total_value_usdt == 0:
         return {
@@ -173,100 +206,105 @@ def analyze_portfolio_and_suggest_trades(balances, prices):
             'error': 'Portfolio has no value'
         }
     
-    print(f"\n{'='*70}")
-    print(f"AI PORTFOLIO ANALYSIS")
-    print(f"{'='*70}")
-    print(f"Total Portfolio Value: ${total_value_usdt:,.2f}")
-    print(f"{'='*70}\n")
-    
     # ========================================
     # Step 2: Calculate Current Allocation
     # ========================================
     
-    current_allocation = {}
-    
-    for asset, value in asset_values.items():
-        if asset != 'USDT':  # Don't allocate USDT (it's cash)
-            allocation_pct = value / total_value_usdt
-            current_allocation[asset] = allocation_pct
-    
-    print("Current Allocation:")
-    for asset, pct in sorted(current_allocation.items(), key=lambda x: x[1], reverse=True):
-        print(f"  {asset}: {pct*100:.1f}%")
-    
-    # ========================================
-    # Step 3: Compare to Target
-    # ========================================
+    held_pcts = held_values / total_value_usdt
     
-    print("\nTarget Allocation:")
-    for asset, pct in sorted(target_allocation.items(), key=lambda x: x[1], reverse=True):
-        print(f"  {asset}: {pct*100:.1f}%")
+    # Don't allocate USDT (it's cash)
+    allocated = [i for i, asset in enumerate(held_assets) if asset != 'USDT']
+    allocated_assets = [held_assets[i] for i in allocated]
+    allocated_pcts = held_pcts[allocated]
+    current_allocation = dict(zip(allocated_assets, allocated_pcts.tolist()))
     
     # ========================================
-    # Step 4: Generate Trade Suggestions
+    # Step 3 + 4: Compare to Target and Generate Trade Suggestions
     # ========================================
     
     suggested_trades = []
     threshold = 0.05  # 5% difference threshold
     
-    print("\nAnalysis:")
+    # Current vs target for every target asset, all at once
+    target_assets = _TARGET_ASSETS
+    count = len(target_assets)
+    target_pcts = _TARGET_WEIGHTS
+    current_pcts = np.fromiter((current_allocation.get(asset, 0) for asset in target_assets),
+                               dtype=np.float64, count=count)
+    inv_prices = np.fromiter((asset_inv_prices[asset] for asset in target_assets),
+                             dtype=np.float64, count=count)
+    
+    differences = current_pcts - target_pcts
+    # Without a price the amount would be meaningless, so skip those assets
+    needs_trade = (np.abs(differences) > threshold) & (inv_prices > 0)
+    
+    # Usual case: everything is close to target → nothing to build
+    if not needs_trade.any():
+        logger.debug("Portfolio within %.0f%% of target (value $%.2f) - no rebalancing needed",
+                     threshold * 100, total_value_usdt)
+        return {
+            'success': True,
+            'total_value_usdt': round(total_value_usdt, 2),
+            'current_allocation': _round_dict(allocated_assets, allocated_pcts * 100, 1),
+            'target_allocation': dict(_TARGET_ALLOC_PCT),
+            'suggested_trades': [],
+            'needs_rebalancing': False,
+            'asset_values': _round_dict(held_assets, held_values, 2)
+        }
+    
+    # Over-allocated → SELL the excess, under-allocated → BUY the deficit
+    trade_amounts = np.abs(differences) * total_value_usdt * inv_prices
     
-    # Check each target asset
-    for asset, target_pct in target_allocation.items():
-        current_pct = current_allocation.get(asset, 0)
-        difference = current_pct - target_pct
+    # Build suggestions only for assets that need rebalancing
+    for i in np.flatnonzero(needs_trade):
+        asset = target_assets[i]
+        current_pct = float(current_pcts[i])
+        target_pct = float(target_pcts[i])
         
-        print(f"  {asset}: Current {current_pct*100:.1f}%, Target {target_pct*100:.1f}%, Diff {difference*100:+.1f}%")
+        if differences[i] > 0:
+            action = 'SELL'
+            reason = f'Reduce {asset} from {current_pct*100:.1f}% to {target_pct*100:.1f}%'
+        else:
+            action = 'BUY'
+            reason = f'Increase {asset} from {current_pct*100:.1f}% to {target_pct*100:.1f}%'
         
-        if abs(difference) > threshold:
-            # Needs rebalancing
-            
-            if difference > 0:
-                # Over-allocated → SELL
-                excess_value = difference * total_value_usdt
-                price = prices.get(asset, 1)
-                amount_to_sell = excess_value / price
-                
-                suggested_trades.append({
-                    'action': 'SELL',
-                    'symbol': f'{asset}/USDT',
-                    'asset': asset,
-                    'amount': round(amount_to_sell, 6),
-                    'reason': f'Reduce {asset} from {current_pct*100:.1f}% to {target_pct*100:.1f}%',
-                    'current_pct': round(current_pct * 100, 1),
-                    'target_pct': round(target_pct * 100, 1)
-                })
-                
-            else:
-                # Under-allocated → BUY
-                deficit_value = abs(difference) * total_value_usdt
-                price = prices.get(asset, 1)
-                amount_to_buy = deficit_value / price
-                
-                suggested_trades.append({
-                    'action': 'BUY',
-                    'symbol': f'{asset}/USDT',
-                    'asset': asset,
-                    'amount': round(amount_to_buy, 6),
-                    'reason': f'Increase {asset} from {current_pct*100:.1f}% to {target_pct*100:.1f}%',
-                    'current_pct': round(current_pct * 100, 1),
-                    'target_pct': round(target_pct * 100, 1)
-                })
+        suggested_trades.append({
+            'action': action,
+            'symbol': f'{asset}/USDT',
+            'asset': asset,
+            'amount': round(float(trade_amounts[i]), 6),
+            'reason': reason,
+            'current_pct': round(current_pct * 100, 1),
+            'target_pct': round(target_pct * 100, 1)
+        })
     
     needs_rebalancing = len(suggested_trades) > 0
     
-    print(f"\nSuggested Trades: {len(suggested_trades)}")
-    for trade in suggested_trades:
-        print(f"  {trade['action']} {trade['amount']} {trade['asset']} - {trade['reason']}")
+    # Detailed report only when debug logging is on (building it costs time)
+    if logger.isEnabledFor(logging.DEBUG):
+        lines = [f"AI portfolio analysis - total value ${total_value_usdt:,.2f}", "Current allocation:"]
+        for asset, pct in sorted(current_allocation.items(), key=lambda x: x[1], reverse=True):
+            lines.append(f"  {asset}: {pct*100:.1f}%")
+        lines.append("Target allocation:")
+        for asset, pct in sorted(target_allocation.items(), key=lambda x: x[1], reverse=True):
+            lines.append(f"  {asset}: {pct*100:.1f}%")
+        lines.append("Analysis:")
+        for asset, current_pct, target_pct, difference in zip(target_assets, current_pcts, target_pcts, differences):
+            lines.append(f"  {asset}: Current {current_pct*100:.1f}%, Target {target_pct*100:.1f}%, "
+                         f"Diff {difference*100:+.1f}%")
+        lines.append(f"Suggested trades: {len(suggested_trades)}")
+        for trade in suggested_trades:
+            lines.append(f"  {trade['action']} {trade['amount']} {trade['asset']} - {trade['reason']}")
+        logger.debug("\n".join(lines))
     
     return {
         'success': True,
         'total_value_usdt': round(total_value_usdt, 2),
-        'current_allocation': {k: round(v*100, 1) for k, v in current_allocation.items()},
-        'target_allocation': {k: round(v*100, 1) for k, v in target_allocation.items()},
+        'current_allocation': _round_dict(allocated_assets, allocated_pcts * 100, 1),
+        'target_allocation': dict(_TARGET_ALLOC_PCT),
         'suggested_trades': suggested_trades,
         'needs_rebalancing': needs_rebalancing,
-        'asset_values': {k: round(v, 2) for k, v in asset_values.items()}
+        'asset_values': _round_dict(held_assets, held_values, 2)
     }
 
 
@@ -287,50 +325,73 @@ def execute_rebalancing_trades(user_id, exchange_account_id, suggested_trades):
         dict: Execution results for all trades
     """
     
+    from models import db
     from services import order_execution_service
     
-    print(f"\n{'='*70}")
-    print(f"EXECUTING PORTFOLIO REBALANCING")
-    print(f"{'='*70}")
-    print(f"Number of trades: {len(suggested_trades)}")
-    print(f"{'='*70}\n")
+    logger.debug("Executing portfolio rebalancing: %d trade(s)", len(suggested_trades))
     
-    execution_results = []
+    execution_results = [None] * len(suggested_trades)
     successful = 0
     failed = 0
     
-    for trade in suggested_trades:
-        print(f"\n[Trade {len(execution_results) + 1}/{len(suggested_trades)}]")
-        print(f"  {trade['action']} {trade['amount']} {trade['asset']}")
-        print(f"  Reason: {trade['reason']}")
-        
-        # Execute trade
-        result = order_execution_service.execute_market_order_for_account(
-            user_id=user_id,
-            exchange_account_id=exchange_account_id,
-            symbol=trade['symbol'],
-            side=trade['action'].lower(),
-            amount=trade['amount'],
-            trade_source='portfolio_ai_rebalancing'
-        )
-        
-        execution_results.append({
-            'trade': trade,
-            'result': result,
-            'success': result['success']
-        })
+    if not suggested_trades:
+        return {
+            'success': True,
+            'total_trades': 0,
+            'successful': 0,
+            'failed': 0,
+            'results': []
+        }
+    
+    # Each order is one blocking HTTP call to the exchange, so send them in
+    # parallel: N trades take about as long as the slowest one, not N times as long.
+    # (Each worker thread gets its own exchange client from
+    # order_execution_service - ccxt sync clients aren't thread-safe - and
+    # closes its database connections when its trade is done.)
+    with ThreadPoolExecutor(max_workers=min(8, len(suggested_trades))) as executor:
+        futures = {
+            executor.submit(
+                db.run_and_close_connections,
+                order_execution_service.execute_market_order_for_account,
+                user_id=user_id,
+                exchange_account_id=exchange_account_id,
+                symbol=trade['symbol'],
+                side=trade['action'].lower(),
+                amount=trade['amount'],
+                trade_source='portfolio_ai_rebalancing'
+            ): index
+            for index, trade in enumerate(suggested_trades)
+        }
         
-        if result['success']:
-            successful += 1
-        else:
-            failed += 1
-    
-    print(f"\n{'='*70}")
-    print(f"REBALANCING COMPLETE")
-    print(f"{'='*70}")
-    print(f"Successful: {successful}/{len(suggested_trades)}")
-    print(f"Failed: {failed}/{len(suggested_trades)}")
-    print(f"{'='*70}\n")
+        for future in as_completed(futures):
+            index = futures[future]
+            trade = suggested_trades[index]
+            
+            try:
+                result = future.result()
+            except Exception as e:
+                # One failing trade must not hide the results of the others
+                logger.warning("Rebalancing trade %s %s failed: %s", trade['action'], trade['asset'], e)
+                result = {'success': False, 'error': str(e)}
+            
+            logger.debug("Trade %d/%d: %s %s %s (%s) -> %s", index + 1, len(suggested_trades),
+                         trade['action'], trade['amount'], trade['asset'], trade['reason'],
+                         'ok' if result['success'] else 'failed')
+            
+            # Keep results in the same order as suggested_trades
+            execution_results[index] = {
+                'trade': trade,
+                'result': result,
+                'success': result['success']
+            }
+            
+            if result['success']:
+                successful += 1
+            else:
+                failed += 1
+    
+    logger.debug("Rebalancing complete: %d successful, %d failed (of %d)",
+                 successful, failed, len(suggested_trades))
     
     return {
         'success': True,
@@ -4,11 +4,156 @@ Uses the trained AI model to make price predictions.
 """
 
 import numpy as np
-import pandas as pd
-from services.train_model import load_model
+from services.train_model import load_model, FEATURE_COLUMNS
 from models import db
 
 
+# Optional: Numba compiles the feature kernel below to machine code,
+# which matters when predictions run in a loop (e.g. backtests).
+# Without it the same function runs as plain Python.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _compute_features(close, high, low, volume):
+    """
+    Calculate the 7 model features for the LATEST row (same as training).
+    
+    Written as explicit loops so Numba can compile it; for 10 values a
+    compiled loop is faster than several small NumPy calls.
+    
+    Args:
+        close, high, low, volume (np.ndarray): Oldest-first price columns
+                                                (at least 6 values)
+    
+    Returns:
+        np.ndarray: [prev_close, return, sma_5, distance_from_sma,
+                     volatility, high_low_range, volume]
+    """
+    n = close.shape[0]
+    last = close[n - 1]
+    
+    # Feature 1 + 2: Previous close and return
+    prev_close = close[n - 2]
+    latest_return = (last - prev_close) / prev_close
+    
+    # Feature 3 + 4: SMA 5 and distance from it
+    sma_5 = 0.0
+    for i in range(n - 5, n):
+        sma_5 += close[i]
+    sma_5 /= 5.0
+    distance_from_sma = (last - sma_5) / sma_5
+    
+    # Feature 5: Volatility = std of the last 5 returns (ddof=1 like pandas)
+    mean_return = 0.0
+    for i in range(n - 5, n):
+        mean_return += (close[i] - close[i - 1]) / close[i - 1]
+    mean_return /= 5.0
+    
+    variance = 0.0
+    for i in range(n - 5, n):
+        diff = (close[i] - close[i - 1]) / close[i - 1] - mean_return
+        variance += diff * diff
+    volatility = (variance / 4.0) ** 0.5
+    
+    features = np.empty(7)
+    features[0] = prev_close
+    features[1] = latest_return
+    features[2] = sma_5
+    features[3] = distance_from_sma
+    features[4] = volatility
+    features[5] = (high[n - 1] - low[n - 1]) / last  # Feature 6: High-low range
+    features[6] = volume[n - 1]                        # Feature 7: Volume
+    return features
+
+
+if njit is not None:
+    _compute_features = njit(cache=True)(_compute_features)
+
+
+def _features_match(model_data):
+    """
+    Check the model was trained on the features _compute_features() builds.
+    
+    _compute_features() returns a plain array, so its column order must
+    be the model's feature order - a model trained on other features
+    would silently get wrong inputs.
+    
+    Args:
+        model_data (dict): Model data from load_model()
+    
+    Returns:
+        bool: True if the features match (in the same order)
+    """
+    if list(model_data['features']) != FEATURE_COLUMNS:
+        print(f"❌ Model features {list(model_data['features'])} don't match {FEATURE_COLUMNS} - retrain the model")
+        return False
+    return True
+
+
+def _scale_features(model_data, X):
+    """
+    Scale features like the training scaler did.
+    
+    Args:
+        model_data (dict): Model data from load_model()
+        X (np.ndarray): Feature matrix, shape (N, 7)
+    
+    Returns:
+        np.ndarray: Scaled features
+    """
+    # Newer models are trained on raw features (trees need no scaling)
+    scaler = model_data.get('scaler')
+    if model_data.get('scaling') == 'none' or scaler is None:
+        return X
+    
+    scale_params = model_data.get('scale_params')
+    if scale_params is None:
+        # Scaler without mean_/scale_ (not a StandardScaler) - let it do the work
+        return scaler.transform(X)
+    
+    mean, inv_scale = scale_params
+    return (X - mean) * inv_scale
+
+
+def _build_result(symbol, probabilities, current_price, prediction=None):
+    """
+    Turn the model's probabilities for one symbol into a prediction result.
+    
+    Args:
+        symbol (str): Cryptocurrency symbol
+        probabilities (np.ndarray): [P(DOWN), P(UP)] from predict_proba
+        current_price (float): Latest close price
+        prediction (int): Predicted class, if already computed (batch argmax)
+    
+    Returns:
+        dict: Prediction result (see predict_price_movement)
+    """
+    # Predicted class (0 or 1) is the one with the highest probability -
+    # the same thing model.predict() would compute again
+    if prediction is None:
+        prediction = np.argmax(probabilities)
+    prediction = int(prediction)
+    
+    # Confidence is the probability of the predicted class
+    confidence = float(probabilities[prediction])
+    
+    return {
+        'prediction': prediction,
+        'confidence': confidence,
+        'direction': 'UP' if prediction == 1 else 'DOWN',
+        'confidence_pct': round(confidence * 100, 1),
+        'symbol': symbol,
+        'current_price': current_price,
+        'probabilities': {
+            'down': float(probabilities[0]),
+            'up': float(probabilities[1])
+        }
+    }
+
+
 def predict_price_movement(symbol='BTCUSDT', model_path='services/model.joblib'):
     """
     Predict if the price will go UP or DOWN for a given symbol.
@@ -24,16 +169,12 @@ def predict_price_movement(symbol='BTCUSDT', model_path='services/model.joblib')
             - direction: 'UP' or 'DOWN'
             - confidence_pct: Confidence as percentage
     """
-    # Load the trained model
+    # Load the trained model (cached after the first call)
     model_data = load_model(model_path)
     
-    if model_data is None:
+    if model_data is None or not _features_match(model_data):
         return None
     
-    model = model_data['model']
-    scaler = model_data['scaler']
-    feature_columns = model_data['features']
-    
     # ========================================
     # Get Recent Price Data
     # ========================================
@@ -51,90 +192,144 @@ def predict_price_movement(symbol='BTCUSDT', model_path='services/model.joblib')
         print(f"❌ Not enough price data for {symbol} (need at least 7 records)")
         return None
     
-    # Convert to DataFrame and sort by timestamp (oldest first)
-    df = pd.DataFrame(prices)
-    df = df.sort_values('timestamp').reset_index(drop=True)
+    # Sort by timestamp (oldest first) and pull out the columns as arrays
+    prices.sort(key=lambda row: row['timestamp'])
     
-    # ========================================
-    # Calculate Features (same as training)
-    # ========================================
+    close = np.array([row['close_price'] for row in prices], dtype=np.float64)
+    high = np.array([row['high_price'] for row in prices], dtype=np.float64)
+    low = np.array([row['low_price'] for row in prices], dtype=np.float64)
+    volume = np.array([row['volume'] for row in prices], dtype=np.float64)
     
-    # Feature 1: Previous close
-    df['prev_close'] = df['close_price'].shift(1)
+    # Calculate features (same as training) for the latest row
+    X = _compute_features(close, high, low, volume).reshape(1, -1)
     
-    # Feature 2: Return
-    df['return'] = (df['close_price'] - df['prev_close']) / df['prev_close']
+    if np.isnan(X).any():
+        print(f"❌ Not enough data to calculate features for {symbol}")
+        return None
     
-    # Feature 3: SMA 5
-    df['sma_5'] = df['close_price'].rolling(window=5).mean()
+    # Scale features
+    X_scaled = _scale_features(model_data, X)
     
-    # Feature 4: Distance from SMA
-    df['distance_from_sma'] = (df['close_price'] - df['sma_5']) / df['sma_5']
+    # ========================================
+    # Make Prediction
+    # ========================================
     
-    # Feature 5: Volatility
-    df['volatility'] = df['return'].rolling(window=5).std()
+    # Get probability scores (one model evaluation)
+    probabilities = model_data['predict_proba'](X_scaled)[0]
     
-    # Feature 6: High-low range
-    df['high_low_range'] = (df['high_price'] - df['low_price']) / df['close_price']
+    return _build_result(symbol, probabilities, float(close[-1]))
+
+
+# ============================================
+# BATCH PREDICTIONS (many symbols at once)
+# ============================================
+
+def _fetch_recent_prices_batch(symbols, n=10):
+    """
+    Get the last n price records for every symbol in ONE query.
     
-    # Feature 7: Volume
-    df['volume_normalized'] = df['volume']
+    Args:
+        symbols (list): Cryptocurrency symbols
+        n (int): Records per symbol
     
-    # Get the most recent row (after calculating all features)
-    df_clean = df.dropna()
+    Returns:
+        dict: {symbol: {'close': array, 'high': array, 'low': array,
+                        'volume': array}} - oldest first.
+              Symbols without data are missing.
+    """
+    if not symbols:
+        return {}
+    
+    # ROW_NUMBER numbers each symbol's rows newest first, so rn <= n keeps
+    # the latest n per symbol (walks the (symbol, timestamp) index)
+    placeholders = ",".join("?" * len(symbols))
+    query = f"""
+        SELECT symbol, timestamp, high_price, low_price, close_price, volume
+        FROM (
+            SELECT symbol, timestamp, high_price, low_price, close_price, volume,
+                   ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY timestamp DESC) AS rn
+            FROM price_history
+            WHERE symbol IN ({placeholders})
+        )
+        WHERE rn <= ?
+        ORDER BY symbol, timestamp
+    """
+    rows = db.fetch_all(query, (*symbols, n)) or []
+    
+    # Group rows by symbol (they arrive sorted by symbol, then time)
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(row['symbol'], []).append(row)
+    
+    per_symbol = {}
+    for symbol, symbol_rows in grouped.items():
+        per_symbol[symbol] = {
+            'close': np.array([row['close_price'] for row in symbol_rows], dtype=np.float64),
+            'high': np.array([row['high_price'] for row in symbol_rows], dtype=np.float64),
+            'low': np.array([row['low_price'] for row in symbol_rows], dtype=np.float64),
+            'volume': np.array([row['volume'] for row in symbol_rows], dtype=np.float64),
+        }
     
-    if len(df_clean) == 0:
-        print(f"❌ Not enough data to calculate features for {symbol}")
-        return None
+    return per_symbol
+
+
+def predict_batch(symbols, model_path='services/model.joblib'):
+    """
+    Predict UP/DOWN for many symbols with one query and one model call.
     
-    # Get the latest row
-    latest = df_clean.iloc[-1]
+    Same results as calling predict_price_movement() for each symbol,
+    but much faster for a whole watchlist.
     
-    # Prepare features for prediction
-    features = [
-        latest['prev_close'],
-        latest['return'],
-        latest['sma_5'],
-        latest['distance_from_sma'],
-        latest['volatility'],
-        latest['high_low_range'],
-        latest['volume_normalized']
-    ]
+    Args:
+        symbols (list): Cryptocurrency symbols (e.g., ['BTCUSDT', 'ETHUSDT'])
+        model_path (str): Path to the trained model
     
-    # Convert to numpy array and reshape
-    X = np.array(features).reshape(1, -1)
+    Returns:
+        dict: {symbol: prediction result, or None if not enough data}
+        None: If the model could not be loaded
     
-    # Scale features
-    X_scaled = scaler.transform(X)
+    Example:
+        results = predict_batch(['BTCUSDT', 'ETHUSDT'])
+        print(results['BTCUSDT']['direction'])
+    """
+    model_data = load_model(model_path)
     
-    # ========================================
-    # Make Prediction
-    # ========================================
+    if model_data is None or not _features_match(model_data):
+        return None
     
-    # Predict class (0 or 1)
-    prediction = model.predict(X_scaled)[0]
+    results = {symbol: None for symbol in symbols}
+    per_symbol = _fetch_recent_prices_batch(symbols)
+    
+    # One feature row per symbol that has enough data, written straight
+    # into a preallocated (N, 7) matrix
+    ready_symbols = []
+    features_mat = np.empty((len(per_symbol), 7))
+    for symbol, columns in per_symbol.items():
+        if len(columns['close']) < 7:
+            print(f"❌ Not enough price data for {symbol} (need at least 7 records)")
+            continue
+        
+        features = _compute_features(columns['close'], columns['high'], columns['low'], columns['volume'])
+        if np.isnan(features).any():
+            print(f"❌ Not enough data to calculate features for {symbol}")
+            continue
+        
+        features_mat[len(ready_symbols)] = features
+        ready_symbols.append(symbol)
     
-    # Get probability scores
-    probabilities = model.predict_proba(X_scaled)[0]
+    if not ready_symbols:
+        return results
     
-    # Confidence is the probability of the predicted class
-    confidence = probabilities[prediction]
+    # Scale and predict all symbols in one go: (N, 7) → (N, 2)
+    X_scaled = _scale_features(model_data, features_mat[:len(ready_symbols)])
+    all_probabilities = model_data['predict_proba'](X_scaled)
+    all_predictions = all_probabilities.argmax(axis=1)
     
-    # Create result
-    result = {
-        'prediction': int(prediction),
-        'confidence': float(confidence),
-        'direction': 'UP' if prediction == 1 else 'DOWN',
-        'confidence_pct': round(confidence * 100, 1),
-        'symbol': symbol,
-        'current_price': float(latest['close_price']),
-        'probabilities': {
-            'down': float(probabilities[0]),
-            'up': float(probabilities[1])
-        }
-    }
+    for symbol, probabilities, prediction in zip(ready_symbols, all_probabilities, all_predictions):
+        current_price = float(per_symbol[symbol]['close'][-1])
+        results[symbol] = _build_result(symbol, probabilities, current_price, prediction)
     
-    return result
+    return results
 
 
 def save_prediction_to_db(symbol, prediction_class, confidence):
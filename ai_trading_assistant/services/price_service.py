@@ -3,9 +3,48 @@ Price Service
 Handles cryptocurrency price data retrieval and management.
 """
 
+import logging
+import sqlite3
+import time
+from functools import lru_cache
+
 from models import db
 
 
+logger = logging.getLogger(__name__)
+
+# Fallback prices for symbols with no data in the database.
+# These are old, hardcoded values - fine for the demo UI, but a warning is
+# logged every time one is used so wrong prices never go unnoticed.
+_DEFAULT_PRICES = {
+    'BTCUSDT': 45600.00,
+    'ETHUSDT': 2800.50,
+    'BNBUSDT': 420.75,
+    'SOLUSDT': 95.30,
+    'ADAUSDT': 0.65
+}
+
+# INSERT statements, written once here so every call sends SQLite the
+# exact same text and its prepared-statement cache can reuse them
+ADD_PRICE_SQL = """
+    INSERT INTO price_history (symbol, timestamp, open_price, high_price, low_price, close_price, volume)
+    VALUES (?, datetime('now'), ?, ?, ?, ?, ?)
+"""
+
+INSERT_PRICE_SQL = """
+    INSERT OR IGNORE INTO price_history (symbol, timestamp, open_price, high_price, low_price, close_price, volume)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Same, for exchange candles: the timestamp is passed in milliseconds and
+# SQLite formats it (local time, like datetime.fromtimestamp), so Python
+# never builds a datetime or calls strftime per candle
+INSERT_CANDLE_SQL = """
+    INSERT OR IGNORE INTO price_history (symbol, timestamp, open_price, high_price, low_price, close_price, volume)
+    VALUES (?, datetime(? / 1000, 'unixepoch', 'localtime'), ?, ?, ?, ?, COALESCE(?, 0))
+"""
+
+
 def get_latest_price(symbol):
     """
     Get the most recent price for a cryptocurrency symbol.
@@ -32,6 +71,31 @@ def get_latest_price(symbol):
     return price
 
 
+@lru_cache(maxsize=256)
+def _latest_price_cached(symbol, bucket):
+    """Cached get_latest_price(); `bucket` is the current second, so entries expire each second."""
+    return get_latest_price(symbol)
+
+
+def get_latest_price_fast(symbol):
+    """
+    Like get_latest_price(), but repeated calls within the same second
+    reuse the first result instead of querying the database again.
+    
+    Useful when many orders are priced at once (e.g. portfolio
+    rebalancing trades running in parallel).
+    Do NOT modify the returned dict - it is shared with other callers.
+    
+    Args:
+        symbol (str): Cryptocurrency symbol (e.g., "BTCUSDT")
+    
+    Returns:
+        dict: Price data with close_price, timestamp, etc.
+        None: If no price data found
+    """
+    return _latest_price_cached(symbol, int(time.time()))
+
+
 def get_current_prices(symbols):
     """
     Get current prices for multiple symbols.
@@ -49,20 +113,31 @@ def get_current_prices(symbols):
     """
     prices = {}
     
+    if not symbols:
+        return prices
+    
+    # One query for all symbols: each symbol's row with its latest timestamp
+    # (uses the (symbol, timestamp) index for the MAX lookup)
+    placeholders = ",".join("?" * len(symbols))
+    query = f"""
+        SELECT p.symbol, p.close_price
+        FROM price_history p
+        WHERE p.symbol IN ({placeholders})
+          AND p.timestamp = (
+              SELECT MAX(timestamp) FROM price_history
+              WHERE symbol = p.symbol
+          )
+    """
+    rows = db.fetch_all(query, tuple(symbols)) or []
+    latest_prices = {row['symbol']: row['close_price'] for row in rows}
+    
     for symbol in symbols:
-        price_data = get_latest_price(symbol)
-        if price_data:
-            prices[symbol] = price_data['close_price']
+        if symbol in latest_prices:
+            prices[symbol] = latest_prices[symbol]
         else:
-            # Default prices if no data in database
-            default_prices = {
-                'BTCUSDT': 45600.00,
-                'ETHUSDT': 2800.50,
-                'BNBUSDT': 420.75,
-                'SOLUSDT': 95.30,
-                'ADAUSDT': 0.65
-            }
-            prices[symbol] = default_prices.get(symbol, 0)
+            # No data in database → hardcoded default (0 if unknown)
+            prices[symbol] = _DEFAULT_PRICES.get(symbol, 0)
+            logger.warning("No price data for %s, using default price %s", symbol, prices[symbol])
     
     return prices
 
@@ -78,20 +153,19 @@ def get_price_history(symbol, limit=100):
     Returns:
         list: List of price records, ordered by timestamp (oldest first)
     """
+    # Inner query: newest `limit` rows (walks the index backwards).
+    # Outer query: put them oldest first (needed for calculations).
     query = """
-        SELECT * FROM price_history
-        WHERE symbol = ?
-        ORDER BY timestamp DESC
-        LIMIT ?
+        SELECT * FROM (
+            SELECT * FROM price_history
+            WHERE symbol = ?
+            ORDER BY timestamp DESC
+            LIMIT ?
+        )
+        ORDER BY timestamp ASC
     """
     
-    prices = db.fetch_all(query, (symbol, limit))
-    
-    if prices:
-        # Reverse to get oldest first (needed for calculations)
-        return list(reversed(prices))
-    
-    return []
+    return db.fetch_all(query, (symbol, limit)) or []
 
 
 def add_price_record(symbol, open_price, high_price, low_price, close_price, volume):
@@ -109,10 +183,96 @@ def add_price_record(symbol, open_price, high_price, low_price, close_price, vol
     Returns:
         int: Record ID if successful, None otherwise
     """
-    query = """
-        INSERT INTO price_history (symbol, timestamp, open_price, high_price, low_price, close_price, volume)
-        VALUES (?, datetime('now'), ?, ?, ?, ?, ?)
+    # Prices can arrive one at a time (streaming), so write through this
+    # thread's long-lived connection: its statement cache keeps
+    # ADD_PRICE_SQL prepared instead of re-parsing it on every call
+    connection = db.get_logging_conn()
+    if connection is None:
+        return None
+    
+    try:
+        with connection:
+            record_id = connection.execute(
+                ADD_PRICE_SQL,
+                (symbol, open_price, high_price, low_price, close_price, volume)
+            ).lastrowid
+    except sqlite3.Error as e:
+        print(f"❌ Query execution error: {e}")
+        return None
+    
+    # Keep the cached latest prices in step with the new price
+    if record_id:
+        _latest_price_cached.cache_clear()
+        
+        from services import order_execution_service
+        order_execution_service.update_cached_price(symbol, close_price)
+    
+    return record_id
+
+
+def add_price_records_bulk(rows, cursor=None):
     """
+    Add many price records at once (e.g. when backfilling history).
+    
+    All rows are written with one executemany in a single transaction,
+    which is much faster than calling add_price_record() per row.
+    Rows whose (symbol, timestamp) already exists are skipped.
     
-    return db.execute_query(query, (symbol, open_price, high_price, low_price, close_price, volume))
+    Args:
+        rows (list): Tuples of (symbol, timestamp, open_price, high_price,
+                     low_price, close_price, volume)
+        cursor: Cursor of an open db.transaction() to write in (optional).
+                The caller commits; errors are raised, not caught.
+    
+    Returns:
+        int: Number of inserted (new) rows, or None if the insert failed
+    """
+    return _insert_bulk(INSERT_PRICE_SQL, rows, cursor)
 
+
+def add_candles_bulk(rows, cursor=None):
+    """
+    Add many exchange candles at once (used by the price sync).
+    
+    Like add_price_records_bulk(), but timestamps are CCXT's integer
+    milliseconds - SQLite converts them to the timestamp column's text
+    format. A missing volume (None) is stored as 0.
+    
+    Args:
+        rows (list): Tuples of (symbol, timestamp_ms, open_price, high_price,
+                     low_price, close_price, volume)
+        cursor: Cursor of an open db.transaction() to write in (optional).
+                The caller commits; errors are raised, not caught.
+    
+    Returns:
+        int: Number of inserted (new) rows, or None if the insert failed
+    """
+    return _insert_bulk(INSERT_CANDLE_SQL, rows, cursor)
+
+
+def _insert_bulk(query, rows, cursor=None):
+    """
+    Run one of the bulk INSERT statements for all rows.
+    
+    Args:
+        query (str): INSERT_PRICE_SQL or INSERT_CANDLE_SQL
+        rows (list): Parameter tuples for the query
+        cursor: Cursor of an open db.transaction() (optional)
+    
+    Returns:
+        int: Number of inserted rows, or None if the insert failed
+    """
+    if not rows:
+        return 0
+    
+    if cursor is not None:
+        cursor.executemany(query, rows)
+        inserted = cursor.rowcount
+    else:
+        inserted = db.execute_many(query, rows)
+    
+    # Latest prices may have changed
+    if inserted:
+        _latest_price_cached.cache_clear()
+    
+    return inserted
@@ -31,11 +31,47 @@ Exchange (via CCXT) → This Service → Database → Platform Features
 """
 
 import ccxt
-from datetime import datetime
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from models import db
+from utils import log_setup
+from services import price_service
 
+# Optional: orjson parses the exchanges' JSON responses several times
+# faster than the standard json module (used as-is when not installed)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def sync_price_history_for_symbol(symbol, timeframe="1h", limit=200, exchange_name="binance"):
+
+# ============================================
+# LOGGING
+# ============================================
+# Progress messages propagate to the app's logging like every other
+# module. configure_logging() (called by app.py at startup) also writes
+# them to logs/price_sync.log through a queue (see utils/log_setup.py),
+# so a slow disk never holds up a sync (bulk syncs run for hundreds of
+# symbols).
+
+logger = logging.getLogger(__name__)
+
+
+def configure_logging(log_dir=None):
+    """
+    Also write this module's log messages to price_sync.log.
+    
+    Safe to call more than once.
+    
+    Args:
+        log_dir (str): Directory for the log file (default: config.LOG_DIR)
+    """
+    log_setup.add_log_file(logger, 'price_sync.log', log_dir)
+
+
+def sync_price_history_for_symbol(symbol, timeframe="1h", limit=200, exchange_name="binance", save=True):
     """
     Sync real OHLCV data from exchange into price_history table.
     
@@ -43,10 +79,10 @@ def sync_price_history_for_symbol(symbol, timeframe="1h", limit=200, exchange_na
     
     What This Does:
     ===============
-    1. Fetches recent candles from exchange (Binance/Bybit/OKX)
-    2. Checks which candles are already in database
-    3. Inserts new candles (avoids duplicates)
-    4. Updates database with real market data
+    1. Fetches candles newer than the latest stored one from exchange
+       (Binance/Bybit/OKX) - the most recent `limit` on the first sync
+    2. Inserts new candles (the database skips ones it already has)
+    3. Updates database with real market data
     
     Why This is Important:
     =====================
@@ -58,8 +94,11 @@ def sync_price_history_for_symbol(symbol, timeframe="1h", limit=200, exchange_na
     Args:
         symbol (str): Symbol to sync (e.g., "BTCUSDT")
         timeframe (str): Candle interval ("1m", "5m", "15m", "1h", "4h", "1d")
-        limit (int): Number of recent candles to fetch (default: 200)
+        limit (int): Maximum number of candles to fetch (default: 200)
         exchange_name (str): Which exchange to use (default: "binance")
+        save (bool): Write the candles to the database. With False the
+                     candles are returned as 'rows' (inserted/duplicates
+                     are None) so the caller can save many symbols at once.
     
     Returns:
         dict: Sync result with statistics
@@ -88,14 +127,10 @@ def sync_price_history_for_symbol(symbol, timeframe="1h", limit=200, exchange_na
         - "1d": Daily (for long-term analysis)
     """
     
-    print(f"\n{'='*70}")
-    print(f"SYNCING PRICE HISTORY")
-    print(f"{'='*70}")
-    print(f"Symbol: {symbol}")
-    print(f"Exchange: {exchange_name}")
-    print(f"Timeframe: {timeframe}")
-    print(f"Limit: {limit}")
-    print(f"{'='*70}\n")
+    logger.info(
+        "Syncing price history: symbol=%s exchange=%s timeframe=%s limit=%s",
+        symbol, exchange_name, timeframe, limit
+    )
     
     try:
         # Normalize symbol
@@ -106,8 +141,6 @@ def sync_price_history_for_symbol(symbol, timeframe="1h", limit=200, exchange_na
         # Step 1: Fetch Real Data from Exchange
         # ========================================
         
-        print(f"[1] Fetching real market data from {exchange_name}...")
-        
         # Get exchange client
         client = get_exchange_client_for_prices(exchange_name)
         
@@ -117,10 +150,28 @@ def sync_price_history_for_symbol(symbol, timeframe="1h", limit=200, exchange_na
                 'error': f'Failed to create {exchange_name} client'
             }
         
+        # Only ask for candles newer than the latest one we already have
+        # (a regular sync then downloads 1-2 candles instead of `limit`).
+        # since=None fetches the latest `limit` candles - used for a new
+        # symbol, or when more than `limit` candles are missing (otherwise
+        # we'd get old candles and the data would stay behind)
+        last_ms, last_close = _latest_stored_candle(symbol_db)
+        since = last_ms + 1 if last_ms is not None else None
+        
+        if since is not None:
+            timeframe_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+            if time.time() * 1000 - last_ms > limit * timeframe_ms:
+                since = None
+        
         # Fetch OHLCV candles from exchange
-        ohlcv_data = client.fetch_ohlcv(symbol_normalized, timeframe=timeframe, limit=limit)
+        ohlcv_data = client.fetch_ohlcv(symbol_normalized, timeframe=timeframe, since=since, limit=limit)
         
-        print(f"✅ Fetched {len(ohlcv_data)} candles from {exchange_name}")
+        logger.info("Fetched %d %s candles from %s", len(ohlcv_data), symbol, exchange_name)
+        
+        if not ohlcv_data and since is not None:
+            # Already up to date - nothing new since the last sync
+            return _sync_result(symbol, symbol_db, exchange_name, timeframe, 0, 0, last_close,
+                                rows=None if save else [])
         
         if not ohlcv_data:
             return {
@@ -129,102 +180,51 @@ def sync_price_history_for_symbol(symbol, timeframe="1h", limit=200, exchange_na
             }
         
         # ========================================
-        # Step 2: Check Existing Data in Database
+        # Step 2: Insert New Candles
         # ========================================
         
-        print(f"\n[2] Checking for existing data in database...")
-        
-        # Get existing timestamps for this symbol
-        query = """
-            SELECT timestamp FROM price_history
-            WHERE symbol = ?
-        """
-        
-        existing = db.fetch_all(query, (symbol_db,))
-        existing_timestamps = set()
+        # CCXT OHLCV format: [timestamp_ms, open, high, low, close, volume]
+        # The millisecond timestamp is stored as-is; SQLite formats it
+        new_rows = [
+            (symbol_db, candle[0], candle[1], candle[2], candle[3], candle[4], candle[5])
+            for candle in ohlcv_data
+        ]
         
-        if existing:
-            for row in existing:
-                existing_timestamps.add(row['timestamp'])
+        # Latest price for display
+        latest_price = float(ohlcv_data[-1][4])
         
-        print(f"   Found {len(existing_timestamps)} existing candles in database")
+        if not save:
+            # Caller saves the rows (sync_multiple_symbols)
+            return _sync_result(symbol, symbol_db, exchange_name, timeframe,
+                                len(ohlcv_data), None, latest_price, rows=new_rows)
         
-        # ========================================
-        # Step 3: Insert New Candles
-        # ========================================
-        
-        print(f"\n[3] Inserting new candles...")
+        # Candles already in the database are skipped by SQLite itself
+        # (UNIQUE (symbol, timestamp) index + INSERT OR IGNORE).
+        # Insert all candles in one transaction
+        inserted_count = price_service.add_candles_bulk(new_rows)
         
-        inserted_count = 0
-        duplicate_count = 0
-        
-        for candle in ohlcv_data:
-            # CCXT OHLCV format: [timestamp_ms, open, high, low, close, volume]
-            timestamp_ms = candle[0]
-            timestamp_str = datetime.fromtimestamp(timestamp_ms / 1000).strftime('%Y-%m-%d %H:%M:%S')
-            
-            open_price = float(candle[1])
-            high_price = float(candle[2])
-            low_price = float(candle[3])
-            close_price = float(candle[4])
-            volume = float(candle[5]) if candle[5] else 0
-            
-            # Check if this timestamp already exists
-            if timestamp_str in existing_timestamps:
-                duplicate_count += 1
-                continue
-            
-            # Insert new candle
-            query = """
-                INSERT INTO price_history 
-                (symbol, timestamp, open_price, high_price, low_price, close_price, volume)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """
-            
-            result = db.execute_query(query, (
-                symbol_db,
-                timestamp_str,
-                open_price,
-                high_price,
-                low_price,
-                close_price,
-                volume
-            ))
-            
-            if result:
-                inserted_count += 1
+        if inserted_count is None:
+            return {
+                'success': False,
+                'error': 'Failed to save candles to database'
+            }
         
         # ========================================
-        # Step 4: Report Results
+        # Step 3: Report Results
         # ========================================
         
-        print(f"\n✅ Sync Complete!")
-        print(f"   Fetched from exchange: {len(ohlcv_data)}")
-        print(f"   Inserted new candles: {inserted_count}")
-        print(f"   Duplicates skipped: {duplicate_count}")
-        
-        # Get latest price for display
-        latest_candle = ohlcv_data[-1]
-        latest_price = float(latest_candle[4])
+        result = _sync_result(symbol, symbol_db, exchange_name, timeframe,
+                              len(ohlcv_data), inserted_count, latest_price)
         
-        print(f"   Latest {symbol} price: ${latest_price:,.2f}")
-        print(f"{'='*70}\n")
+        logger.info(
+            "Sync complete for %s: fetched=%d inserted=%d duplicates=%d latest_price=%.2f",
+            symbol, result['fetched'], result['inserted'], result['duplicates'], latest_price
+        )
         
-        return {
-            'success': True,
-            'symbol': symbol,
-            'symbol_db': symbol_db,
-            'exchange': exchange_name,
-            'timeframe': timeframe,
-            'fetched': len(ohlcv_data),
-            'inserted': inserted_count,
-            'duplicates': duplicate_count,
-            'latest_price': latest_price,
-            'message': f'Synced {inserted_count} new candles for {symbol}'
-        }
+        return result
         
     except Exception as e:
-        print(f"❌ Error syncing price history: {e}")
+        logger.error("Error syncing price history for %s: %s", symbol, e)
         return {
             'success': False,
             'error': str(e),
@@ -236,17 +236,79 @@ def sync_price_history_for_symbol(symbol, timeframe="1h", limit=200, exchange_na
 # HELPER FUNCTIONS
 # ============================================
 
+def _latest_stored_candle(symbol_db):
+    """
+    Get the newest stored candle of a symbol.
+    
+    Args:
+        symbol_db (str): Symbol in database format (e.g., "BTCUSDT")
+    
+    Returns:
+        tuple: (timestamp in milliseconds, close price),
+               or (None, None) if the symbol has no candles yet
+    """
+    # Timestamps are stored as local time text (see INSERT_CANDLE_SQL);
+    # the 'utc' modifier turns them back into epoch seconds
+    query = """
+        SELECT CAST(strftime('%s', timestamp, 'utc') AS INTEGER) * 1000 AS timestamp_ms, close_price
+        FROM price_history
+        WHERE symbol = ?
+        ORDER BY timestamp DESC
+        LIMIT 1
+    """
+    row = db.fetch_one(query, (symbol_db,))
+    if not row or row['timestamp_ms'] is None:
+        return None, None
+    return row['timestamp_ms'], float(row['close_price'])
+
+
+def _sync_result(symbol, symbol_db, exchange_name, timeframe, fetched, inserted, latest_price, rows=None):
+    """Build the result dict of a successful sync (inserted=None: not saved yet)."""
+    result = {
+        'success': True,
+        'symbol': symbol,
+        'symbol_db': symbol_db,
+        'exchange': exchange_name,
+        'timeframe': timeframe,
+        'fetched': fetched,
+        'inserted': inserted,
+        'duplicates': None if inserted is None else fetched - inserted,
+        'latest_price': latest_price,
+        'message': f'Synced {inserted} new candles for {symbol}'
+    }
+    if rows is not None:
+        result['rows'] = rows
+    return result
+
+
+# One client per (thread, exchange), reused between calls: keeps the
+# HTTP connection and the loaded market list instead of rebuilding them
+# every sync. ccxt clients aren't thread-safe, so threads never share one.
+_thread_clients = threading.local()
+
+
 def get_exchange_client_for_prices(exchange_name="binance"):
     """
     Get ccxt exchange client for public market data.
     No API key required - public data only!
     
+    The client is created once per thread and exchange, then reused.
+    
     Args:
         exchange_name (str): Exchange to use
     
     Returns:
         ccxt.Exchange: Exchange client
     """
+    exchange_name = exchange_name.lower()
+    
+    clients = getattr(_thread_clients, 'clients', None)
+    if clients is None:
+        clients = _thread_clients.clients = {}
+    
+    client = clients.get(exchange_name)
+    if client is not None:
+        return client
     
     try:
         exchanges = {
@@ -257,15 +319,23 @@ def get_exchange_client_for_prices(exchange_name="binance"):
             'bingx': ccxt.bingx
         }
         
-        exchange_name = exchange_name.lower()
         ExchangeClass = exchanges.get(exchange_name, ccxt.binance)
         
-        return ExchangeClass({
+        client = ExchangeClass({
             'enableRateLimit': True  # Prevents rate limit bans
         })
         
+        # ccxt decodes every response with self.on_json_response(body);
+        # an instance attribute replaces it for this client only.
+        # (Numbers come back as floats, which is what OHLCV/tickers use.)
+        if orjson is not None:
+            client.on_json_response = orjson.loads
+        
+        clients[exchange_name] = client
+        return client
+        
     except Exception as e:
-        print(f"❌ Error creating exchange client: {e}")
+        logger.error("Error creating %s client: %s", exchange_name, e)
         return None
 
 
@@ -319,12 +389,52 @@ def sync_multiple_symbols(symbols, timeframe="1h", limit=200):
                 print(f"{symbol}: {result['inserted']} candles synced")
     """
     
-    results = {}
+    # Same order as `symbols`, filled in as each sync finishes
+    results = {symbol: None for symbol in symbols}
+    
+    if not symbols:
+        return results
     
-    for symbol in symbols:
-        print(f"\nSyncing {symbol}...")
-        result = sync_price_history_for_symbol(symbol, timeframe, limit)
-        results[symbol] = result
+    # Each fetch mostly waits on the exchange's HTTP response, so run them
+    # in parallel threads. Every thread uses its own ccxt client
+    # (clients are not thread-safe) with enableRateLimit on, and closes its
+    # database connections when its symbol is done.
+    with ThreadPoolExecutor(max_workers=min(8, len(symbols))) as pool:
+        futures = {
+            pool.submit(db.run_and_close_connections, sync_price_history_for_symbol,
+                        symbol, timeframe, limit, save=False): symbol
+            for symbol in symbols
+        }
+        
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                results[symbol] = future.result()
+            except Exception as e:
+                results[symbol] = {
+                    'success': False,
+                    'error': str(e)
+                }
+    
+    # Save every symbol's candles in ONE transaction (one commit/fsync in
+    # total). If anything fails, nothing is saved for any symbol.
+    fetched = [result for result in results.values() if result['success']]
+    try:
+        with db.transaction() as cursor:
+            for result in fetched:
+                inserted = price_service.add_candles_bulk(result.pop('rows'), cursor=cursor)
+                result['inserted'] = inserted
+                result['duplicates'] = result['fetched'] - inserted
+                result['message'] = f"Synced {inserted} new candles for {result['symbol']}"
+    except Exception as e:
+        logger.error("Error saving synced prices: %s", e)
+        for result in fetched:
+            result.clear()
+            result.update({
+                'success': False,
+                'error': str(e),
+                'message': 'Failed to save synced prices'
+            })
     
     return results
 
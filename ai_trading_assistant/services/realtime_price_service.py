@@ -8,28 +8,11 @@ PROVIDES: Real market data from exchanges via CCXT
 This is the CENTRAL price provider - all price queries should use this!
 """
 
-import ccxt
-from datetime import datetime
+import numpy as np
 from models import db
 
-
-# Get exchange client (existing service)
-def get_exchange_client_for_prices(exchange_name="binance"):
-    """
-    Get ccxt exchange client for public market data.
-    No API key required!
-    """
-    try:
-        exchanges = {
-            'binance': ccxt.binance,
-            'bybit': ccxt.bybit,
-            'okx': ccxt.okx
-        }
-        
-        ExchangeClass = exchanges.get(exchange_name.lower(), ccxt.binance)
-        return ExchangeClass({'enableRateLimit': True})
-    except:
-        return None
+# Get exchange client (existing service - cached per thread and exchange)
+from services.price_sync_service import get_exchange_client_for_prices
 
 
 def normalize_symbol(symbol_str):
@@ -78,11 +61,59 @@ def get_current_price(symbol, exchange_name="binance"):
     return float(result['close_price']) if result else 45000.00
 
 
+def get_current_prices(symbols, exchange_name="binance"):
+    """
+    Get REAL current market prices for several symbols at once.
+    
+    Uses: ONE fetch_tickers() request for all symbols (if the exchange
+    supports it) instead of one fetch_ticker() request per symbol
+    Fallback: get_current_price() for every symbol the batch didn't return
+    
+    Args:
+        symbols (list): e.g. ["BTCUSDT", "ETHUSDT"]
+        exchange_name (str): Exchange to ask
+    
+    Returns:
+        dict: {symbol: float price}, with the symbols as passed in
+    """
+    prices = {}
+    
+    try:
+        client = get_exchange_client_for_prices(exchange_name)
+        
+        if client and client.has.get('fetchTickers') and len(symbols) > 1:
+            symbols_norm = {symbol: normalize_symbol(symbol) for symbol in symbols}
+            tickers = client.fetch_tickers(list(set(symbols_norm.values())))
+            
+            for symbol, symbol_norm in symbols_norm.items():
+                last = (tickers.get(symbol_norm) or {}).get('last')
+                if last:
+                    prices[symbol] = float(last)
+    except:
+        # e.g. one unknown symbol fails the whole batch - the loop
+        # below then asks for each symbol on its own
+        pass
+    
+    for symbol in symbols:
+        if symbol not in prices:
+            prices[symbol] = get_current_price(symbol, exchange_name)
+    
+    return prices
+
+
 def get_recent_ohlcv(symbol, timeframe="1h", limit=100, exchange_name="binance"):
     """
     Get recent OHLCV candles from exchange.
     
-    Returns: List of dicts with timestamp, open, high, low, close, volume
+    The candles come back as columns (one NumPy array per field) instead
+    of one dict per candle, so indicator/feature code can use them
+    directly. Format timestamps only when displaying them, e.g.
+    datetime.fromtimestamp(candles['timestamp_ms'][i] / 1000).
+    
+    Returns:
+        dict: {'timestamp_ms': int64 array, 'open': array, 'high': array,
+               'low': array, 'close': array, 'volume': array} (oldest first),
+              or {} if the exchange could not be reached
     """
     try:
         symbol_norm = normalize_symbol(symbol)
@@ -91,23 +122,23 @@ def get_recent_ohlcv(symbol, timeframe="1h", limit=100, exchange_name="binance")
         if client:
             ohlcv = client.fetch_ohlcv(symbol_norm, timeframe=timeframe, limit=limit)
             
-            candles = []
-            for c in ohlcv:
-                candles.append({
-                    'timestamp': datetime.fromtimestamp(c[0]/1000).strftime('%Y-%m-%d %H:%M:%S'),
-                    'open': float(c[1]),
-                    'high': float(c[2]),
-                    'low': float(c[3]),
-                    'close': float(c[4]),
-                    'volume': float(c[5]) if c[5] else 0
-                })
+            # Rows are [timestamp, open, high, low, close, volume]
+            arr = np.asarray(ohlcv, dtype=np.float64).reshape(-1, 6)
             
-            return candles
+            return {
+                'timestamp_ms': arr[:, 0].astype(np.int64),
+                'open': arr[:, 1],
+                'high': arr[:, 2],
+                'low': arr[:, 3],
+                'close': arr[:, 4],
+                # Missing volume (None → NaN) counts as 0
+                'volume': np.nan_to_num(arr[:, 5]),
+            }
     except Exception as e:
         print(f"OHLCV fetch error: {e}")
     
     # Fallback to database
-    return []
+    return {}
 
 
 # Test function
@@ -0,0 +1,125 @@
+"""
+Symbol Conversion Service
+Translates between the two symbol formats used in this project.
+
+- Database format:  "BTCUSDT"   (price_history, grid_bots, ...)
+- Exchange format:  "BTC/USDT"  (CCXT)
+
+Why not just symbol.replace('USDT', '/USDT')?
+---------------------------------------------
+That only works for USDT pairs and breaks on symbols like "USDTUSDC"
+(→ "/USDTUSDC"). Here, conversions come from the exchange's own market
+list when it has been loaded, and otherwise from a list of known quote
+currencies. Guessed conversions are remembered (the most recent
+SYMBOL_CACHE_SIZE of them), so repeated lookups are a dictionary access.
+"""
+
+import threading
+from functools import lru_cache
+
+
+# Quote currencies used when no market list is available.
+# Sorted longest first, so a longer quote wins over a shorter one that
+# is its ending (the list can then be extended in any order).
+KNOWN_QUOTES = tuple(sorted(
+    ('FDUSD', 'USDT', 'USDC', 'BUSD', 'TUSD', 'EUR', 'TRY', 'BTC', 'ETH', 'BNB'),
+    key=len, reverse=True
+))
+
+# How many guessed (not from a market list) conversions to remember.
+# Symbols can come from user input, so this must not grow forever.
+SYMBOL_CACHE_SIZE = 4096
+
+_lock = threading.Lock()
+
+# Filled from load_markets() output only (all exchanges share one map),
+# so their size is bounded by the exchanges' market lists
+_to_exchange = {}   # "BTCUSDT"  -> "BTC/USDT"
+_to_db = {}         # "BTC/USDT" -> "BTCUSDT"
+
+# Exchanges whose markets were already registered
+_registered_exchanges = set()
+
+
+def register_markets(exchange_name, markets):
+    """
+    Add an exchange's markets to the symbol maps (once per exchange).
+    
+    Args:
+        exchange_name (str): Exchange the markets came from (e.g., "binance")
+        markets (dict): client.markets after client.load_markets()
+    """
+    if not markets or exchange_name in _registered_exchanges:
+        return
+    
+    with _lock:
+        for exchange_symbol, market in markets.items():
+            # Only plain spot symbols ("BTC/USDT", not "BTC/USDT:USDT")
+            if ':' in exchange_symbol or '/' not in exchange_symbol:
+                continue
+            db_symbol = f"{market.get('base', '')}{market.get('quote', '')}"
+            if db_symbol:
+                _to_exchange.setdefault(db_symbol, exchange_symbol)
+                _to_db.setdefault(exchange_symbol, db_symbol)
+    
+        _registered_exchanges.add(exchange_name)
+
+
+def to_exchange(db_symbol):
+    """
+    Convert a database symbol to CCXT format.
+    
+    Args:
+        db_symbol (str): e.g., "BTCUSDT"
+    
+    Returns:
+        str: e.g., "BTC/USDT" (unchanged if it already contains "/")
+    
+    Example:
+        to_exchange("ETHBTC")    → "ETH/BTC"
+        to_exchange("USDTUSDC")  → "USDT/USDC"
+    """
+    exchange_symbol = _to_exchange.get(db_symbol)
+    if exchange_symbol is not None:
+        return exchange_symbol
+    
+    return _guess_exchange_symbol(db_symbol)
+
+
+@lru_cache(maxsize=SYMBOL_CACHE_SIZE)
+def _guess_exchange_symbol(db_symbol):
+    """
+    Convert a database symbol to CCXT format using KNOWN_QUOTES.
+    
+    Args:
+        db_symbol (str): e.g., "BTCUSDT"
+    
+    Returns:
+        str: e.g., "BTC/USDT" (unchanged if it contains "/" or has no known quote)
+    """
+    if '/' in db_symbol:
+        return db_symbol
+    
+    for quote in KNOWN_QUOTES:
+        if db_symbol.endswith(quote) and len(db_symbol) > len(quote):
+            return f"{db_symbol[:-len(quote)]}/{quote}"
+    
+    return db_symbol
+
+
+def to_db(exchange_symbol):
+    """
+    Convert a CCXT symbol to database format.
+    
+    Args:
+        exchange_symbol (str): e.g., "BTC/USDT"
+    
+    Returns:
+        str: e.g., "BTCUSDT"
+    """
+    db_symbol = _to_db.get(exchange_symbol)
+    if db_symbol is not None:
+        return db_symbol
+    
+    # Not a registered market: removing "/" is all there is to do
+    return exchange_symbol.replace('/', '')
@@ -25,12 +25,167 @@ Created: 2025-11-13
 
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.ensemble import HistGradientBoostingClassifier, HistGradientBoostingRegressor
+from sklearn.inspection import permutation_importance
 from sklearn.metrics import accuracy_score, classification_report, mean_absolute_error
 import joblib
+import hashlib
 import os
+import time
+
+
+# Optional: Numba compiles the feature kernel below to machine code.
+# Without it the same function runs as plain Python (slower, same result).
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Optional: pyarrow lets the training cache use Parquet (zstd-compressed).
+# Without it the cache is a pandas pickle instead.
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+# Columns produced by _features(), in the order they are added to the DataFrame
+FEATURE_KERNEL_COLUMNS = [
+    'return_1h', 'return_3h', 'return_6h', 'return_12h', 'return_24h',
+    'volatility_24h',
+    'rsi', 'macd', 'ma_ratio',
+    'volume_change',
+    'high_24h', 'low_24h', 'price_position'
+]
+
+# Lookbacks for return_1h ... return_24h
+RETURN_LAGS = (1, 3, 6, 12, 24)
+
+# Features the models are trained on (same order when predicting)
+TRAINING_FEATURES = [
+    'return_1h', 'return_3h', 'return_6h', 'return_12h', 'return_24h',
+    'volatility_24h',
+    'rsi', 'macd', 'ma_ratio',
+    'volume_change',
+    'price_position'
+]
+
+# Training data (features + targets) is cached on disk so reruns (e.g.
+# while tuning the models) skip both the exchange download and
+# build_features(). A cache older than this is rebuilt.
+TRAINING_CACHE_MAX_AGE = 3600  # seconds
+TRAINING_CACHE_DIR = os.path.join(os.path.dirname(__file__), 'models', 'cache')
+
+
+def _window_mean(values, end, window):
+    """Mean of values[end - window + 1 : end + 1]."""
+    total = 0.0
+    for k in range(end - window + 1, end + 1):
+        total += values[k]
+    return total / window
+
+
+def _features(close, high, low, volume):
+    """
+    Compute all feature columns in one pass over the price arrays.
+    
+    Same numbers as the pandas version (pct_change, rolling, ewm) but
+    without building an intermediate Series for every step.
+    
+    Args:
+        close, high, low, volume (np.ndarray): OHLCV columns, oldest first
+    
+    Returns:
+        np.ndarray: Shape (n, 13), columns as in FEATURE_KERNEL_COLUMNS
+                    (NaN where there isn't enough history yet)
+    """
+    n = close.shape[0]
+    out = np.full((n, 13), np.nan)
+    if n == 0:
+        return out
+    
+    # Price returns: close / close N bars ago - 1
+    for j in range(5):
+        lag = RETURN_LAGS[j]
+        for i in range(lag, n):
+            out[i, j] = close[i] / close[i - lag] - 1.0
+    
+    # Volatility: std (ddof=1) of the last 24 one-bar returns
+    for i in range(24, n):
+        mean = 0.0
+        for k in range(i - 23, i + 1):
+            mean += out[k, 0]
+        mean /= 24.0
+        variance = 0.0
+        for k in range(i - 23, i + 1):
+            diff = out[k, 0] - mean
+            variance += diff * diff
+        out[i, 5] = (variance / 23.0) ** 0.5
+    
+    # RSI (14): average gain / average loss of the last 14 price changes
+    # (the first bar has no change and counts as 0, like pandas' where())
+    gains = np.zeros(n)
+    losses = np.zeros(n)
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        if delta > 0:
+            gains[i] = delta
+        elif delta < 0:
+            losses[i] = -delta
+    for i in range(13, n):
+        rs = _window_mean(gains, i, 14) / _window_mean(losses, i, 14)
+        out[i, 6] = 100.0 - (100.0 / (1.0 + rs))
+    
+    # MACD: EMA 12 - EMA 26 (ema[i] = alpha * x[i] + (1 - alpha) * ema[i-1])
+    alpha12 = 2.0 / 13.0
+    alpha26 = 2.0 / 27.0
+    ema12 = close[0]
+    ema26 = close[0]
+    out[0, 7] = 0.0
+    for i in range(1, n):
+        ema12 = alpha12 * close[i] + (1.0 - alpha12) * ema12
+        ema26 = alpha26 * close[i] + (1.0 - alpha26) * ema26
+        out[i, 7] = ema12 - ema26
+    
+    # Moving average ratio: MA 20 / MA 50
+    for i in range(49, n):
+        out[i, 8] = _window_mean(close, i, 20) / _window_mean(close, i, 50)
+    
+    # Volume change vs previous bar
+    for i in range(1, n):
+        out[i, 9] = volume[i] / volume[i - 1] - 1.0
+    
+    # 24-bar high/low and where the close sits between them
+    for i in range(23, n):
+        highest = high[i]
+        lowest = low[i]
+        for k in range(i - 23, i):
+            if high[k] > highest:
+                highest = high[k]
+            if low[k] < lowest:
+                lowest = low[k]
+        out[i, 10] = highest
+        out[i, 11] = lowest
+        out[i, 12] = (close[i] - lowest) / (highest - lowest)
+    
+    return out
+
+
+if njit is not None:
+    # error_model='numpy': division by zero gives inf/NaN (like pandas)
+    _window_mean = njit(cache=True)(_window_mean)
+    _features = njit(cache=True, error_model='numpy')(_features)
+
+
+def _compute_feature_columns(df: pd.DataFrame) -> np.ndarray:
+    """Run _features() on the DataFrame's OHLCV columns."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _features(
+            df['close'].to_numpy(dtype=np.float64),
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['volume'].to_numpy(dtype=np.float64)
+        )
 
 
 def compute_simple_indicators(df: pd.DataFrame) -> pd.DataFrame:
@@ -48,27 +203,10 @@ def compute_simple_indicators(df: pd.DataFrame) -> pd.DataFrame:
         - MACD: Trend indicator (difference of moving averages)
         - MA_ratio: Trend strength (fast MA / slow MA)
     """
-    prices = df['close']
-    
-    # RSI (14-period)
-    # Measures momentum - how fast price is moving
-    delta = prices.diff()
-    gain = delta.where(delta > 0, 0).rolling(window=14).mean()
-    loss = -delta.where(delta < 0, 0).rolling(window=14).mean()
-    rs = gain / loss
-    df['rsi'] = 100 - (100 / (1 + rs))
-    
-    # MACD (12,26)
-    # Shows trend changes
-    ema12 = prices.ewm(span=12, adjust=False).mean()
-    ema26 = prices.ewm(span=26, adjust=False).mean()
-    df['macd'] = ema12 - ema26
-    
-    # Moving Average Ratio (20 / 50)
-    # > 1 = uptrend, < 1 = downtrend
-    ma20 = prices.rolling(window=20).mean()
-    ma50 = prices.rolling(window=50).mean()
-    df['ma_ratio'] = ma20 / ma50
+    values = _compute_feature_columns(df)
+    
+    for column in ('rsi', 'macd', 'ma_ratio'):
+        df[column] = values[:, FEATURE_KERNEL_COLUMNS.index(column)]
     
     return df
 
@@ -100,53 +238,16 @@ def build_features(df: pd.DataFrame) -> pd.DataFrame:
         4. Volume:
            - volume_change: Trading activity change
            - High volume = strong conviction
-    """
-    # ========================================
-    # 1. Price Returns (Past Performance)
-    # ========================================
-    # Return = (New Price - Old Price) / Old Price
-    # Positive return = price went up
-    # Negative return = price went down
-    
-    df['return_1h'] = df['close'].pct_change(1)     # 1 hour ago
-    df['return_3h'] = df['close'].pct_change(3)     # 3 hours ago
-    df['return_6h'] = df['close'].pct_change(6)     # 6 hours ago
-    df['return_12h'] = df['close'].pct_change(12)   # 12 hours ago
-    df['return_24h'] = df['close'].pct_change(24)   # 24 hours ago
-    
-    # ========================================
-    # 2. Volatility (Price Fluctuation)
-    # ========================================
-    # Standard deviation of returns over last 24 periods
-    # High volatility = price swings a lot (risky but profitable)
-    # Low volatility = price stable (safer but less opportunity)
-    
-    df['volatility_24h'] = df['return_1h'].rolling(window=24).std()
-    
-    # ========================================
-    # 3. Technical Indicators
-    # ========================================
-    # Add RSI, MACD, MA ratio
-    df = compute_simple_indicators(df)
-    
-    # ========================================
-    # 4. Volume Features
-    # ========================================
-    # Volume change = (Current Volume - Previous Volume) / Previous Volume
-    # Positive = more trading activity (interest increasing)
-    # Negative = less trading activity (interest decreasing)
-    
-    df['volume_change'] = df['volume'].pct_change(1)
+        
+        5. Price Position:
+           - Where the close is between the 24-bar high and low
     
-    # ========================================
-    # 5. Price Position Features
-    # ========================================
-    # Where is current price relative to recent high/low?
-    # Close to high = strong, close to low = weak
+    All columns are computed in one pass by _features().
+    """
+    values = _compute_feature_columns(df)
     
-    df['high_24h'] = df['high'].rolling(window=24).max()
-    df['low_24h'] = df['low'].rolling(window=24).min()
-    df['price_position'] = (df['close'] - df['low_24h']) / (df['high_24h'] - df['low_24h'])
+    for j, column in enumerate(FEATURE_KERNEL_COLUMNS):
+        df[column] = values[:, j]
     
     return df
 
@@ -190,6 +291,68 @@ def build_targets(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def _training_cache_path(symbol, timeframe, since_days):
+    """
+    File the training data for these settings is cached in.
+    
+    The name includes a hash of the feature columns, so changing the
+    features automatically uses a new cache file.
+    
+    Args:
+        symbol (str): e.g., "BTC/USDT"
+        timeframe (str): Candle interval (e.g., "1h")
+        since_days (int): Days of history
+    
+    Returns:
+        str: Path of the cache file
+    """
+    columns = ",".join(FEATURE_KERNEL_COLUMNS + TRAINING_FEATURES)
+    feature_hash = hashlib.sha1(columns.encode()).hexdigest()[:12]
+    extension = 'parquet' if pyarrow is not None else 'pkl'
+    name = f"{symbol.replace('/', '')}_{timeframe}_{since_days}d_{feature_hash}.{extension}"
+    return os.path.join(TRAINING_CACHE_DIR, name)
+
+
+def _load_training_cache(cache_path):
+    """
+    Load cached training data if the cache file is fresh.
+    
+    Args:
+        cache_path (str): From _training_cache_path()
+    
+    Returns:
+        DataFrame: Feature and target columns, or None if there is no
+                   fresh cache
+    """
+    try:
+        if os.path.getmtime(cache_path) < time.time() - TRAINING_CACHE_MAX_AGE:
+            return None
+        if cache_path.endswith('.parquet'):
+            return pd.read_parquet(cache_path)
+        return pd.read_pickle(cache_path)
+    except Exception:
+        # Missing or unreadable cache - just rebuild it
+        return None
+
+
+def _save_training_cache(df, cache_path):
+    """
+    Write training data to the cache (failures are only reported).
+    
+    Args:
+        df (DataFrame): Feature and target columns
+        cache_path (str): From _training_cache_path()
+    """
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        if cache_path.endswith('.parquet'):
+            df.to_parquet(cache_path, compression='zstd')
+        else:
+            df.to_pickle(cache_path)
+    except Exception as e:
+        print(f"   ⚠️ Could not write training cache: {e}")
+
+
 def train_models():
     """
     Main function to train ML models
@@ -207,100 +370,99 @@ def train_models():
     print("TRAINING ADVANCED AI PREDICTION MODELS")
     print("="*70)
     
-    # ========================================
-    # Step 1: Fetch Historical Data
-    # ========================================
-    print("\n[1/6] Fetching historical price data...")
-    
-    from services.advanced_data_service import AdvancedDataService
-    
-    data_service = AdvancedDataService()
-    
-    # Get 90 days of hourly BTC data (90 * 24 = 2160 data points)
-    # More data = better training
-    df = data_service.get_ohlcv('BTC/USDT', timeframe='1h', since_days=90)
-    
-    print(f"   ✅ Fetched {len(df)} candles (90 days)")
-    
-    if len(df) < 200:
-        print("   ❌ Not enough data for training (need at least 200 candles)")
-        return
-    
-    # ========================================
-    # Step 2: Engineer Features
-    # ========================================
-    print("\n[2/6] Engineering features...")
-    
-    df = build_features(df)
-    df = build_targets(df)
-    
-    # Remove rows with NaN values (from rolling calculations and shifts)
-    df = df.dropna()
-    
-    print(f"   ✅ Created features, {len(df)} valid samples")
+    # Features + targets from a recent run are reused (see TRAINING_CACHE_MAX_AGE)
+    cache_path = _training_cache_path('BTC/USDT', '1h', 90)
+    feature_columns = TRAINING_FEATURES
+    df = _load_training_cache(cache_path)
+    
+    if df is not None:
+        print(f"\n[1-2/6] Loaded {len(df)} cached training samples ({cache_path})")
+    else:
+        # ========================================
+        # Step 1: Fetch Historical Data
+        # ========================================
+        print("\n[1/6] Fetching historical price data...")
+        
+        from services.advanced_data_service import AdvancedDataService
+        
+        data_service = AdvancedDataService()
+        
+        # Get 90 days of hourly BTC data (90 * 24 = 2160 data points)
+        # More data = better training
+        df = data_service.get_ohlcv('BTC/USDT', timeframe='1h', since_days=90)
+        
+        print(f"   ✅ Fetched {len(df)} candles (90 days)")
+        
+        if len(df) < 200:
+            print("   ❌ Not enough data for training (need at least 200 candles)")
+            return
+        
+        # ========================================
+        # Step 2: Engineer Features
+        # ========================================
+        print("\n[2/6] Engineering features...")
+        
+        df = build_features(df)
+        df = build_targets(df)
+        
+        # Remove rows with NaN values (from rolling calculations and shifts)
+        df = df.dropna()
+        
+        print(f"   ✅ Created features, {len(df)} valid samples")
+        
+        # Only the columns training needs are cached
+        df = df[feature_columns + ['direction', 'next_return']]
+        _save_training_cache(df, cache_path)
     
     # ========================================
     # Step 3: Prepare Data for Training
     # ========================================
     print("\n[3/6] Preparing training data...")
     
-    # Select feature columns
-    feature_columns = [
-        'return_1h', 'return_3h', 'return_6h', 'return_12h', 'return_24h',
-        'volatility_24h',
-        'rsi', 'macd', 'ma_ratio',
-        'volume_change',
-        'price_position'
-    ]
-    
-    X = df[feature_columns].values  # Features (input)
-    y_direction = df['direction'].values  # Target: UP (1) or DOWN (0)
-    y_return = df['next_return'].values  # Target: Return magnitude
+    # float32 is plenty for features (the models bin them anyway) and
+    # halves the memory the training loops have to read
+    X = df[feature_columns].to_numpy(dtype=np.float32)  # Features (input)
+    y_direction = df['direction'].to_numpy(dtype=np.int8)  # Target: UP (1) or DOWN (0)
+    y_return = df['next_return'].to_numpy(dtype=np.float32)  # Target: Return magnitude
     
-    # Split into train (80%) and test (20%)
+    # Split into train (first 80%) and test (last 20%)
     # Train: Used to teach the model
     # Test: Used to check if model learned correctly
-    X_train, X_test, y_dir_train, y_dir_test, y_ret_train, y_ret_test = train_test_split(
-        X, y_direction, y_return,
-        test_size=0.2,  # 20% for testing
-        random_state=42  # Fixed seed for reproducibility
-    )
+    # The split is chronological (no shuffling): the model is tested on
+    # candles that come AFTER everything it was trained on, like in real
+    # use, and the slices are views - no copy of X is made.
+    split = int(len(X) * 0.8)
+    X_train, X_test = X[:split], X[split:]
+    y_dir_train, y_dir_test = y_direction[:split], y_direction[split:]
+    y_ret_train, y_ret_test = y_return[:split], y_return[split:]
     
     print(f"   ✅ Train samples: {len(X_train)}")
     print(f"   ✅ Test samples: {len(X_test)}")
     
-    # ========================================
-    # Step 4: Scale Features (Normalization)
-    # ========================================
-    # ML models work better when all features are on similar scale
-    # StandardScaler: transforms features to have mean=0, std=1
-    
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
-    
-    print(f"   ✅ Features normalized")
+    # No feature scaling needed: histogram boosting only compares each
+    # feature against split points, so mean/std don't matter
     
     # ========================================
-    # Step 5: Train Direction Model (Classification)
+    # Step 4: Train Direction Model (Classification)
     # ========================================
     print("\n[4/6] Training direction model (UP/DOWN)...")
     
-    # RandomForestClassifier: Ensemble of decision trees
-    # Each tree votes, majority wins
-    # Good for non-linear patterns
+    # HistGradientBoostingClassifier: Trees built one after another,
+    # each one fixing the mistakes of the previous ones.
+    # Features are first binned into 256 buckets, which makes training
+    # much faster than a Random Forest on data of this size.
     
-    direction_model = RandomForestClassifier(
-        n_estimators=100,  # 100 trees in the forest
-        max_depth=10,      # Prevent overfitting
-        random_state=42,
-        n_jobs=-1          # Use all CPU cores
+    direction_model = HistGradientBoostingClassifier(
+        max_iter=200,        # Up to 200 boosting rounds (trees)
+        max_depth=8,         # Prevent overfitting
+        learning_rate=0.05,  # Small steps = more robust
+        random_state=42
     )
     
-    direction_model.fit(X_train_scaled, y_dir_train)
+    direction_model.fit(X_train, y_dir_train)
     
     # Evaluate on test set
-    y_dir_pred = direction_model.predict(X_test_scaled)
+    y_dir_pred = direction_model.predict(X_test)
     direction_accuracy = accuracy_score(y_dir_test, y_dir_pred)
     
     print(f"   ✅ Direction Model Accuracy: {direction_accuracy*100:.2f}%")
@@ -308,30 +470,30 @@ def train_models():
     print(classification_report(y_dir_test, y_dir_pred, target_names=['DOWN', 'UP']))
     
     # ========================================
-    # Step 6: Train Return Model (Regression)
+    # Step 5: Train Return Model (Regression)
     # ========================================
     print("\n[5/6] Training return magnitude model...")
     
-    # RandomForestRegressor: Predicts continuous values
+    # HistGradientBoostingRegressor: Predicts continuous values
     # Instead of UP/DOWN, predicts actual % change
     
-    return_model = RandomForestRegressor(
-        n_estimators=100,
-        max_depth=10,
-        random_state=42,
-        n_jobs=-1
+    return_model = HistGradientBoostingRegressor(
+        max_iter=200,
+        max_depth=8,
+        learning_rate=0.05,
+        random_state=42
     )
     
-    return_model.fit(X_train_scaled, y_ret_train)
+    return_model.fit(X_train, y_ret_train)
     
     # Evaluate on test set
-    y_ret_pred = return_model.predict(X_test_scaled)
+    y_ret_pred = return_model.predict(X_test)
     mae = mean_absolute_error(y_ret_test, y_ret_pred)
     
     print(f"   ✅ Return Model MAE: {mae*100:.3f}% (average error)")
     
     # ========================================
-    # Step 7: Save Models to Disk
+    # Step 6: Save Models to Disk
     # ========================================
     print("\n[6/6] Saving models...")
     
@@ -346,7 +508,11 @@ def train_models():
     
     joblib.dump(direction_model, direction_model_path)
     joblib.dump(return_model, return_model_path)
-    joblib.dump(scaler, scaler_path)  # Save scaler too!
+    
+    # These models use raw features - remove a scaler left by older
+    # (Random Forest) training runs so it can't be applied by mistake
+    if os.path.exists(scaler_path):
+        os.remove(scaler_path)
     
     # Save feature columns list (need same order when predicting)
     feature_info = {
@@ -354,7 +520,8 @@ def train_models():
         'train_size': len(X_train),
         'test_size': len(X_test),
         'direction_accuracy': direction_accuracy,
-        'return_mae': mae
+        'return_mae': mae,
+        'scaling': 'none'  # Features go into the models unscaled
     }
     
     feature_info_path = os.path.join(models_dir, 'feature_info.joblib')
@@ -362,7 +529,6 @@ def train_models():
     
     print(f"   ✅ Direction model saved: {direction_model_path}")
     print(f"   ✅ Return model saved: {return_model_path}")
-    print(f"   ✅ Scaler saved: {scaler_path}")
     print(f"   ✅ Feature info saved: {feature_info_path}")
     
     # ========================================
@@ -386,13 +552,16 @@ def train_models():
     # Feature Importance (Bonus)
     # ========================================
     print("\n📈 Top 5 Most Important Features (Direction Model):")
-    feature_importance = pd.DataFrame({
-        'feature': feature_columns,
-        'importance': direction_model.feature_importances_
-    }).sort_values('importance', ascending=False)
+    # Permutation importance: how much accuracy drops when one feature's
+    # values are shuffled (boosting models have no feature_importances_)
+    importance = permutation_importance(
+        direction_model, X_test, y_dir_test, n_repeats=5, random_state=42
+    )
+    importances = importance.importances_mean
     
-    for i, row in feature_importance.head(5).iterrows():
-        print(f"   {row['feature']:20} {row['importance']:.4f}")
+    # Indices of the 5 largest importances, biggest first
+    for i in np.argsort(importances)[::-1][:5]:
+        print(f"   {feature_columns[i]:20} {importances[i]:.4f}")
     
     print("\n")
 
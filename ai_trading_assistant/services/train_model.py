@@ -11,40 +11,529 @@ The model uses basic technical indicators to make predictions:
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 import joblib
+import hashlib
+import importlib.util
 import os
+import threading
+import time
+from functools import lru_cache
 
 
-def train_model(data_path='data/sample_prices.csv', model_path='services/model.joblib'):
+# joblib compression for the saved model: lz4 (fast) when the lz4 package
+# is installed, otherwise zlib (built into Python), both at level 3.
+# joblib imports lz4 itself - here we only check that it is available.
+if importlib.util.find_spec('lz4') is not None:
+    MODEL_COMPRESSION = ('lz4', 3)
+else:
+    MODEL_COMPRESSION = ('zlib', 3)
+
+# Optional: Numba compiles the rolling-window kernel below to machine code.
+# Without it pandas rolling() is used instead (see _rolling_features()) -
+# the kernel as plain Python would be much slower than pandas.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _rolling_sma_std(close, ret, window, out_sma, out_std):
     """
-    Train a machine learning model to predict price movements.
+    Rolling mean of close and rolling std of returns in ONE pass.
+    
+    Each row re-reads its own (small) window instead of keeping running
+    sums: a NaN or inf then only affects the windows it is in, exactly
+    like pandas rolling() - running sums would stay NaN for good after
+    the first NaN (NaN - NaN is NaN).
     
     Args:
-        data_path (str): Path to CSV file with price data
-        model_path (str): Path to save the trained model
+        close (np.ndarray): Close prices, oldest first
+        ret (np.ndarray): Returns (ret[0] is NaN - no previous close)
+        window (int): Window size (5 in train_model)
+        out_sma (np.ndarray): Filled from index window-1 (NaN before)
+        out_std (np.ndarray): Filled from index window (NaN before);
+                              sample std (ddof=1) like pandas
+    """
+    n = close.shape[0]
+    
+    for i in range(window - 1, n):
+        # Mean of the last `window` closes - NaN if one of them is NaN
+        # or infinite (pandas gives NaN for an inf in the window too)
+        total = 0.0
+        for j in range(i - window + 1, i + 1):
+            total += close[j]
+        out_sma[i] = total / window if np.isfinite(total) else np.nan
+        
+        # Returns start at index 1, so the first full window ends at `window`
+        if i >= window:
+            total = 0.0
+            for j in range(i - window + 1, i + 1):
+                total += ret[j]
+            mean = total / window
+            
+            # Two-pass variance: never negative, NaN stays NaN
+            squares = 0.0
+            for j in range(i - window + 1, i + 1):
+                squares += (ret[j] - mean) * (ret[j] - mean)
+            out_std[i] = (squares / (window - 1)) ** 0.5
+
+
+if njit is not None:
+    _rolling_sma_std = njit(cache=True)(_rolling_sma_std)
+
+
+def _rolling_features(close, ret, window):
+    """
+    Rolling mean of close and rolling std (ddof=1) of returns.
+    
+    Uses the compiled _rolling_sma_std() kernel when Numba is installed,
+    otherwise pandas rolling() (same results).
+    
+    Args:
+        close (np.ndarray): Close prices, oldest first
+        ret (np.ndarray): Returns (ret[0] is NaN - no previous close)
+        window (int): Window size
     
     Returns:
-        tuple: (model, scaler, accuracy) - The trained model, scaler, and accuracy score
+        tuple: (sma, std) arrays, NaN where the window isn't full yet
     """
-    print("=" * 70)
-    print("AI TRADING MODEL TRAINING")
-    print("=" * 70)
+    if njit is None:
+        sma = pd.Series(close).rolling(window).mean().to_numpy()
+        std = pd.Series(ret).rolling(window).std().to_numpy()
+        return sma, std
+    
+    sma = np.full(close.shape[0], np.nan)
+    std = np.full(close.shape[0], np.nan)
+    _rolling_sma_std(close, np.ascontiguousarray(ret), window, sma, std)
+    return sma, std
+
+
+# Optional: skl2onnx + onnxruntime. The trained forest is converted to
+# ONNX, whose compiled tree walker predicts much faster than sklearn.
+# Without them everything uses model.predict() as before.
+try:
+    import onnxruntime
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+except ImportError:
+    onnxruntime = None
+
+
+def _export_onnx(model, X_check, onnx_path):
+    """
+    Save the model in ONNX format and open it with ONNX Runtime (only if it predicts the same).
     
-    # ========================================
-    # STEP 1: Load Data
-    # ========================================
-    print("\n[Step 1] Loading price data...")
+    Args:
+        model: Trained RandomForestClassifier
+        X_check (np.ndarray): Rows used to compare ONNX with sklearn
+        onnx_path (str): Where to save the .onnx file
     
-    if not os.path.exists(data_path):
-        print(f"❌ Error: Data file not found at {data_path}")
-        print(f"   Please create sample data first.")
-        return None, None, None
+    Returns:
+        onnxruntime.InferenceSession, or None if ONNX isn't available
+        or doesn't match sklearn
+    """
+    if onnxruntime is None:
+        return None
+    
+    try:
+        # zipmap=False: probabilities come back as a plain array
+        onnx_model = convert_sklearn(
+            model,
+            initial_types=[('X', FloatTensorType([None, X_check.shape[1]]))],
+            options={id(model): {'zipmap': False}}
+        )
+        onnx_bytes = onnx_model.SerializeToString()
+        session = onnxruntime.InferenceSession(onnx_bytes, providers=['CPUExecutionProvider'])
+        
+        # ONNX compares features as float32 - a split right at a
+        # threshold can go the other way. Never serve predictions that
+        # differ from the model we evaluated.
+        proba = session.run(None, {'X': np.asarray(X_check, dtype=np.float32)})[1]
+        if not np.allclose(proba, model.predict_proba(X_check), atol=1e-5):
+            print("⚠️ ONNX conversion doesn't reproduce the model's predictions - not used")
+            return None
+        
+        os.makedirs(os.path.dirname(onnx_path) or '.', exist_ok=True)
+        with open(onnx_path, 'wb') as f:
+            f.write(onnx_bytes)
+        
+        return session
+    
+    except Exception as e:
+        print(f"⚠️ ONNX export failed, using sklearn for predictions: {e}")
+        return None
+
+
+# Optional: Yggdrasil Decision Forests (ydf). ydf.from_sklearn() converts
+# the forest into YDF's own inference engine, which scores one row in
+# well under a millisecond (sklearn needs several). Preferred over ONNX.
+try:
+    import ydf
+except ImportError:
+    ydf = None
+
+
+def _export_ydf(model, X_check, ydf_path):
+    """
+    Convert the model to YDF and save it (only if it predicts the same).
+    
+    Args:
+        model: Trained RandomForestClassifier
+        X_check (np.ndarray): Rows used to compare YDF with sklearn
+        ydf_path (str): Directory to save the YDF model in
+    
+    Returns:
+        YDF model, or None if ydf isn't available or doesn't match sklearn
+    """
+    if ydf is None:
+        return None
+    
+    try:
+        ydf_model = ydf.from_sklearn(model)
+        
+        # The conversion doesn't support every tree exactly - never
+        # serve predictions that differ from the model we evaluated
+        p_up = ydf_model.predict({'features': X_check})
+        if not np.allclose(p_up, model.predict_proba(X_check)[:, 1], atol=1e-5):
+            print("⚠️ YDF conversion doesn't reproduce the model's predictions - not used")
+            return None
+        
+        ydf_model.save(ydf_path)
+        return ydf_model
+    
+    except Exception as e:
+        print(f"⚠️ YDF export failed: {e}")
+        return None
+
+
+# Optional: Treelite. treelite.sklearn.import_model() converts the forest
+# into Treelite's format, and its GTIL predictor walks the trees in C++
+# with the same results as sklearn - a single row takes well under a
+# millisecond instead of several.
+try:
+    import treelite
+    import treelite.gtil
+except ImportError:
+    treelite = None
+
+
+def _export_treelite(model, X_check, treelite_path):
+    """
+    Convert the model to Treelite and save it.
+    
+    Args:
+        model: Trained RandomForestClassifier
+        X_check (np.ndarray): Rows used to compare Treelite with sklearn
+        treelite_path (str): File to save the Treelite model in
+    
+    Returns:
+        treelite.Model, or None if treelite isn't available or doesn't
+        match sklearn
+    """
+    if treelite is None:
+        return None
+    
+    try:
+        treelite_model = treelite.sklearn.import_model(model)
+        
+        # Never serve predictions that differ from the model we evaluated
+        probabilities = _treelite_predict_proba(treelite_model, X_check)
+        if not np.allclose(probabilities, model.predict_proba(X_check), atol=1e-5):
+            print("⚠️ Treelite conversion doesn't reproduce the model's predictions - not used")
+            return None
+        
+        os.makedirs(os.path.dirname(treelite_path) or '.', exist_ok=True)
+        treelite_model.serialize(treelite_path)
+        return treelite_model
+    
+    except Exception as e:
+        print(f"⚠️ Treelite export failed: {e}")
+        return None
+
+
+def _treelite_predict_proba(treelite_model, X):
+    """
+    Class probabilities from a Treelite model, shaped like sklearn's.
+    
+    Args:
+        treelite_model (treelite.Model): Converted forest
+        X (np.ndarray): Feature matrix
+    
+    Returns:
+        np.ndarray: Shape (N, 2), columns [P(DOWN), P(UP)]
+    """
+    # GTIL returns (rows, targets, classes) - there is one target
+    return treelite.gtil.predict(treelite_model, np.asarray(X, dtype=np.float64))[:, 0, :]
+
+# Optional: Intel Extension for Scikit-learn (sklearnex). Its
+# RandomForestClassifier runs on oneDAL kernels, which can be much faster
+# than sklearn's - but not on every CPU/dataset, so train_model() only
+# uses it when benchmark_mode measures it as faster.
+# (The class is used directly instead of patch_sklearn(), which would
+# swap in oneDAL for every sklearn estimator in the process.)
+try:
+    from sklearnex.ensemble import RandomForestClassifier as IntelRandomForestClassifier
+except ImportError:
+    IntelRandomForestClassifier = None
+
+# Rows of the training set used to time each backend in benchmark_mode
+BENCHMARK_ROWS = 2000
+
+
+def _make_forest(backend='sklearn', n_jobs=-1):
+    """
+    Create the (untrained) Random Forest for a backend.
+    
+    Args:
+        backend (str): 'sklearn' or 'sklearnex'
+        n_jobs (int): CPU cores to use (-1 = all)
+    
+    Returns:
+        RandomForestClassifier (sklearn's or sklearnex's)
+    """
+    forest_class = RandomForestClassifier
+    if backend == 'sklearnex':
+        forest_class = IntelRandomForestClassifier
+    
+    # Random Forest is a good choice for classification
+    # It combines multiple decision trees for better accuracy
+    return forest_class(
+        n_estimators=100,      # Number of trees
+        max_depth=10,          # Maximum depth of each tree
+        random_state=42,       # For reproducibility
+        n_jobs=n_jobs          # CPU cores (-1 = all)
+    )
+
+
+def _pick_forest_backend(X_train, y_train, n_jobs=-1):
+    """
+    Time fit + predict of each available backend and return the fastest.
+    
+    Args:
+        X_train (np.ndarray): Training features (the first BENCHMARK_ROWS
+                              rows are used)
+        y_train (np.ndarray): Training labels
+        n_jobs (int): CPU cores to use (-1 = all)
+    
+    Returns:
+        str: 'sklearn' or 'sklearnex'
+    """
+    if IntelRandomForestClassifier is None:
+        print("   sklearnex not installed - using sklearn")
+        return 'sklearn'
+    
+    X_fold = X_train[:BENCHMARK_ROWS]
+    y_fold = y_train[:BENCHMARK_ROWS]
+    
+    timings = {}
+    for backend in ('sklearn', 'sklearnex'):
+        start = time.perf_counter()
+        try:
+            forest = _make_forest(backend, n_jobs)
+            forest.fit(X_fold, y_fold)
+            forest.predict_proba(X_fold)
+        except Exception as e:
+            print(f"⚠️ {backend} benchmark failed: {e}")
+            continue
+        timings[backend] = time.perf_counter() - start
+        print(f"   {backend:10s}: {timings[backend]*1000:.1f} ms")
+    
+    if not timings:
+        return 'sklearn'
+    return min(timings, key=timings.get)
+
+
+def make_predict_proba(model_data):
+    """
+    Pick the fastest available way to get class probabilities.
+    
+    Order: YDF model, then Treelite model, then ONNX Runtime session,
+    then sklearn itself.
+    
+    Args:
+        model_data (dict): Model data (see load_model())
+    
+    Returns:
+        callable: predict_proba(X) -> array of shape (N, 2),
+                  columns [P(DOWN), P(UP)] like sklearn's predict_proba
+    """
+    ydf_model = model_data.get('ydf_model')
+    if ydf_model is not None:
+        def predict_proba(X):
+            # YDF returns only P(UP) for a two-class model
+            p_up = np.asarray(ydf_model.predict({'features': X}), dtype=np.float64)
+            return np.column_stack((1.0 - p_up, p_up))
+        return predict_proba
+    
+    treelite_model = model_data.get('treelite_model')
+    if treelite_model is not None:
+        def predict_proba(X):
+            return _treelite_predict_proba(treelite_model, X)
+        return predict_proba
+    
+    session = model_data.get('onnx_session')
+    if session is not None:
+        def predict_proba(X):
+            # Outputs: [labels, probabilities]; ONNX takes float32 input
+            return session.run(None, {'X': np.asarray(X, dtype=np.float32)})[1]
+        return predict_proba
+    
+    return model_data['model'].predict_proba
+
+
+def _predict(model_data, X):
+    """
+    Predict class labels (0/1) with the fastest available backend.
     
+    Args:
+        model_data (dict): Needs 'model'; optionally 'ydf_model',
+                           'treelite_model' and 'onnx_session'
+        X (np.ndarray): Feature matrix
+    
+    Returns:
+        np.ndarray: Predicted labels
+    """
+    if all(model_data.get(key) is None
+           for key in ('ydf_model', 'treelite_model', 'onnx_session')):
+        return model_data['model'].predict(X)
+    
+    # Same rule as sklearn: the more likely class, DOWN on a tie
+    return (make_predict_proba(model_data)(X)[:, 1] > 0.5).astype(np.int64)
+
+
+# Optional: pyarrow lets the feature cache use Parquet (zstd-compressed).
+# Without it the cache is a pandas pickle instead.
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+# Features the model is trained on (same order as the feature matrix)
+FEATURE_COLUMNS = [
+    'prev_close',
+    'return',
+    'sma_5',
+    'distance_from_sma',
+    'volatility',
+    'high_low_range',
+    'volume_normalized'
+]
+
+# Columns read from the price CSV and their types. Timestamps stay
+# strings: they're only used for sorting, and ISO dates sort correctly
+# as text.
+PRICE_CSV_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+PRICE_CSV_DTYPES = {
+    'timestamp': str,
+    'open': np.float64,
+    'high': np.float64,
+    'low': np.float64,
+    'close': np.float64,
+    'volume': np.float64
+}
+
+# Cleaned training data (Steps 1-4) is cached here, next to the
+# advanced trainer's cache
+FEATURE_CACHE_DIR = os.path.join(os.path.dirname(__file__), 'models', 'cache')
+
+
+def _feature_cache_path(data_path):
+    """
+    File the features built from this data file are cached in.
+    
+    The name hashes the file's path, modification time and size (plus the
+    feature columns), so editing the CSV automatically uses a new file.
+    
+    Args:
+        data_path (str): Path to the CSV file with price data
+    
+    Returns:
+        str: Path of the cache file
+    """
+    stat = os.stat(data_path)
+    key = f"{os.path.abspath(data_path)}|{stat.st_mtime}|{stat.st_size}|{','.join(FEATURE_COLUMNS)}"
+    key_hash = hashlib.sha1(key.encode()).hexdigest()[:12]
+    extension = 'parquet' if pyarrow is not None else 'pkl'
+    return os.path.join(FEATURE_CACHE_DIR, f"features_{key_hash}.{extension}")
+
+
+def _load_feature_cache(cache_path):
+    """
+    Load cached training data.
+    
+    Args:
+        cache_path (str): From _feature_cache_path()
+    
+    Returns:
+        tuple: (X, y) like _build_training_data(), or None if not cached
+    """
+    try:
+        if cache_path.endswith('.parquet'):
+            df = pd.read_parquet(cache_path)
+        else:
+            df = pd.read_pickle(cache_path)
+    except Exception:
+        # Missing or unreadable cache - just rebuild it
+        return None
+    
+    X = np.ascontiguousarray(df[FEATURE_COLUMNS].to_numpy(), dtype=np.float32)
+    y = df['target'].to_numpy(dtype=np.int64)
+    return X, y
+
+
+def _save_feature_cache(training_data, cache_path):
+    """
+    Write training data to the cache (failures are only reported).
+    
+    Args:
+        training_data (tuple): (X, y) from _build_training_data()
+        cache_path (str): From _feature_cache_path()
+    """
+    X, y = training_data
+    df = pd.DataFrame(X, columns=FEATURE_COLUMNS)
+    df['target'] = y
+    
+    # Write to a temporary file first and then rename it: another thread
+    # or process training on the same CSV never sees a half-written cache
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        if cache_path.endswith('.parquet'):
+            df.to_parquet(tmp_path, compression='zstd')
+        else:
+            df.to_pickle(tmp_path)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        print(f"⚠️ Could not write feature cache: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _build_training_data(data_path):
+    """
+    Steps 1-4 of train_model(): read the CSV, create the features and
+    target labels, and drop rows that can't be used.
+    
+    Args:
+        data_path (str): Path to an existing CSV file with price data
+    
+    Returns:
+        tuple: (X, y) - float32 feature matrix (FEATURE_COLUMNS order) and
+               0/1 targets, or None if there isn't enough data
+    """
     # Read CSV file into pandas DataFrame
-    df = pd.read_csv(data_path)
+    # (fixed schema: only the needed columns, with known dtypes, so
+    # pandas doesn't have to guess types column by column)
+    df = pd.read_csv(
+        data_path,
+        engine='c',
+        usecols=PRICE_CSV_COLUMNS,
+        dtype=PRICE_CSV_DTYPES,
+        memory_map=True
+    )
     print(f"✅ Loaded {len(df)} price records")
     print(f"   Columns: {list(df.columns)}")
     
@@ -53,35 +542,50 @@ def train_model(data_path='data/sample_prices.csv', model_path='services/model.j
     # ========================================
     print("\n[Step 2] Creating features...")
     
-    # Sort by timestamp to ensure correct order
-    df = df.sort_values('timestamp').reset_index(drop=True)
-    
-    # Feature 1: Previous close price
-    # This helps the model understand the current price level
-    df['prev_close'] = df['close'].shift(1)
-    
-    # Feature 2: Price return (percentage change)
-    # This shows how much the price moved
-    df['return'] = (df['close'] - df['prev_close']) / df['prev_close']
-    
-    # Feature 3: Simple Moving Average (SMA) over last 5 periods
-    # This smooths out price fluctuations
-    df['sma_5'] = df['close'].rolling(window=5).mean()
-    
-    # Feature 4: Distance from moving average
-    # Shows if price is above or below the trend
-    df['distance_from_sma'] = (df['close'] - df['sma_5']) / df['sma_5']
-    
-    # Feature 5: Volatility (standard deviation of last 5 returns)
-    # Higher volatility = more risk
-    df['volatility'] = df['return'].rolling(window=5).std()
-    
-    # Feature 6: High-Low range (normalized by close)
-    # Shows price movement within the period
-    df['high_low_range'] = (df['high'] - df['low']) / df['close']
+    # Sort by timestamp to ensure correct order (price files are usually
+    # written oldest first already - then there's nothing to do)
+    if not df['timestamp'].is_monotonic_increasing:
+        df = df.sort_values('timestamp').reset_index(drop=True)
+    
+    # Work on plain NumPy arrays: every feature is written straight into
+    # one (rows x 7) matrix instead of becoming a new DataFrame column.
+    # Rows without enough history yet stay NaN (removed in Step 4).
+    close = df['close'].to_numpy(dtype=np.float64)
+    high = df['high'].to_numpy(dtype=np.float64)
+    low = df['low'].to_numpy(dtype=np.float64)
+    volume = df['volume'].to_numpy(dtype=np.float64)
+    
+    n = len(close)
+    features = np.full((n, 7), np.nan)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Feature 1: Previous close price
+        # This helps the model understand the current price level
+        features[1:, 0] = close[:-1]
+        
+        # Feature 2: Price return (percentage change)
+        # This shows how much the price moved
+        features[1:, 1] = (close[1:] - close[:-1]) / close[:-1]
+        
+        # Feature 3: Simple Moving Average (SMA) over last 5 periods
+        # This smooths out price fluctuations
+        # Feature 5: Volatility (standard deviation of last 5 returns)
+        # Higher volatility = more risk
+        # (both computed together in one pass over the data with Numba)
+        sma_5, volatility = _rolling_features(close, features[:, 1], 5)
+        features[:, 2] = sma_5
+        features[:, 4] = volatility
+        
+        # Feature 4: Distance from moving average
+        # Shows if price is above or below the trend
+        features[:, 3] = (close - sma_5) / sma_5
+        
+        # Feature 6: High-Low range (normalized by close)
+        # Shows price movement within the period
+        features[:, 5] = (high - low) / close
     
     # Feature 7: Volume (can indicate strength of movement)
-    df['volume_normalized'] = df['volume']
+    features[:, 6] = volume
     
     print(f"✅ Created 7 features:")
     print(f"   - prev_close: Previous closing price")
@@ -98,48 +602,104 @@ def train_model(data_path='data/sample_prices.csv', model_path='services/model.j
     print("\n[Step 3] Creating target labels...")
     
     # Target: 1 if next close > current close (UP), 0 otherwise (DOWN)
-    df['next_close'] = df['close'].shift(-1)
-    df['target'] = (df['next_close'] > df['close']).astype(int)
+    # (the last row has no next close: 0 here, removed in Step 4)
+    target = np.zeros(n, dtype=np.int64)
+    target[:-1] = close[1:] > close[:-1]
     
     # Count UP vs DOWN movements
-    up_count = df['target'].sum()
-    down_count = len(df) - up_count
+    up_count = int(target.sum())
+    down_count = n - up_count
     print(f"✅ Target labels created:")
-    print(f"   - UP (1): {up_count} cases ({up_count/len(df)*100:.1f}%)")
-    print(f"   - DOWN (0): {down_count} cases ({down_count/len(df)*100:.1f}%)")
+    print(f"   - UP (1): {up_count} cases ({up_count/n*100:.1f}%)")
+    print(f"   - DOWN (0): {down_count} cases ({down_count/n*100:.1f}%)")
     
     # ========================================
     # STEP 4: Clean Data
     # ========================================
     print("\n[Step 4] Cleaning data...")
     
-    # Remove rows with NaN values (from shifting and rolling operations)
-    df_clean = df.dropna()
-    print(f"✅ Removed {len(df) - len(df_clean)} rows with missing values")
-    print(f"   Final dataset: {len(df_clean)} rows")
+    # Keep rows where every feature exists (enough history), the next
+    # close is known, and the input row itself has no missing values
+    valid = ~np.isnan(features).any(axis=1)
+    valid[-1:] = False
+    valid &= df.notna().all(axis=1).to_numpy()
+    
+    n_clean = int(valid.sum())
+    print(f"✅ Removed {n - n_clean} rows with missing values")
+    print(f"   Final dataset: {n_clean} rows")
     
-    if len(df_clean) < 50:
+    if n_clean < 50:
         print("❌ Error: Not enough data to train model (need at least 50 rows)")
+        return None
+    
+    # float32: sklearn's trees compare features in float32 anyway, so
+    # converting once here saves a copy inside every fit()/predict() call
+    # and halves the matrix size (features are computed in float64 above)
+    X = np.ascontiguousarray(features[valid], dtype=np.float32)
+    y = target[valid]
+    
+    return X, y
+
+
+def train_model(data_path='data/sample_prices.csv', model_path='services/model.joblib',
+                benchmark_mode=False, n_jobs=-1):
+    """
+    Train a machine learning model to predict price movements.
+    
+    Safe to call from several threads at once (e.g. one model per symbol
+    in a ThreadPoolExecutor) as long as each call uses its own
+    model_path. sklearn's tree building releases the GIL, so the threads
+    really run in parallel - pass n_jobs=1 then, so the threads don't
+    compete for the same cores.
+    
+    Args:
+        data_path (str): Path to CSV file with price data
+        model_path (str): Path to save the trained model
+        benchmark_mode (bool): Time sklearn against sklearnex (if installed)
+                               on part of the training data and train
+                               with the faster one. Default: sklearn.
+        n_jobs (int): CPU cores the forest uses (-1 = all)
+    
+    Returns:
+        tuple: (model, scaler, accuracy) - The trained model, scaler (always
+               None - tree models need no scaling), and accuracy score
+    """
+    print("=" * 70)
+    print("AI TRADING MODEL TRAINING")
+    print("=" * 70)
+    
+    # ========================================
+    # STEP 1: Load Data
+    # ========================================
+    print("\n[Step 1] Loading price data...")
+    
+    if not os.path.exists(data_path):
+        print(f"❌ Error: Data file not found at {data_path}")
+        print(f"   Please create sample data first.")
         return None, None, None
     
+    # Steps 1-4 only depend on the data file: reuse their result while
+    # the file is unchanged
+    cache_path = _feature_cache_path(data_path)
+    training_data = _load_feature_cache(cache_path)
+    if training_data is not None:
+        print(f"✅ Data file unchanged - using cached features (Steps 2-4 skipped)")
+        print(f"   Cache: {cache_path}")
+    else:
+        training_data = _build_training_data(data_path)
+        if training_data is None:
+            return None, None, None
+        _save_feature_cache(training_data, cache_path)
+    
+    X, y = training_data
+    
     # ========================================
     # STEP 5: Prepare Features and Target
     # ========================================
     print("\n[Step 5] Preparing features and target...")
     
-    # Select feature columns
-    feature_columns = [
-        'prev_close',
-        'return',
-        'sma_5',
-        'distance_from_sma',
-        'volatility',
-        'high_low_range',
-        'volume_normalized'
-    ]
-    
-    X = df_clean[feature_columns].values
-    y = df_clean['target'].values
+    # Feature columns (same order as the feature matrix)
+    feature_columns = list(FEATURE_COLUMNS)
     
     print(f"✅ Feature matrix shape: {X.shape}")
     print(f"   Target vector shape: {y.shape}")
@@ -158,49 +718,57 @@ def train_model(data_path='data/sample_prices.csv', model_path='services/model.j
     print(f"   - Training set: {len(X_train)} samples")
     print(f"   - Test set: {len(X_test)} samples")
     
+    # No feature scaling: decision trees only compare a feature against
+    # a split point, so mean=0/std=1 scaling would not change the model
+    
     # ========================================
-    # STEP 7: Scale Features
+    # STEP 7: Train Model
     # ========================================
-    print("\n[Step 7] Scaling features...")
+    print("\n[Step 7] Training Random Forest model...")
     
-    # StandardScaler normalizes features to have mean=0 and std=1
-    # This helps the model learn better
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
+    backend = 'sklearn'
+    if benchmark_mode:
+        print("   Benchmarking Random Forest backends...")
+        backend = _pick_forest_backend(X_train, y_train, n_jobs)
     
-    print(f"✅ Features scaled using StandardScaler")
+    model = _make_forest(backend, n_jobs)
     
-    # ========================================
-    # STEP 8: Train Model
-    # ========================================
-    print("\n[Step 8] Training Random Forest model...")
+    # Train the model
+    model.fit(X_train, y_train)
     
-    # Random Forest is a good choice for classification
-    # It combines multiple decision trees for better accuracy
-    model = RandomForestClassifier(
-        n_estimators=100,      # Number of trees
-        max_depth=10,          # Maximum depth of each tree
-        random_state=42,       # For reproducibility
-        n_jobs=-1              # Use all CPU cores
-    )
+    print(f"✅ Model trained with {model.n_estimators} trees ({backend})")
     
-    # Train the model
-    model.fit(X_train_scaled, y_train)
+    # Fast-inference copies of the model, saved next to the .joblib file
+    onnx_path = os.path.splitext(model_path)[0] + '.onnx'
+    onnx_session = _export_onnx(model, X_train, onnx_path)
+    if onnx_session is not None:
+        print(f"✅ ONNX model saved to: {onnx_path}")
+    
+    ydf_path = os.path.splitext(model_path)[0] + '_ydf'
+    ydf_model = _export_ydf(model, X_train, ydf_path)
+    if ydf_model is not None:
+        print(f"✅ YDF model saved to: {ydf_path}")
+    
+    treelite_path = os.path.splitext(model_path)[0] + '.treelite'
+    treelite_model = _export_treelite(model, X_train, treelite_path)
+    if treelite_model is not None:
+        print(f"✅ Treelite model saved to: {treelite_path}")
     
-    print(f"✅ Model trained with {model.n_estimators} trees")
+    backends = {'model': model, 'onnx_session': onnx_session, 'ydf_model': ydf_model,
+                'treelite_model': treelite_model}
     
     # ========================================
-    # STEP 9: Evaluate Model
+    # STEP 8: Evaluate Model
     # ========================================
-    print("\n[Step 9] Evaluating model performance...")
+    print("\n[Step 8] Evaluating model performance...")
     
-    # Make predictions on training set
-    y_train_pred = model.predict(X_train_scaled)
-    train_accuracy = accuracy_score(y_train, y_train_pred)
+    # Predict training and test rows in ONE call (each predict call has
+    # a fixed per-tree overhead), then split the result again
+    y_all_pred = _predict(backends, np.vstack([X_train, X_test]))
+    y_train_pred = y_all_pred[:len(X_train)]
+    y_test_pred = y_all_pred[len(X_train):]
     
-    # Make predictions on test set
-    y_test_pred = model.predict(X_test_scaled)
+    train_accuracy = accuracy_score(y_train, y_train_pred)
     test_accuracy = accuracy_score(y_test, y_test_pred)
     
     print(f"✅ Model Performance:")
@@ -223,31 +791,38 @@ def train_model(data_path='data/sample_prices.csv', model_path='services/model.j
     
     # Feature importance
     print(f"\n📊 Feature Importance:")
-    feature_importance = pd.DataFrame({
-        'feature': feature_columns,
-        'importance': model.feature_importances_
-    }).sort_values('importance', ascending=False)
+    importances = model.feature_importances_
     
-    for idx, row in feature_importance.iterrows():
-        print(f"   {row['feature']:20s}: {row['importance']:.4f}")
+    # Most important feature first
+    for i in np.argsort(importances)[::-1]:
+        print(f"   {feature_columns[i]:20s}: {importances[i]:.4f}")
     
     # ========================================
-    # STEP 10: Save Model
+    # STEP 9: Save Model
     # ========================================
-    print(f"\n[Step 10] Saving model...")
+    print(f"\n[Step 9] Saving model...")
     
     # Create services directory if it doesn't exist
     os.makedirs(os.path.dirname(model_path), exist_ok=True)
     
-    # Save both model and scaler together
+    # Save the model with its feature list
+    # (no scaler - older model files still have one, so the key stays)
     model_data = {
         'model': model,
-        'scaler': scaler,
+        'scaler': None,
+        'scaling': 'none',
         'features': feature_columns,
-        'accuracy': test_accuracy
+        'accuracy': test_accuracy,
+        'onnx_path': onnx_path if onnx_session is not None else None,
+        'ydf_path': ydf_path if ydf_model is not None else None,
+        'treelite_path': treelite_path if treelite_model is not None else None,
+        'backend': backend
     }
     
-    joblib.dump(model_data, model_path)
+    # Compressed: a 100-tree forest is ~1 MB raw and ~5x smaller this
+    # way. joblib.load() decompresses automatically (older, uncompressed
+    # files still load the same way).
+    joblib.dump(model_data, model_path, compress=MODEL_COMPRESSION)
     print(f"✅ Model saved to: {model_path}")
     
     # ========================================
@@ -261,27 +836,87 @@ def train_model(data_path='data/sample_prices.csv', model_path='services/model.j
     print(f"\nYou can now use this model to make predictions!")
     print("=" * 70)
     
-    return model, scaler, test_accuracy
+    return model, None, test_accuracy
 
 
 def load_model(model_path='services/model.joblib'):
     """
     Load a trained model from disk.
     
+    The loaded model is cached in memory, keyed by path and file
+    modification time, so repeated calls are free and a retrained model
+    (which rewrites the file) is picked up automatically.
+    
     Args:
         model_path (str): Path to the saved model file
     
     Returns:
-        dict: Dictionary containing model, scaler, features, and accuracy
+        dict: Dictionary containing model, scaler, features, and accuracy.
+              If the model was also saved as ONNX and onnxruntime is
+              installed, 'onnx_session' holds an ONNX Runtime session;
+              a saved YDF model is loaded as 'ydf_model' (when ydf is
+              installed) and a Treelite model as 'treelite_model'. 'predict_proba' is the fastest of these (see
+              make_predict_proba()) - use it instead of model.predict_proba.
+              'scale_params' is the scaler's (mean, 1 / scale) as arrays,
+              or None if the scaler has no mean_/scale_.
+              The dict is shared between callers - don't modify it.
     """
     if not os.path.exists(model_path):
         print(f"❌ Error: Model file not found at {model_path}")
         print(f"   Please train the model first: python services/train_model.py")
         return None
     
-    model_data = joblib.load(model_path)
-    return model_data
+    return _load_model_file(model_path, os.path.getmtime(model_path))
+
 
+@lru_cache(maxsize=4)
+def _load_model_file(model_path, mtime):
+    """
+    Read a model file and set up its inference backends (see load_model()).
+    
+    Args:
+        model_path (str): Path to the saved model file
+        mtime (float): File modification time - only part of the cache key
+    
+    Returns:
+        dict: Model data
+    """
+    try:
+        model_data = joblib.load(model_path)
+    except ImportError as e:
+        # A model trained with sklearnex needs sklearnex to load
+        print(f"❌ Error: Can't load model from {model_path}: {e}")
+        return None
+    
+    onnx_path = model_data.get('onnx_path')
+    if onnxruntime is not None and onnx_path and os.path.exists(onnx_path):
+        model_data['onnx_session'] = onnxruntime.InferenceSession(
+            onnx_path, providers=['CPUExecutionProvider']
+        )
+    
+    ydf_path = model_data.get('ydf_path')
+    if ydf is not None and ydf_path and os.path.exists(ydf_path):
+        model_data['ydf_model'] = ydf.load_model(ydf_path)
+    
+    treelite_path = model_data.get('treelite_path')
+    if treelite is not None and treelite_path and os.path.exists(treelite_path):
+        model_data['treelite_model'] = treelite.Model.deserialize(treelite_path)
+    
+    model_data['predict_proba'] = make_predict_proba(model_data)
+    
+    # StandardScaler.transform() is just (X - mean) / scale, but it
+    # validates its input on every call - slow for one (1, 7) row.
+    # Keep the plain arrays so predictions can do the math themselves.
+    scaler = model_data.get('scaler')
+    mean = getattr(scaler, 'mean_', None)
+    scale = getattr(scaler, 'scale_', None)
+    if mean is not None and scale is not None:
+        model_data['scale_params'] = (np.asarray(mean, dtype=np.float64),
+                                      1.0 / np.asarray(scale, dtype=np.float64))
+    else:
+        model_data['scale_params'] = None
+    
+    return model_data
 
 if __name__ == "__main__":
     # Run training when script is executed directly
@@ -23,11 +23,106 @@ Usage:
     # Now use df for indicators, predictions, charts
 """
 
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
-from models import fetch_all
+from concurrent.futures import ThreadPoolExecutor
+from models import fetch_columns, run_and_close_connections
 from datetime import datetime, timedelta
 
 
+# Recent get_price_history_df() results:
+# (symbol, timeframe, limit) -> (time fetched, DataFrame)
+# Repeated requests within HISTORY_CACHE_SECONDS (e.g. indicators,
+# prediction and chart for the same page) reuse the DataFrame instead of
+# querying (and possibly syncing) again.
+# At most HISTORY_CACHE_MAX_SIZE entries are kept (least recently used
+# ones are dropped first), so many symbols/timeframes can't fill memory.
+HISTORY_CACHE_SECONDS = 60
+HISTORY_CACHE_MAX_SIZE = 64
+_history_cache = OrderedDict()
+_history_cache_lock = threading.Lock()
+
+
+def _get_cached_history(key, now):
+    """
+    Look up a recent DataFrame in the history cache.
+    
+    Args:
+        key (tuple): (symbol, timeframe, limit)
+        now (float): Current time.monotonic()
+    
+    Returns:
+        pd.DataFrame: A copy (callers may add columns), or None if there
+                      is no fresh entry
+    """
+    with _history_cache_lock:
+        cached = _history_cache.get(key)
+        if cached is not None and now - cached[0] < HISTORY_CACHE_SECONDS:
+            _history_cache.move_to_end(key)
+            return cached[1].copy()
+    return None
+
+
+def _cache_history(key, df):
+    """
+    Store a loaded DataFrame in the history cache.
+    
+    Args:
+        key (tuple): (symbol, timeframe, limit)
+        df (pd.DataFrame): Result of _load_price_history_df()
+    """
+    # Don't cache "no data" results - retry next time
+    if df.empty:
+        return
+    now = time.monotonic()
+    
+    with _history_cache_lock:
+        # Drop expired entries first, then the least recently used ones
+        for old_key in [k for k, (fetched, _) in _history_cache.items() if now - fetched >= HISTORY_CACHE_SECONDS]:
+            del _history_cache[old_key]
+        
+        _history_cache[key] = (now, df.copy())
+        _history_cache.move_to_end(key)
+        
+        while len(_history_cache) > HISTORY_CACHE_MAX_SIZE:
+            _history_cache.popitem(last=False)
+
+
+def _columns_to_df(columns):
+    """
+    Build the OHLCV DataFrame straight from fetch_columns() output.
+    
+    Every column becomes one NumPy array (no per-row dicts, no rename /
+    to_datetime / set_index afterwards).
+    
+    Args:
+        columns (dict): Oldest-first columns from the price_history query
+                        (timestamp as epoch seconds)
+    
+    Returns:
+        pd.DataFrame: Oldest-first OHLCV data indexed by timestamp
+    """
+    # Epoch seconds -> datetime64 in one vectorized cast. SQLite's
+    # strftime('%s') reads the stored (local) time as-is, so the index
+    # shows the same wall-clock times as the database.
+    timestamps = np.asarray(columns['timestamp'], dtype=np.int64).astype('datetime64[s]')
+    timestamps = timestamps.astype('datetime64[ns]')
+    
+    return pd.DataFrame(
+        {
+            'open': np.asarray(columns['open_price'], dtype=np.float64),
+            'high': np.asarray(columns['high_price'], dtype=np.float64),
+            'low': np.asarray(columns['low_price'], dtype=np.float64),
+            'close': np.asarray(columns['close_price'], dtype=np.float64),
+            'volume': np.asarray(columns['volume'], dtype=np.float64),
+        },
+        index=pd.DatetimeIndex(timestamps, name='timestamp')
+    )
+
+
 def get_price_history_df(symbol: str, timeframe: str = "1h", limit: int = 300, 
                          force_sync: bool = False) -> pd.DataFrame:
     """
@@ -47,9 +142,11 @@ def get_price_history_df(symbol: str, timeframe: str = "1h", limit: int = 300,
                      Index: timestamp (datetime)
     
     Data Flow:
-        1. Check database for recent data
-        2. If force_sync or data too old, sync from CCXT
-        3. Return consistent DataFrame
+        1. Reuse the result of the same call from the last
+           HISTORY_CACHE_SECONDS (skipped when force_sync)
+        2. Check database for recent data
+        3. If force_sync or data too old, sync from CCXT
+        4. Return consistent DataFrame
     
     Example:
         >>> df = get_price_history_df("BTCUSDT", "1h", 250)
@@ -61,7 +158,31 @@ def get_price_history_df(symbol: str, timeframe: str = "1h", limit: int = 300,
         - Data is sorted oldest to newest (index ascending)
         - Missing data returns empty DataFrame (not None)
     """
+    key = (symbol, timeframe, limit)
+    
+    if not force_sync:
+        cached = _get_cached_history(key, time.monotonic())
+        if cached is not None:
+            return cached
     
+    df = _load_price_history_df(symbol, timeframe, limit, force_sync)
+    _cache_history(key, df)
+    return df
+
+
+def _load_price_history_df(symbol, timeframe, limit, force_sync):
+    """
+    Load price history from the database or the exchange (no caching).
+    
+    Args:
+        symbol (str): Trading pair (e.g., "BTCUSDT")
+        timeframe (str): Candle interval
+        limit (int): Number of candles to fetch
+        force_sync (bool): If True, sync from exchange before returning
+    
+    Returns:
+        pd.DataFrame: See get_price_history_df()
+    """
     try:
         print(f"\n{'='*70}")
         print(f"UNIFIED DATA SERVICE")
@@ -72,33 +193,28 @@ def get_price_history_df(symbol: str, timeframe: str = "1h", limit: int = 300,
         # Step 1: Try to get from database first
         # ========================================
         
+        # Inner query: latest `limit` candles (walks the index backwards);
+        # outer query: returns them oldest first, ready for the DataFrame.
+        # Timestamps come back as epoch seconds (integers) so no date
+        # strings have to be parsed in Python.
         query = """
-            SELECT timestamp, open_price, high_price, low_price, close_price, volume
-            FROM price_history
-            WHERE symbol = ?
-            ORDER BY timestamp DESC
-            LIMIT ?
+            SELECT CAST(strftime('%s', timestamp) AS INTEGER) AS timestamp,
+                   open_price, high_price, low_price, close_price, volume
+            FROM (
+                SELECT timestamp, open_price, high_price, low_price, close_price, volume
+                FROM price_history
+                WHERE symbol = ?
+                ORDER BY timestamp DESC
+                LIMIT ?
+            )
+            ORDER BY timestamp ASC
         """
         
-        rows = fetch_all(query, (symbol, limit))
+        columns = fetch_columns(query, (symbol, limit))
+        row_count = len(columns['timestamp']) if columns else 0
         
-        if rows and len(rows) >= limit // 2:  # Have at least half the requested data
-            # Reverse to get oldest-first order
-            rows = list(reversed(rows))
-            
-            # Convert to DataFrame (fetch_all returns list of dicts)
-            df = pd.DataFrame(rows)
-            
-            # Rename columns to match expected format
-            df.rename(columns={
-                'open_price': 'open',
-                'high_price': 'high',
-                'low_price': 'low',
-                'close_price': 'close'
-            }, inplace=True)
-            
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df = df.set_index('timestamp')
+        if row_count and row_count >= limit // 2:  # Have at least half the requested data
+            df = _columns_to_df(columns)
             
             # Check data freshness (should be within 2 hours)
             latest_timestamp = df.index[-1]
@@ -112,7 +228,7 @@ def get_price_history_df(symbol: str, timeframe: str = "1h", limit: int = 300,
             else:
                 print(f"⚠️  Database data stale ({age_hours:.1f}h old), will sync from CCXT")
         else:
-            print(f"⚠️  Insufficient database data ({len(rows) if rows else 0} rows), will sync from CCXT")
+            print(f"⚠️  Insufficient database data ({row_count} rows), will sync from CCXT")
         
         # ========================================
         # Step 2: Sync from CCXT if needed
@@ -133,25 +249,10 @@ def get_price_history_df(symbol: str, timeframe: str = "1h", limit: int = 300,
             print(f"✅ Synced {sync_result['inserted']} new candles from CCXT")
             
             # Now fetch from database again
-            rows = fetch_all(query, (symbol, limit))
+            columns = fetch_columns(query, (symbol, limit))
             
-            if rows:
-                # Reverse to get oldest-first order
-                rows = list(reversed(rows))
-                
-                # Convert to DataFrame (fetch_all returns list of dicts)
-                df = pd.DataFrame(rows)
-                
-                # Rename columns to match expected format
-                df.rename(columns={
-                    'open_price': 'open',
-                    'high_price': 'high',
-                    'low_price': 'low',
-                    'close_price': 'close'
-                }, inplace=True)
-                
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-                df = df.set_index('timestamp')
+            if columns and columns['timestamp']:
+                df = _columns_to_df(columns)
                 
                 print(f"✅ Returning {len(df)} candles from database")
                 print(f"   Range: {df.index[0]} to {df.index[-1]}")
@@ -197,6 +298,54 @@ def get_price_history_df(symbol: str, timeframe: str = "1h", limit: int = 300,
         return pd.DataFrame(columns=['open', 'high', 'low', 'close', 'volume'])
 
 
+def get_many_price_history_df(symbols, timeframe: str = "1h", limit: int = 300) -> dict:
+    """
+    Get OHLCV DataFrames for several symbols at once.
+    
+    Each symbol is loaded by get_price_history_df() in its own thread:
+    the time goes into SQLite reads and exchange HTTP calls, which both
+    release the GIL, so the symbols load in parallel.
+    
+    Args:
+        symbols (list): Trading pairs (e.g., ["BTCUSDT", "ETHUSDT"])
+        timeframe (str): Candle interval
+        limit (int): Number of candles per symbol
+    
+    Returns:
+        dict: {symbol: DataFrame} (empty DataFrame if no data)
+    
+    Example:
+        >>> dfs = get_many_price_history_df(["BTCUSDT", "ETHUSDT"], "1h", 250)
+        >>> print(dfs["ETHUSDT"]["close"].iloc[-1])
+    """
+    unique_symbols = list(dict.fromkeys(symbols))  # Drop duplicates, keep order
+    if not unique_symbols:
+        return {}
+    
+    now = time.monotonic()
+    results = {}
+    
+    # Reuse recent results
+    for symbol in unique_symbols:
+        cached = _get_cached_history((symbol, timeframe, limit), now)
+        if cached is not None:
+            results[symbol] = cached
+    
+    missing = [symbol for symbol in unique_symbols if symbol not in results]
+    
+    if missing:
+        # get_price_history_df() caches what it loads. Each worker closes
+        # its database connections when its symbol is done.
+        with ThreadPoolExecutor(max_workers=min(16, len(missing))) as pool:
+            loaded = pool.map(
+                lambda symbol: run_and_close_connections(get_price_history_df, symbol, timeframe, limit),
+                missing
+            )
+            results.update(zip(missing, loaded))
+    
+    return {symbol: results[symbol] for symbol in unique_symbols}
+
+
 def validate_df_for_indicators(df: pd.DataFrame, min_candles: int = 200) -> tuple[bool, str]:
     """
     Validate DataFrame has sufficient data for indicator calculation.
@@ -228,8 +377,9 @@ def validate_df_for_indicators(df: pd.DataFrame, min_candles: int = 200) -> tupl
     if missing_cols:
         return False, f"Missing columns: {', '.join(missing_cols)}"
     
-    # Check for NaN values
-    if df[['close']].isnull().any().any():
+    # Check for NaN values (hasnans: one scan of the column, no
+    # temporary DataFrame or boolean mask)
+    if df['close'].hasnans:
         return False, "Data contains NaN values"
     
     return True, ""
@@ -260,7 +410,9 @@ def ensure_consistent_timestamps(
     """
     
     # Get consistent timestamp list from price_data
-    timestamps = [ts.isoformat() for ts in price_data.index]
+    # (ISO format like '2024-01-15T10:00:00', formatted by NumPy in one
+    # call instead of one isoformat() per row; candles have whole seconds)
+    timestamps = np.datetime_as_string(price_data.index.to_numpy(), unit='s').tolist()
     
     # Build unified chart data
     unified = {
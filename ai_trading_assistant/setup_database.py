@@ -11,6 +11,30 @@ from mysql.connector import Error
 import config
 
 
+def _print_created_table(statement):
+    """
+    Print progress for a CREATE TABLE statement (other statements are silent).
+    
+    Args:
+        statement (str): SQL statement that was executed
+    """
+    if 'CREATE TABLE' in statement.upper():
+        # Extract table name
+        table_name = statement.split('CREATE TABLE')[1].split('(')[0].strip()
+        print(f"  ✓ Created table: {table_name}")
+
+
+def _print_statement_error(error):
+    """
+    Print a statement error, unless it's about a table already existing.
+    
+    Args:
+        error (Error): MySQL error raised by the statement
+    """
+    if 'already exists' not in str(error).lower():
+        print(f"  ⚠ Warning: {error}")
+
+
 def create_database_and_tables():
     """
     Create the database and all required tables by executing schema.sql
@@ -51,34 +75,36 @@ def create_database_and_tables():
             sql_script = file.read()
         
         # Split the script into individual statements
-        # Filter out comments and empty statements
+        # Filter out comments and empty statements, and skip CREATE DATABASE
+        # and USE statements (already handled)
         statements = []
         for statement in sql_script.split(';'):
             statement = statement.strip()
             # Skip empty statements and comment-only statements
             if statement and not all(line.strip().startswith('--') or line.strip() == '' 
                                     for line in statement.split('\n')):
+                if 'CREATE DATABASE' in statement.upper() or statement.upper().startswith('USE '):
+                    continue
                 statements.append(statement)
         
-        # Execute each statement
-        for i, statement in enumerate(statements):
-            try:
-                # Skip CREATE DATABASE and USE statements (already handled)
-                if 'CREATE DATABASE' in statement.upper() or statement.strip().upper().startswith('USE '):
-                    continue
-                
-                cursor.execute(statement)
-                
-                # Print progress for CREATE TABLE statements
-                if 'CREATE TABLE' in statement.upper():
-                    # Extract table name
-                    table_name = statement.split('CREATE TABLE')[1].split('(')[0].strip()
-                    print(f"  ✓ Created table: {table_name}")
-                    
-            except Error as e:
-                # Only print error if it's not about table already existing
-                if 'already exists' not in str(e).lower():
-                    print(f"  ⚠ Warning: {e}")
+        # Send all statements to the server in ONE call (multi=True)
+        # instead of one round-trip per statement
+        executed = 0
+        try:
+            for result in cursor.execute(';\n'.join(statements), multi=True):
+                _print_created_table(result.statement)
+                executed += 1
+        except Error as e:
+            # The batch stops at the first error (e.g. a table that already
+            # exists when setup is run again). Report it and run the
+            # remaining statements one at a time, like before.
+            _print_statement_error(e)
+            for statement in statements[executed + 1:]:
+                try:
+                    cursor.execute(statement)
+                    _print_created_table(statement)
+                except Error as e:
+                    _print_statement_error(e)
         
         connection.commit()
         print("\n4. Committing changes...")
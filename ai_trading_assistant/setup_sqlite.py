@@ -2,15 +2,22 @@
 SQLite Database Setup
 Creates SQLite database with all tables for quick start.
 No MySQL required!
+
+Safe to run again: existing tables and their data are kept.
 """
 
 import sqlite3
 import os
 
+from models.db import apply_pragmas
+
 
 def setup_sqlite_database():
     """
     Create SQLite database and all required tables.
+    
+    Tables, indexes and sample rows that already exist are left alone,
+    so running this on an existing database changes nothing.
     """
     print("=" * 70)
     print("AI TRADING ASSISTANT - SQLite Database Setup")
@@ -18,34 +25,39 @@ def setup_sqlite_database():
     
     db_path = 'ai_trading.db'
     
-    # Remove old database if exists
     if os.path.exists(db_path):
-        print(f"\n⚠️  Removing existing database: {db_path}")
-        os.remove(db_path)
-    
-    print(f"\n[1] Creating SQLite database: {db_path}")
+        print(f"\n[1] Using existing SQLite database: {db_path}")
+    else:
+        print(f"\n[1] Creating SQLite database: {db_path}")
     
     conn = sqlite3.connect(db_path)
+    
+    # Same settings the app uses (see models/db.py). WAL mode is stored in
+    # the database file, so the new database starts out in WAL mode.
+    apply_pragmas(conn)
+    
     cursor = conn.cursor()
     
-    print("[2] Creating tables...")
+    print("[2] Creating tables (existing ones are kept)...")
     
-    # Users table
-    cursor.execute("""
-        CREATE TABLE users (
+    # All tables and indexes in one script and one transaction: a single
+    # call into SQLite and a single commit (instead of one per statement),
+    # and either everything is created or nothing is
+    conn.executescript("""
+        BEGIN;
+        
+        -- Users table
+        CREATE TABLE IF NOT EXISTS users (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             username TEXT UNIQUE NOT NULL,
             email TEXT UNIQUE NOT NULL,
             password_hash TEXT NOT NULL,
             balance REAL DEFAULT 10000.00,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    print("  ✅ Created table: users")
-    
-    # Price history table
-    cursor.execute("""
-        CREATE TABLE price_history (
+        );
+        
+        -- Price history table
+        CREATE TABLE IF NOT EXISTS price_history (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             symbol TEXT NOT NULL,
             timestamp TIMESTAMP NOT NULL,
@@ -54,25 +66,26 @@ def setup_sqlite_database():
             low_price REAL NOT NULL,
             close_price REAL NOT NULL,
             volume REAL DEFAULT 0
-        )
-    """)
-    print("  ✅ Created table: price_history")
-    
-    # Predictions table
-    cursor.execute("""
-        CREATE TABLE predictions (
+        );
+        
+        -- Index for "latest price of a symbol" queries
+        -- (UNIQUE: one candle per symbol and timestamp)
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_ph_sym_ts ON price_history(symbol, timestamp DESC);
+        
+        -- Predictions table
+        CREATE TABLE IF NOT EXISTS predictions (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             symbol TEXT NOT NULL,
             timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             prediction_class INTEGER NOT NULL,
             confidence REAL NOT NULL
-        )
-    """)
-    print("  ✅ Created table: predictions")
-    
-    # Portfolio table
-    cursor.execute("""
-        CREATE TABLE portfolio (
+        );
+        
+        -- Index for "latest prediction of a symbol" queries
+        CREATE INDEX IF NOT EXISTS idx_predictions_symbol_ts ON predictions(symbol, timestamp DESC);
+        
+        -- Portfolio table
+        CREATE TABLE IF NOT EXISTS portfolio (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             user_id INTEGER NOT NULL,
             symbol TEXT NOT NULL,
@@ -81,13 +94,10 @@ def setup_sqlite_database():
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
             UNIQUE (user_id, symbol)
-        )
-    """)
-    print("  ✅ Created table: portfolio")
-    
-    # Trades table
-    cursor.execute("""
-        CREATE TABLE trades (
+        );
+        
+        -- Trades table
+        CREATE TABLE IF NOT EXISTS trades (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             user_id INTEGER NOT NULL,
             symbol TEXT NOT NULL,
@@ -97,41 +107,53 @@ def setup_sqlite_database():
             total_amount REAL NOT NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-        )
+        );
+        
+        -- Index for "latest trades of a user" queries
+        -- (portfolio needs none: UNIQUE (user_id, symbol) already is one)
+        CREATE INDEX IF NOT EXISTS idx_trades_user_ts ON trades(user_id, created_at DESC);
+        
+        COMMIT;
     """)
-    print("  ✅ Created table: trades")
+    
+    for table in ('users', 'price_history', 'predictions', 'portfolio', 'trades'):
+        print(f"  ✅ Table ready: {table}")
     
     print("\n[3] Inserting sample data...")
     
     # Insert sample price data
-    cursor.execute("""
-        INSERT INTO price_history (symbol, timestamp, open_price, high_price, low_price, close_price, volume)
-        VALUES ('BTCUSDT', '2025-11-13 09:00:00', 45000.00, 45500.00, 44800.00, 45200.00, 1250.50)
-    """)
-    cursor.execute("""
-        INSERT INTO price_history (symbol, timestamp, open_price, high_price, low_price, close_price, volume)
-        VALUES ('BTCUSDT', '2025-11-13 10:00:00', 45200.00, 45800.00, 45100.00, 45600.00, 1380.75)
-    """)
-    cursor.execute("""
-        INSERT INTO price_history (symbol, timestamp, open_price, high_price, low_price, close_price, volume)
-        VALUES ('BTCUSDT', '2025-11-13 11:00:00', 45600.00, 46000.00, 45400.00, 45900.00, 1520.25)
-    """)
-    print("  ✅ Inserted sample price data")
-    
-    conn.commit()
+    # (one prepared statement for all rows, in one transaction;
+    # OR IGNORE + the unique index skip rows that are already there)
+    sample_prices = [
+        ('BTCUSDT', '2025-11-13 09:00:00', 45000.00, 45500.00, 44800.00, 45200.00, 1250.50),
+        ('BTCUSDT', '2025-11-13 10:00:00', 45200.00, 45800.00, 45100.00, 45600.00, 1380.75),
+        ('BTCUSDT', '2025-11-13 11:00:00', 45600.00, 46000.00, 45400.00, 45900.00, 1520.25),
+    ]
+    with conn:
+        cursor.executemany("""
+            INSERT OR IGNORE INTO price_history (symbol, timestamp, open_price, high_price, low_price, close_price, volume)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, sample_prices)
+    print(f"  ✅ Inserted {cursor.rowcount} sample price rows")
     
     print("\n[4] Database setup complete!")
     print("=" * 70)
-    print("✅ SQLite database created successfully!")
+    print("✅ SQLite database ready!")
     print("=" * 70)
     print(f"\nDatabase file: {db_path}")
-    print("Tables created: users, price_history, predictions, portfolio, trades")
+    print("Tables: users, price_history, predictions, portfolio, trades")
     print("\nYou can now:")
     print("  1. Create a demo user: python3 create_demo_user.py")
     print("  2. Run the app: python3 app.py")
     print("  3. Register at: http://127.0.0.1:5000/register")
     print("=" * 70)
-    
+
+    # Let SQLite refresh its query planner statistics where it thinks they
+    # are missing or stale (cheap; recommended before closing a connection).
+    # A full ANALYZE is skipped on purpose: statistics taken from the few
+    # sample rows would tell the planner the tables are tiny long after
+    # they have filled up.
+    conn.execute("PRAGMA optimize")
     conn.close()
 
 
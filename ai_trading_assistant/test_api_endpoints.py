@@ -6,6 +6,7 @@ Tests all API endpoints to verify correct HTTP status codes
 
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple
 
 BASE_URL = "http://localhost:5000"
@@ -31,6 +32,19 @@ def print_test(endpoint, method, status_code, expected, passed, response_data=No
     if not passed and response_data:
         print(f"       Response: {json.dumps(response_data, indent=2)}")
 
+def is_json_response(resp):
+    """
+    Check the Content-Type header so HTML pages (e.g. a login page after
+    a redirect) are not parsed as JSON just to fail.
+    
+    Args:
+        resp: requests.Response
+    
+    Returns:
+        bool: True if the server says the body is JSON
+    """
+    return resp.headers.get("content-type", "").startswith("application/json")
+
 def test_unauthenticated_endpoints():
     """Test endpoints that don't require authentication"""
     print_header("Testing Unauthenticated Endpoints")
@@ -42,17 +56,48 @@ def test_unauthenticated_endpoints():
     ]
     
     results = []
-    for method, endpoint, expected_codes, description in tests:
+    # One session for all requests: the TCP connection is kept alive and
+    # reused instead of opening a new one per request. It is a separate
+    # session from login()'s, so these requests stay unauthenticated.
+    with requests.Session() as unauth_session:
+        for method, endpoint, expected_codes, description in tests:
+            try:
+                resp = unauth_session.request(method, BASE_URL + endpoint, allow_redirects=False)
+                passed = resp.status_code in expected_codes
+                print_test(endpoint, method, resp.status_code, expected_codes, passed)
+                results.append((endpoint, passed))
+            except Exception as e:
+                print(f"{RED}❌ ERROR{ENDC} | {method:6} {endpoint:40} | Exception: {str(e)}")
+                results.append((endpoint, False))
+    
+    return results
+
+def send_requests(session, tests, **post_kwargs):
+    """
+    Send all test requests at once (the endpoints are independent), so
+    the suite waits for the slowest response instead of the sum of all.
+    
+    Args:
+        session: requests.Session to send them with
+        tests (list): (method, endpoint, expected_codes, description) tuples
+        **post_kwargs: Extra arguments for POST requests (e.g. json={})
+    
+    Returns:
+        list: Response - or the exception raised - for each test, in order
+    """
+    def send(test):
+        method, endpoint = test[0], test[1]
+        kwargs = post_kwargs if method == "POST" else {}
         try:
-            resp = requests.request(method, BASE_URL + endpoint, allow_redirects=False)
-            passed = resp.status_code in expected_codes
-            print_test(endpoint, method, resp.status_code, expected_codes, passed)
-            results.append((endpoint, passed))
+            # Don't follow redirects: a redirect (e.g. to the login page)
+            # is reported by its own status code, without downloading the
+            # page it points to
+            return session.request(method, BASE_URL + endpoint, allow_redirects=False, **kwargs)
         except Exception as e:
-            print(f"{RED}❌ ERROR{ENDC} | {method:6} {endpoint:40} | Exception: {str(e)}")
-            results.append((endpoint, False))
+            return e
     
-    return results
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        return list(pool.map(send, tests))
 
 def test_authenticated_endpoints(session):
     """Test endpoints that require authentication"""
@@ -72,28 +117,29 @@ def test_authenticated_endpoints(session):
     ]
     
     results = []
-    for method, endpoint, expected_codes, description in tests:
-        try:
-            resp = session.request(method, BASE_URL + endpoint)
-            passed = resp.status_code in expected_codes
-            
-            # Check for anti-pattern: HTTP 200 with success: false
-            if resp.status_code == 200:
-                try:
-                    data = resp.json()
-                    if isinstance(data, dict) and data.get('success') == False:
-                        print(f"{YELLOW}⚠️  WARNING{ENDC} | {method:6} {endpoint:40} | HTTP 200 with success: false")
-                        print(f"       This is an anti-pattern. Should use 4xx/5xx status code.")
-                        print(f"       Response: {json.dumps(data, indent=2)[:200]}...")
-                        passed = False
-                except:
-                    pass
-            
-            print_test(endpoint, method, resp.status_code, expected_codes, passed)
-            results.append((endpoint, passed))
-        except Exception as e:
-            print(f"{RED}❌ ERROR{ENDC} | {method:6} {endpoint:40} | Exception: {str(e)}")
+    responses = send_requests(session, tests)
+    for (method, endpoint, expected_codes, description), resp in zip(tests, responses):
+        if isinstance(resp, Exception):
+            print(f"{RED}❌ ERROR{ENDC} | {method:6} {endpoint:40} | Exception: {str(resp)}")
             results.append((endpoint, False))
+            continue
+        
+        passed = resp.status_code in expected_codes
+        
+        # Check for anti-pattern: HTTP 200 with success: false
+        if resp.status_code == 200 and is_json_response(resp):
+            try:
+                data = resp.json()
+                if isinstance(data, dict) and data.get('success') == False:
+                    print(f"{YELLOW}⚠️  WARNING{ENDC} | {method:6} {endpoint:40} | HTTP 200 with success: false")
+                    print(f"       This is an anti-pattern. Should use 4xx/5xx status code.")
+                    print(f"       Response: {json.dumps(data, indent=2)[:200]}...")
+                    passed = False
+            except:
+                pass
+        
+        print_test(endpoint, method, resp.status_code, expected_codes, passed)
+        results.append((endpoint, passed))
     
     return results
 
@@ -109,34 +155,31 @@ def test_error_responses(session):
     ]
     
     results = []
-    for method, endpoint, expected_codes, description in tests:
-        try:
-            if method == "POST":
-                resp = session.request(method, BASE_URL + endpoint, json={})
-            else:
-                resp = session.request(method, BASE_URL + endpoint)
-            
-            passed = resp.status_code in expected_codes
-            
-            # This is the key check: errors should NOT return 200
-            if resp.status_code == 200:
-                try:
-                    data = resp.json()
-                    if isinstance(data, dict) and data.get('success') == False:
-                        print(f"{RED}❌ ANTI-PATTERN DETECTED{ENDC}")
-                        print(f"       {method:6} {endpoint}")
-                        print(f"       Returned HTTP 200 with success: false")
-                        print(f"       Should return {expected_codes[0]} instead")
-                        print(f"       Response: {json.dumps(data, indent=2)}")
-                        passed = False
-                except:
-                    pass
-            
-            print_test(endpoint, method, resp.status_code, expected_codes, passed)
-            results.append((endpoint, passed))
-        except Exception as e:
-            print(f"{RED}❌ ERROR{ENDC} | {method:6} {endpoint:40} | Exception: {str(e)}")
+    responses = send_requests(session, tests, json={})
+    for (method, endpoint, expected_codes, description), resp in zip(tests, responses):
+        if isinstance(resp, Exception):
+            print(f"{RED}❌ ERROR{ENDC} | {method:6} {endpoint:40} | Exception: {str(resp)}")
             results.append((endpoint, False))
+            continue
+        
+        passed = resp.status_code in expected_codes
+        
+        # This is the key check: errors should NOT return 200
+        if resp.status_code == 200 and is_json_response(resp):
+            try:
+                data = resp.json()
+                if isinstance(data, dict) and data.get('success') == False:
+                    print(f"{RED}❌ ANTI-PATTERN DETECTED{ENDC}")
+                    print(f"       {method:6} {endpoint}")
+                    print(f"       Returned HTTP 200 with success: false")
+                    print(f"       Should return {expected_codes[0]} instead")
+                    print(f"       Response: {json.dumps(data, indent=2)}")
+                    passed = False
+            except:
+                pass
+        
+        print_test(endpoint, method, resp.status_code, expected_codes, passed)
+        results.append((endpoint, passed))
     
     return results
 
@@ -35,12 +35,16 @@ def main():
     print("\n[Test 2] Fetching all users from database...")
     print("-" * 60)
     query = "SELECT * FROM users"
-    users = db.fetch_all(query)
+    # iter_rows() reads the rows in batches while we loop, so a big users
+    # table is never loaded into memory all at once
+    users = db.iter_rows(query)
     
     if users is not None:
-        print(f"✅ Test 2 PASSED: Found {len(users)} user(s)")
+        count = 0
         for user in users:
             print(f"   - User ID: {user['id']}, Username: {user['username']}, Balance: ${user['balance']}")
+            count += 1
+        print(f"✅ Test 2 PASSED: Found {count} user(s)")
     else:
         print("❌ Test 2 FAILED: Could not fetch users")
     
@@ -94,6 +98,7 @@ def main():
     print("   - db.get_connection()")
     print("   - db.execute_query(query, params)")
     print("   - db.fetch_all(query, params)")
+    print("   - db.iter_rows(query, params)")
     print("   - db.fetch_one(query, params)")
     print()
 
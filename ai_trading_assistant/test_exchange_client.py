@@ -6,9 +6,35 @@ This is for educational purposes - shows how to connect to different exchanges
 using a single, unified interface.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
 from services import exchange_client
 
 
+# Clients already created by the tests, by exchange name. Reusing them
+# also reuses their loaded markets (ccxt keeps them on the client), so
+# Binance's market list is downloaded once for all three tests.
+_clients = {}
+
+
+def get_client(exchange_name):
+    """
+    Return the (public) client for an exchange, creating it on first use.
+    
+    Args:
+        exchange_name (str): e.g. "binance"
+    
+    Returns:
+        ccxt exchange client, or None if it couldn't be created
+    """
+    client = _clients.get(exchange_name)
+    if client is None:
+        client = exchange_client.create_exchange_client(exchange_name)
+        if client:
+            _clients[exchange_name] = client
+    return client
+
+
 def test_binance_public():
     """
     Test Binance exchange with public data (no API key needed).
@@ -18,7 +44,7 @@ def test_binance_public():
     print("=" * 70)
     
     # Create Binance client (no API key for public data)
-    client = exchange_client.create_exchange_client("binance")
+    client = get_client("binance")
     
     if not client:
         print("❌ Failed to create Binance client")
@@ -80,12 +106,21 @@ def test_multiple_exchanges():
     
     prices = {}
     
-    for exchange_name in exchanges_to_test:
+    def fetch_ticker(exchange_name):
+        client = get_client(exchange_name)
+        if not client:
+            return client, None
+        return client, exchange_client.get_ticker(client, symbol)
+    
+    # Ask all exchanges at the same time: the total wait is the slowest
+    # exchange instead of the sum of all of them
+    with ThreadPoolExecutor(max_workers=len(exchanges_to_test)) as pool:
+        results = list(pool.map(fetch_ticker, exchanges_to_test))
+    
+    for exchange_name, (client, ticker) in zip(exchanges_to_test, results):
         print(f"[{exchange_name.upper()}]")
-        client = exchange_client.create_exchange_client(exchange_name)
         
         if client:
-            ticker = exchange_client.get_ticker(client, symbol)
             if ticker:
                 prices[exchange_name] = ticker['last']
                 print(f"   Price: ${ticker['last']:,.2f}")
@@ -118,7 +153,7 @@ def test_available_markets():
     print("TEST 3: Available Markets")
     print("=" * 70)
     
-    client = exchange_client.create_exchange_client("binance")
+    client = get_client("binance")
     
     if client:
         print("\n[1] Loading USDT pairs...")
@@ -0,0 +1,100 @@
+"""
+Training Feature Tests
+
+Checks that the rolling SMA / volatility features computed in
+services/train_model.py match pandas rolling(), including data with gaps
+(NaN) and bad values (inf) - a gap must only affect the windows it is in -
+with and without Numba.
+
+Usage:
+    python -m pytest tests/test_train_model_features.py
+    or
+    python tests/test_train_model_features.py
+"""
+
+import sys
+import os
+
+# Add parent directory to path so we can import services
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import importlib
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+
+# services/__init__.py exports a train_model() function under the same
+# name, so import the module itself
+train_model = importlib.import_module('services.train_model')
+_rolling_sma_std = train_model._rolling_sma_std
+
+
+class RollingFeatureTests(unittest.TestCase):
+    """Compare _rolling_sma_std() with pandas rolling(5).mean() / .std()"""
+    
+    WINDOW = 5
+    
+    def _check_against_pandas(self, close):
+        """Run _rolling_sma_std() on `close` and compare with pandas."""
+        n = len(close)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ret = np.full(n, np.nan)
+            ret[1:] = (close[1:] - close[:-1]) / close[:-1]
+            
+            sma = np.full(n, np.nan)
+            std = np.full(n, np.nan)
+            _rolling_sma_std(close, ret, self.WINDOW, sma, std)
+        
+        expected_sma = pd.Series(close).rolling(self.WINDOW).mean().to_numpy()
+        expected_std = pd.Series(ret).rolling(self.WINDOW).std().to_numpy()
+        
+        np.testing.assert_allclose(sma, expected_sma, rtol=1e-9, atol=1e-12, equal_nan=True)
+        np.testing.assert_allclose(std, expected_std, rtol=1e-9, atol=1e-12, equal_nan=True)
+        
+        return sma, std
+    
+    def test_matches_pandas_on_clean_data(self):
+        """Random walk without gaps"""
+        close = 100 + np.cumsum(np.random.default_rng(0).normal(size=200))
+        self._check_against_pandas(close)
+    
+    def test_recovers_after_gaps(self):
+        """NaN / inf closes only affect the windows that contain them"""
+        close = 100 + np.cumsum(np.random.default_rng(1).normal(size=80))
+        close[5] = np.nan
+        close[30] = np.inf
+        close[40:43] = np.nan
+        
+        sma, std = self._check_against_pandas(close)
+        
+        # Back to real numbers once the gap has left the window
+        self.assertTrue(np.isfinite(sma[5 + self.WINDOW]))
+        self.assertTrue(np.isfinite(std[-1]))
+    
+    def test_constant_prices(self):
+        """Flat prices: zero volatility, not NaN"""
+        close = np.full(20, 42.0)
+        sma, std = self._check_against_pandas(close)
+        
+        self.assertEqual(std[-1], 0.0)
+    
+    def test_rolling_features_without_numba(self):
+        """The pandas fallback gives the same results as the kernel"""
+        close = 100 + np.cumsum(np.random.default_rng(2).normal(size=50))
+        close[10] = np.nan
+        expected_sma, expected_std = self._check_against_pandas(close)
+        
+        ret = np.full(len(close), np.nan)
+        ret[1:] = (close[1:] - close[:-1]) / close[:-1]
+        
+        with mock.patch.object(train_model, 'njit', None):
+            sma, std = train_model._rolling_features(close, ret, self.WINDOW)
+        
+        np.testing.assert_allclose(sma, expected_sma, rtol=1e-9, atol=1e-12, equal_nan=True)
+        np.testing.assert_allclose(std, expected_std, rtol=1e-9, atol=1e-12, equal_nan=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Log File Setup
+Writes a module's log messages to its own rotating log file.
+
+The module's logger gets a QueueHandler: the logging thread only puts
+the record on a queue and a background QueueListener writes it to the
+file, so a slow disk never holds up the code that logs (order execution,
+bulk price syncs). Records still propagate to the app's logging setup.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+
+import config
+
+
+# Logger name -> QueueListener (one per logger, started once)
+_listeners = {}
+_lock = threading.Lock()
+
+
+def add_log_file(logger, filename, log_dir=None):
+    """
+    Also write a logger's messages (INFO and above) to a rotating file.
+    
+    Only the first call for a logger sets anything up, so calling it
+    again is safe.
+    
+    Args:
+        logger (logging.Logger): Logger of the module (logging.getLogger(__name__))
+        filename (str): Log file name (e.g., "price_sync.log")
+        log_dir (str): Directory for the log file (default: config.LOG_DIR,
+                       created if missing)
+    
+    Example:
+        add_log_file(logging.getLogger("services.price_sync_service"), "price_sync.log")
+    """
+    with _lock:
+        if logger.name in _listeners:
+            return
+        
+        log_dir = log_dir or config.LOG_DIR
+        os.makedirs(log_dir, exist_ok=True)
+        
+        file_handler = logging.handlers.RotatingFileHandler(
+            os.path.join(log_dir, filename), maxBytes=5 * 1024 * 1024, backupCount=3, delay=True
+        )
+        file_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+        
+        record_queue = queue.Queue(-1)
+        listener = logging.handlers.QueueListener(record_queue, file_handler)
+        listener.start()
+        atexit.register(listener.stop)
+        _listeners[logger.name] = listener
+        
+        logger.setLevel(logging.INFO)
+        logger.addHandler(logging.handlers.QueueHandler(record_queue))